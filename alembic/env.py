@@ -7,12 +7,16 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
 from src.configs.app import settings
-from src.models.base import Base
+from src.models.base import Base, is_partition
 from src.models.course import Course  # noqa: F401
 from src.models.user import User  # noqa: F401
 from src.models.test_question import TestQuestion  # noqa: F401
 from src.models.lesson import Lesson # noqa: F401 
 from src.models.user_course import UserCourse # noqa: F401 
+from src.models.outbox import OutboxEvent # noqa: F401
+from src.models.archived_record import ArchivedRecord # noqa: F401
+from src.models.answer_attempt import AnswerAttempt # noqa: F401
+from src.models.question_stats import QuestionStats # noqa: F401
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -31,6 +35,16 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+# Служебные таблицы миграций (например, сохраненные дубли записей на курс)
+MIGRATION_TABLES = {"user_courses_duplicates"}
+
+
+def include_name(name, type_, parent_names) -> bool:
+    # Партиции создаются миграциями вместе с таблицей и в метаданных не описаны
+    return not (type_ == "table" and (is_partition(name) or name in MIGRATION_TABLES))
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -53,6 +67,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -62,7 +77,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
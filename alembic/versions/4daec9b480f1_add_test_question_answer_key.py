@@ -0,0 +1,77 @@
+"""add test question answer key
+
+Revision ID: 4daec9b480f1
+Revises: 08831564fcf1
+Create Date: 2026-10-19 09:20:41.517203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+
+from src.schemas.test_question_schema import find_choice_index, normalize_answer
+
+# revision identifiers, used by Alembic.
+revision: str = '4daec9b480f1'
+down_revision: Union[str, Sequence[str], None] = '08831564fcf1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Ключ ответа считается теми же функциями, что и в TestQuestionService.answer_columns,
+# иначе после миграции правильные ответы могли бы не совпасть с ключом.
+test_questions = sa.table(
+    "test_questions",
+    sa.column("uuid", UUID(as_uuid=True)),
+    sa.column("choices", ARRAY(sa.String())),
+    sa.column("correct_answer", sa.String()),
+    sa.column("answer_key", sa.String()),
+    sa.column("answer_index", sa.Integer()),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "test_questions",
+        sa.Column("answer_key", sa.String(), nullable=False, server_default=""),
+    )
+    op.add_column(
+        "test_questions",
+        sa.Column("answer_index", sa.Integer(), nullable=True),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(test_questions.c.uuid, test_questions.c.choices, test_questions.c.correct_answer)
+    ).all()
+    update = (
+        sa.update(test_questions)
+        .where(test_questions.c.uuid == sa.bindparam("question_id"))
+        .values(
+            answer_key=sa.bindparam("answer_key"),
+            answer_index=sa.bindparam("answer_index"),
+        )
+    )
+    for start in range(0, len(rows), BACKFILL_BATCH_SIZE):
+        bind.execute(update, [
+            {
+                "question_id": row.uuid,
+                "answer_key": normalize_answer(row.correct_answer),
+                "answer_index": find_choice_index(row.choices, row.correct_answer),
+            }
+            for row in rows[start:start + BACKFILL_BATCH_SIZE]
+        ])
+    op.alter_column(
+        "test_questions",
+        "answer_key",
+        server_default=None,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("test_questions", "answer_index")
+    op.drop_column("test_questions", "answer_key")
@@ -0,0 +1,78 @@
+"""partition user_courses by user_id
+
+Revision ID: b365833a3bf0
+Revises: 4a56c115a11b
+Create Date: 2026-10-19 14:21:37.840112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.models.base import hash_partition_ddl
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b365833a3bf0'
+down_revision: Union[str, Sequence[str], None] = '4a56c115a11b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Число партиций на момент миграции (не импортируется из модели, чтобы
+# будущие изменения USER_COURSE_PARTITIONS не меняли эту ревизию)
+PARTITIONS = 16
+COLUMNS = "uuid, user_id, course_id, progress, version, create_at, update_at, archived"
+
+
+def create_user_courses(name: str, primary_key: list[str], **kw) -> None:
+    op.create_table(name,
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('course_id', sa.UUID(), nullable=False),
+    sa.Column('progress', sa.JSON(), nullable=False),
+    sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    sa.Column('uuid', sa.UUID(), nullable=False),
+    sa.Column('create_at', sa.DateTime(), nullable=False),
+    sa.Column('update_at', sa.DateTime(), nullable=False),
+    sa.Column('archived', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.uuid'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.uuid'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint(*primary_key, name=f'{name}_pkey'),
+    sa.UniqueConstraint('user_id', 'course_id', name=f'uq_{name}_user_id_course_id'),
+    **kw
+    )
+
+
+def swap(old_table: str, new_table: str) -> None:
+    '''Перенести строки в new_table, удалить old_table и переименовать ограничения'''
+    op.execute(f"INSERT INTO {new_table} ({COLUMNS}) SELECT {COLUMNS} FROM {old_table}")
+    op.drop_table(old_table)
+    op.rename_table(new_table, 'user_courses')
+    op.execute(f"ALTER TABLE user_courses RENAME CONSTRAINT {new_table}_pkey TO user_courses_pkey")
+    op.execute(
+        f"ALTER TABLE user_courses RENAME CONSTRAINT uq_{new_table}_user_id_course_id "
+        "TO uq_user_courses_user_id_course_id"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Обычную таблицу нельзя сделать секционированной: создаем новую,
+    # переносим строки и подменяем. Таблица блокируется на время переноса.
+    op.execute("LOCK TABLE user_courses IN EXCLUSIVE MODE")
+    create_user_courses(
+        'user_courses_partitioned', ['user_id', 'uuid'],
+        postgresql_partition_by='HASH (user_id)',
+    )
+    for ddl in hash_partition_ddl('user_courses_partitioned', PARTITIONS):
+        op.execute(ddl)
+    swap('user_courses', 'user_courses_partitioned')
+    for remainder in range(PARTITIONS):
+        op.rename_table(f'user_courses_partitioned_p{remainder}', f'user_courses_p{remainder}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("LOCK TABLE user_courses IN EXCLUSIVE MODE")
+    create_user_courses('user_courses_plain', ['uuid'])
+    swap('user_courses', 'user_courses_plain')
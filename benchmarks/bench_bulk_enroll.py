@@ -0,0 +1,122 @@
+"""Compare one-by-one enrollment with the set-based bulk enrollment.
+
+Needs the Postgres from ``settings.toml``. Creates N throwaway users and two
+courses, enrolls a sample of users through ``enroll_in_course`` (the time is
+extrapolated to N), then enrolls all N through ``bulk_enroll`` three times:
+new rows, already enrolled, and restoring archived rows. Everything created
+is deleted at the end:
+
+    uv run python -m benchmarks.bench_bulk_enroll 50000
+"""
+import asyncio
+import sys
+import time
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import String, any_, delete, insert, literal, update
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from src.database import async_session_maker, engine
+from src.models.course import Course
+from src.models.outbox import OutboxEvent
+from src.models.user import User
+from src.models.user_course import UserCourse
+from src.repositories.course import CourseRepository
+from src.repositories.lesson import LessonRepository
+from src.repositories.test_question import TestQuestionRepository
+from src.repositories.user import UserRepository
+from src.repositories.user_course import UserCourseRepository
+from src.schemas.user_course_schema import BulkEnrollRequest
+from src.services.user_course_servise import UserCourseService
+
+SAMPLE = 500
+
+
+def make_service(session) -> UserCourseService:
+    return UserCourseService(
+        UserCourseRepository(session),
+        CourseRepository(session),
+        LessonRepository(session),
+        TestQuestionRepository(session),
+        UserRepository(session),
+    )
+
+
+async def timed(label: str, total: int, coro) -> Any:
+    started = time.perf_counter()
+    result = await coro
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed:8.2f} s  {total / elapsed:10.0f} enrollments/s")
+    return result
+
+
+async def run(count: int) -> None:
+    run_id = uuid4().hex[:8]
+    emails = [f"bench-{run_id}-{i}@example.com" for i in range(count)]
+    course_ids = [uuid4(), uuid4()]
+
+    async with async_session_maker() as session:
+        await session.execute(insert(User), [
+            {"uuid": uuid4(), "email": email, "password": "-", "roles": []}
+            for email in emails
+        ])
+        await session.execute(insert(Course), [
+            {"uuid": course_id, "name": f"bench-{run_id}-{i}", "desc": None}
+            for i, course_id in enumerate(course_ids)
+        ])
+        await session.commit()
+
+    try:
+        async with async_session_maker() as session:
+            service = make_service(session)
+            users = await UserRepository(session).get_active_ids([], emails[:SAMPLE])
+
+            async def one_by_one() -> None:
+                for user_id, _ in users:
+                    await service.enroll_in_course(user_id, course_ids[0])
+
+            started = time.perf_counter()
+            await one_by_one()
+            per_user = (time.perf_counter() - started) / SAMPLE
+            print(
+                f"{'enroll_in_course (x' + str(SAMPLE) + ')':<28} "
+                f"{per_user * count:8.2f} s  {1 / per_user:10.0f} enrollments/s  (extrapolated)"
+            )
+
+            request = BulkEnrollRequest(users=emails, course_ids=[course_ids[1]])
+            result = await timed("bulk_enroll: new", count, service.bulk_enroll(request))
+            assert result.enrolled == count, result.model_dump(exclude={"results"})
+
+            result = await timed("bulk_enroll: already enrolled", count, service.bulk_enroll(request))
+            assert result.already_enrolled == count
+
+            await session.execute(
+                update(UserCourse)
+                .where(UserCourse.course_id == course_ids[1])
+                .values(archived=True)
+            )
+            await session.commit()
+            result = await timed("bulk_enroll: restore archived", count, service.bulk_enroll(request))
+            assert result.restored == count
+    finally:
+        async with async_session_maker() as session:
+            await session.execute(delete(OutboxEvent).where(
+                OutboxEvent.aggregate_type == "user_course",
+                OutboxEvent.payload["course_id"].as_string().in_([str(c) for c in course_ids]),
+            ))
+            await session.execute(delete(Course).where(Course.uuid.in_(course_ids)))
+            await session.execute(delete(User).where(
+                User.email == any_(literal(emails, ARRAY(String)))
+            ))
+            await session.commit()
+        await engine.dispose()
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    asyncio.run(run(count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compare course analytics in Python loops with the NumPy cohort engine.
+
+No database needed: generates N enrollments of a course with 10 lessons of
+10 questions, then computes the lesson funnel, average scores and score
+percentiles by looping over progress dicts and with ``CourseCohort``:
+
+    uv run python -m benchmarks.bench_cohort_analytics 100000
+"""
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+from src.services.cohort_analytics import CohortBuilder
+
+LESSONS = 10
+QUESTIONS_PER_LESSON = 10
+CHUNK = 2000
+
+
+def generate(count: int):
+    lessons = [[str(uuid4()) for _ in range(QUESTIONS_PER_LESSON)] for _ in range(LESSONS)]
+    column = {q: i + 1 for i, q in enumerate(q for lesson in lessons for q in lesson)}
+    progresses, rows = [], []
+    for _ in range(count):
+        reached = random.randint(0, LESSONS)
+        progress = [
+            {
+                "lesson_id": str(i),
+                "questions": [
+                    {"question_id": q, "estimate": random.choice((0.0, 100.0))}
+                    for q in lesson
+                    if i < reached or random.random() < 0.5
+                ],
+            }
+            for i, lesson in enumerate(lessons[:reached + 1])
+        ]
+        progresses.append(progress)
+        answers = [q for lesson in progress for q in lesson["questions"]]
+        rows.append(SimpleNamespace(
+            seconds=float(random.randint(1, 500) * 3600),
+            cols=[column[q["question_id"]] for q in answers],
+            estimates=[q["estimate"] for q in answers],
+        ))
+    return lessons, progresses, rows
+
+
+def with_loops(lessons, progresses):
+    funnel = [0] * len(lessons)
+    score_sums = [0.0] * len(lessons)
+    answered = [0] * len(lessons)
+    user_scores = []
+    for progress in progresses:
+        by_lesson = {int(item["lesson_id"]): item["questions"] for item in progress}
+        total, count, reached = 0.0, 0, True
+        for i, lesson in enumerate(lessons):
+            questions = by_lesson.get(i, [])
+            for q in questions:
+                score_sums[i] += q["estimate"]
+                answered[i] += 1
+                total += q["estimate"]
+                count += 1
+            reached = reached and len(questions) == len(lesson)
+            funnel[i] += reached
+        if count:
+            user_scores.append(total / count)
+    return funnel, statistics.quantiles(user_scores, n=10)
+
+
+def with_numpy(lessons, rows):
+    builder = CohortBuilder(sum(len(lesson) for lesson in lessons))
+    for start in range(0, len(rows), CHUNK):
+        builder.add_rows(rows[start:start + CHUNK])
+    cohort = builder.build([len(lesson) for lesson in lessons])
+    return cohort.funnel()["reached"], cohort.score_distribution(10)
+
+
+def timed(label: str, func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    print(f"{label:<12} {time.perf_counter() - started:8.3f} s")
+    return result
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    lessons, progresses, rows = generate(count)
+    funnel, _ = timed("loops", with_loops, lessons, progresses)
+    reached, _ = timed("numpy", with_numpy, lessons, rows)
+    assert list(reached) == funnel
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Compare response_model validation with the direct JSON bytes path.
+
+Runs both variants of a list endpoint at limit=1000 against an in-process
+app, without Postgres:
+
+    uv run python -m benchmarks.bench_list_serialization
+"""
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.serialization import json_response, orm_json_response
+from src.schemas.course_schema import CourseResponse, course_list_adapter
+from src.schemas.lesson_schema import LessonResponse, lesson_list_adapter
+
+ROWS = 1000
+REQUESTS = 50
+
+
+def make_courses() -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(uuid=uuid4(), name=f"Course {i}", desc="Description " * 20)
+        for i in range(ROWS)
+    ]
+
+
+def make_lessons() -> list[LessonResponse]:
+    now = datetime.utcnow()
+    return [
+        LessonResponse(
+            uuid=uuid4(),
+            name=f"Lesson {i}",
+            desc="Description " * 20,
+            content="Content " * 500,
+            video_url="http://example.com/video",
+            course_id=uuid4(),
+            create_at=now,
+            update_at=now,
+            archived=False,
+        )
+        for i in range(ROWS)
+    ]
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    courses = make_courses()
+    lessons = make_lessons()
+
+    @app.get("/courses/validated", response_model=list[CourseResponse])
+    async def courses_validated():
+        return courses
+
+    @app.get("/courses/fast", response_model=list[CourseResponse])
+    async def courses_fast():
+        return orm_json_response(course_list_adapter, courses)
+
+    @app.get("/lessons/validated", response_model=list[LessonResponse])
+    async def lessons_validated():
+        return lessons
+
+    @app.get("/lessons/fast", response_model=list[LessonResponse])
+    async def lessons_fast():
+        return json_response(lesson_list_adapter, lessons)
+
+    return app
+
+
+def measure(client: TestClient, url: str) -> float:
+    client.get(url)
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        response = client.get(url)
+        assert response.status_code == 200
+    return (time.perf_counter() - start) / REQUESTS * 1000
+
+
+def main() -> None:
+    with TestClient(build_app()) as client:
+        for name in ("courses", "lessons"):
+            validated = measure(client, f"/{name}/validated")
+            fast = measure(client, f"/{name}/fast")
+            print(
+                f"{name:8} limit={ROWS}: response_model {validated:7.2f} ms, "
+                f"direct bytes {fast:7.2f} ms, x{validated / fast:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
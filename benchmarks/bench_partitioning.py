@@ -0,0 +1,132 @@
+"""Compare a plain and a hash-partitioned progress table.
+
+Needs the Postgres from ``settings.toml``. Creates two scratch tables shaped
+like ``user_courses`` (without foreign keys): a plain one and one partitioned
+by ``HASH (user_id)`` into ``USER_COURSE_PARTITIONS`` partitions, fills both
+with N rows (10 courses per user) and measures bulk load, single-row inserts,
+lookup by ``(user_id, uuid)``, lookup by ``uuid`` alone (scans every
+partition) and all courses of a user. The tables are dropped at the end:
+
+    uv run python -m benchmarks.bench_partitioning 100000000
+
+The default of 100M rows needs tens of GB of disk and takes hours to load;
+pass a smaller N for a quick run.
+"""
+import asyncio
+import random
+import sys
+import time
+from uuid import uuid4
+
+from sqlalchemy import text
+
+from src.database import engine
+from src.models.base import hash_partition_ddl
+from src.models.user_course import USER_COURSE_PARTITIONS
+
+COURSES_PER_USER = 10
+SAMPLE = 2000
+CHUNK = 1_000_000
+
+COLUMNS = """
+    uuid uuid NOT NULL,
+    user_id uuid NOT NULL,
+    course_id uuid NOT NULL,
+    progress json NOT NULL DEFAULT '[]',
+    version integer NOT NULL DEFAULT 1,
+    create_at timestamp NOT NULL DEFAULT timezone('utc', now()),
+    update_at timestamp NOT NULL DEFAULT timezone('utc', now()),
+    archived boolean NOT NULL DEFAULT false
+"""
+TABLES = {
+    "bench_uc_plain": [
+        f"CREATE TABLE bench_uc_plain ({COLUMNS}, PRIMARY KEY (uuid), UNIQUE (user_id, course_id))",
+    ],
+    "bench_uc_hash": [
+        f"CREATE TABLE bench_uc_hash ({COLUMNS}, PRIMARY KEY (user_id, uuid), "
+        "UNIQUE (user_id, course_id)) PARTITION BY HASH (user_id)",
+        *hash_partition_ddl("bench_uc_hash", USER_COURSE_PARTITIONS),
+    ],
+}
+
+# user_id выводится из номера строки, чтобы у пользователя было
+# COURSES_PER_USER курсов без хранения списка пользователей на клиенте
+FILL = """
+    INSERT INTO {table} (uuid, user_id, course_id)
+    SELECT gen_random_uuid(),
+           md5('user' || (n / :per_user))::uuid,
+           md5('course' || (n % :per_user))::uuid
+    FROM generate_series(:start, :stop - 1) AS n
+"""
+
+
+async def timed_many(conn, label: str, statements: list[tuple[str, dict]]) -> None:
+    latencies = []
+    for sql, params in statements:
+        started = time.perf_counter()
+        await conn.execute(text(sql), params)
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print(f"  {label:<26} p50 {p50:7.3f} ms  p99 {p99:7.3f} ms")
+
+
+async def bench_table(table: str, count: int) -> None:
+    print(f"{table}:")
+    async with engine.begin() as conn:
+        for ddl in TABLES[table]:
+            await conn.execute(text(ddl))
+
+    started = time.perf_counter()
+    for start in range(0, count, CHUNK):
+        async with engine.begin() as conn:
+            await conn.execute(text(FILL.format(table=table)), {
+                "per_user": COURSES_PER_USER, "start": start, "stop": min(start + CHUNK, count),
+            })
+    elapsed = time.perf_counter() - started
+    print(f"  {'bulk load':<26} {elapsed:9.1f} s  {count / elapsed:10.0f} rows/s")
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"ANALYZE {table}"))
+        rows = (await conn.execute(text(
+            f"SELECT uuid, user_id FROM {table} TABLESAMPLE SYSTEM (1) LIMIT :n"
+        ), {"n": SAMPLE})).all()
+        random.shuffle(rows)
+
+    async with engine.connect() as conn:
+        await timed_many(conn, "single insert", [(
+            f"INSERT INTO {table} (uuid, user_id, course_id) VALUES (:uuid, :user_id, :course_id)",
+            {"uuid": uuid4(), "user_id": uuid4(), "course_id": uuid4()},
+        ) for _ in range(SAMPLE)])
+        await conn.commit()
+        await timed_many(conn, "lookup by user_id + uuid", [(
+            f"SELECT * FROM {table} WHERE user_id = :user_id AND uuid = :uuid",
+            {"user_id": user_id, "uuid": uuid},
+        ) for uuid, user_id in rows])
+        await timed_many(conn, "lookup by uuid only", [(
+            f"SELECT * FROM {table} WHERE uuid = :uuid", {"uuid": uuid},
+        ) for uuid, _ in rows])
+        await timed_many(conn, "courses of a user", [(
+            f"SELECT * FROM {table} WHERE user_id = :user_id", {"user_id": user_id},
+        ) for _, user_id in rows])
+
+
+async def run(count: int) -> None:
+    try:
+        for table in TABLES:
+            await bench_table(table, count)
+    finally:
+        async with engine.begin() as conn:
+            for table in TABLES:
+                await conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+        await engine.dispose()
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000_000
+    asyncio.run(run(count))
+
+
+if __name__ == "__main__":
+    main()
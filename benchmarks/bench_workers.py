@@ -0,0 +1,93 @@
+"""Compare requests per second of the production runner with 1 and N workers.
+
+Starts ``python -m src.server`` on a free port for each worker count and
+hammers ``/api/openapi.json`` (no Postgres/Redis needed, gzip-compressed),
+then stops the server with SIGTERM:
+
+    uv run python -m benchmarks.bench_workers 1 4
+"""
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+DURATION = 10.0
+CONCURRENCY = 64
+PATH = "/api/openapi.json"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DYNACONF_APP_SETTINGS__APP_HOST": "127.0.0.1",
+        "DYNACONF_APP_SETTINGS__APP_PORT": str(port),
+        "DYNACONF_APP_SETTINGS__APP_WORKERS": str(workers),
+    }
+    return subprocess.Popen([sys.executable, "-m", "src.server"], env=env)
+
+
+async def wait_ready(base_url: str) -> None:
+    async with aiohttp.ClientSession(base_url=base_url) as session:
+        for _ in range(100):
+            try:
+                async with session.get(PATH) as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientConnectionError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError("Server did not start")
+
+
+async def load(base_url: str) -> int:
+    done = 0
+    deadline = time.perf_counter() + DURATION
+    headers = {"Accept-Encoding": "gzip"}
+
+    async def client(session: aiohttp.ClientSession) -> None:
+        nonlocal done
+        while time.perf_counter() < deadline:
+            async with session.get(PATH, headers=headers) as response:
+                await response.read()
+                done += 1
+
+    connector = aiohttp.TCPConnector(limit=CONCURRENCY)
+    async with aiohttp.ClientSession(base_url=base_url, connector=connector) as session:
+        await asyncio.gather(*(client(session) for _ in range(CONCURRENCY)))
+    return done
+
+
+def run(workers: int) -> float:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = start_server(workers, port)
+    try:
+        asyncio.run(wait_ready(base_url))
+        requests = asyncio.run(load(base_url))
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=60)
+    return requests / DURATION
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or [1, os.cpu_count() or 1]
+    results = {workers: run(workers) for workers in counts}
+    baseline = results[counts[0]]
+    for workers, rps in results.items():
+        print(f"workers={workers:<3} {rps:9.1f} req/s  x{rps / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
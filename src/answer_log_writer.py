@@ -0,0 +1,140 @@
+"""Writes answers from the Redis queue to the ``answer_attempts`` log.
+
+``/check`` pushes every graded answer to ``answer_log.queue_key``; this loop
+inserts them in batches of up to ``answer_log.batch_size`` rows with one
+statement, adds them to the per-question counters (``question_stats``) in the
+same transaction, then trims them from the queue. A crash between the commit
+and the trim delivers the batch again; every answer carries the
+``attempt_id`` given in ``/check``, so the repeated rows are skipped and
+not counted twice.
+
+Entries that cannot be parsed go straight to ``answer_log.dead_letter_key``.
+When a batch keeps failing for reasons other than a lost database connection,
+after ``answer_log.max_retries`` attempts its entries are written one by one
+and the ones that still fail are moved to the dead-letter list too, so a bad
+entry never blocks the queue.
+
+Once per ``answer_log.maintenance_interval`` the loop creates the partitions
+of the coming months and drops months older than
+``answer_log.retention_months``.
+"""
+import asyncio
+import json
+import sys
+import time
+import traceback
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID, uuid4
+
+from redis.asyncio import Redis
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from src.configs.app import settings
+from src.database import async_session_maker
+from src.models.answer_attempt import ANSWER_ATTEMPT_MONTHS_AHEAD
+from src.models.base import add_months
+from src.repositories.answer_attempt import AnswerAttemptQueue, AnswerAttemptRepository
+from src.repositories.question_stats import QuestionStatsRepository
+
+# База недоступна: пачка остается в очереди, попытки не считаются
+CONNECTION_ERRORS = (OSError, InterfaceError, OperationalError)
+
+
+def parse_attempt(raw: str) -> dict[str, Any]:
+    attempt = json.loads(raw)
+    for field in ("user_id", "question_id", "lesson_id"):
+        attempt[field] = UUID(attempt[field])
+    attempt["created_at"] = datetime.fromisoformat(attempt["created_at"])
+    # Ответы, поставленные в очередь до появления attempt_id
+    attempt["attempt_id"] = UUID(attempt["attempt_id"]) if "attempt_id" in attempt else uuid4()
+    return attempt
+
+
+async def insert_attempts(attempts: list[dict[str, Any]]) -> None:
+    async with async_session_maker() as session, session.begin():
+        inserted = await AnswerAttemptRepository(session).add_many(attempts)
+        await QuestionStatsRepository(session).increment(inserted)
+
+
+async def insert_one_by_one(entries: list[tuple[str, dict[str, Any]]]) -> list[str]:
+    '''Записать ответы по одному, вернуть те, что записать не удалось'''
+    failed = []
+    for raw, attempt in entries:
+        try:
+            await insert_attempts([attempt])
+        except CONNECTION_ERRORS:
+            raise
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+            failed.append(raw)
+    return failed
+
+
+async def write_batch(redis: Redis) -> int:
+    queue = AnswerAttemptQueue(redis)
+    batch = await queue.peek(settings.answer_log.batch_size)
+    if not batch:
+        return 0
+
+    entries, dead = [], []
+    for raw in batch:
+        try:
+            entries.append((raw, parse_attempt(raw)))
+        except (ValueError, KeyError, TypeError):
+            dead.append(raw)
+
+    if entries:
+        try:
+            await insert_attempts([attempt for _, attempt in entries])
+        except CONNECTION_ERRORS:
+            raise
+        except Exception:
+            if await queue.record_failure() < settings.answer_log.max_retries:
+                raise
+            traceback.print_exc(file=sys.stderr)
+            dead += await insert_one_by_one(entries)
+
+    await queue.trim(len(batch), dead)
+    if dead:
+        print(
+            f"Moved {len(dead)} answer attempts to {settings.answer_log.dead_letter_key}",
+            file=sys.stderr,
+        )
+    return len(batch)
+
+
+async def maintain_partitions() -> None:
+    today = date.today()
+    async with async_session_maker() as session, session.begin():
+        repo = AnswerAttemptRepository(session)
+        await repo.create_partitions(today, ANSWER_ATTEMPT_MONTHS_AHEAD)
+        dropped = await repo.drop_partitions_before(
+            add_months(today.replace(day=1), -settings.answer_log.retention_months)
+        )
+    if dropped:
+        print(f"Dropped answer_attempts partitions: {', '.join(dropped)}", file=sys.stderr)
+
+
+async def run_answer_log_writer(redis: Redis, stopping: asyncio.Event) -> None:
+    next_maintenance = 0.0
+    while not stopping.is_set():
+        if time.monotonic() >= next_maintenance:
+            next_maintenance = time.monotonic() + settings.answer_log.maintenance_interval
+            try:
+                await maintain_partitions()
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+        try:
+            written = await write_batch(redis)
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+            written = 0
+
+        # A full batch means there is probably more waiting.
+        if written < settings.answer_log.batch_size:
+            try:
+                await asyncio.wait_for(stopping.wait(), settings.answer_log.flush_interval)
+            except TimeoutError:
+                pass
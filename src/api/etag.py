@@ -0,0 +1,42 @@
+import hashlib
+from collections.abc import Iterable
+from typing import Any
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_for(items: Iterable[Any], *extra: Any) -> str:
+    """Weak ETag built from ``uuid``/``update_at`` of each item.
+
+    Items without ``update_at`` fall back to a hash of their content.
+    """
+    parts: list[Any] = list(extra)
+    for item in items:
+        update_at = getattr(item, "update_at", None)
+        if update_at is not None:
+            parts.append(f"{item.uuid}:{update_at.isoformat()}")
+        else:
+            parts.append(item.model_dump_json())
+    return make_etag(*parts)
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+
+    tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == tag for candidate in header.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
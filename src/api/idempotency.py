@@ -0,0 +1,186 @@
+"""``Idempotency-Key`` support for write endpoints.
+
+A client retrying a request sends the same ``Idempotency-Key`` header. The
+first request claims the key in Redis and its response is stored for
+``idempotency.ttl`` seconds. A retry of the same method, path, query and body
+gets the stored response (marked with ``Idempotent-Replayed: true``) after a
+single Redis command, before routing, authentication or any Postgres query.
+Keys are scoped to the JWT subject, or to the client IP without a token.
+
+A retry that arrives while the first request is still running gets 409, and
+a key reused for a different request gets 422. 5xx, 429 and 409 (a
+concurrent update that ran out of retries) responses are not stored: the key
+is released so that the next retry runs again. When Redis is
+unavailable requests are processed without idempotency.
+"""
+import hashlib
+import re
+from collections.abc import Iterable
+
+from redis.exceptions import ConnectionError, TimeoutError
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.configs.app import settings
+from src.redis_client import get_redis_client
+from src.repositories.idempotency import COMPLETED, IdempotencyRepository
+from src.services.rate_limit_service import jwt_subject
+
+
+def compile_path(path: str) -> re.Pattern[str]:
+    '''"/enroll/{course_id}" -> регулярное выражение для пути запроса'''
+    return re.compile("^" + re.sub(r"\\\{[^/]+?\\\}", "[^/]+", re.escape(path)) + "$")
+
+
+def client_identity(scope: Scope, headers: Headers) -> str:
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        subject = jwt_subject(token)
+        if subject:
+            return f"user:{subject}"
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+async def read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+class IdempotencyMiddleware:
+    def __init__(self, app: ASGIApp, routes: Iterable[tuple[str, str]]):
+        self.app = app
+        self.routes = [(method.upper(), compile_path(path)) for method, path in routes]
+
+    def matches(self, scope: Scope) -> bool:
+        return any(
+            scope["method"] == method and pattern.match(scope["path"])
+            for method, pattern in self.routes
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.idempotency.enabled or not self.matches(scope):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get("idempotency-key")
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+
+        if len(idempotency_key) > settings.idempotency.max_key_length:
+            response = JSONResponse(
+                {"detail": "Idempotency-Key is too long"}, status_code=400
+            )
+            await response(scope, receive, send)
+            return
+
+        body = await read_body(receive)
+        body_sent = False
+
+        async def receive_body() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        fingerprint = hashlib.sha256(b"\n".join((
+            scope["method"].encode(),
+            scope["path"].encode(),
+            scope.get("query_string", b""),
+            body,
+        ))).hexdigest()
+
+        repo = IdempotencyRepository(get_redis_client())
+        key = repo.key(client_identity(scope, headers), idempotency_key)
+        try:
+            record = await repo.claim(key, fingerprint, settings.idempotency.lock_ttl)
+        except (ConnectionError, TimeoutError):
+            await self.app(scope, receive_body, send)
+            return
+
+        if record is not None:
+            await self.replay(record, fingerprint, scope, receive, send)
+            return
+
+        status_code = None
+        response_headers: list[tuple[str, str]] = []
+        chunks: list[bytes] = []
+
+        async def send_and_capture(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers.extend(
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in message.get("headers", [])
+                )
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_body, send_and_capture)
+        except Exception:
+            await self.release(repo, key)
+            raise
+
+        if status_code is None or status_code >= 500 or status_code in (409, 429):
+            await self.release(repo, key)
+            return
+
+        try:
+            await repo.save(
+                key, fingerprint, status_code, response_headers, b"".join(chunks),
+                settings.idempotency.ttl,
+            )
+        except (ConnectionError, TimeoutError):
+            # Ответ уже отправлен; незавершенная запись истечет через lock_ttl.
+            pass
+
+    @staticmethod
+    async def release(repo: IdempotencyRepository, key: str) -> None:
+        try:
+            await repo.release(key)
+        except (ConnectionError, TimeoutError):
+            pass
+
+    @staticmethod
+    async def replay(
+        record: dict, fingerprint: str, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if record.get("fingerprint") != fingerprint:
+            response = JSONResponse(
+                {"detail": "Idempotency-Key was already used for a different request"},
+                status_code=422,
+            )
+            await response(scope, receive, send)
+            return
+
+        if record.get("state") != COMPLETED:
+            response = JSONResponse(
+                {"detail": "A request with this Idempotency-Key is still being processed"},
+                status_code=409,
+            )
+            await response(scope, receive, send)
+            return
+
+        await send({
+            "type": "http.response.start",
+            "status": record["status_code"],
+            "headers": [
+                (name.encode("latin-1"), value.encode("latin-1"))
+                for name, value in record["headers"]
+            ] + [(b"idempotent-replayed", b"true")],
+        })
+        await send({"type": "http.response.body", "body": record["body"].encode("latin-1")})
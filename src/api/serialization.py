@@ -0,0 +1,29 @@
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def json_response(
+    adapter: TypeAdapter[Any], data: Any, headers: dict[str, str] | None = None
+) -> Response:
+    """Serialize already validated schemas straight to JSON bytes.
+
+    Returning a ``Response`` makes FastAPI skip the ``response_model``
+    round-trip (dump to dict, validate, serialize), so list endpoints pay
+    for Pydantic once per row instead of twice.
+    """
+    return Response(
+        content=adapter.dump_json(data),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def orm_json_response(
+    adapter: TypeAdapter[Any], rows: Any, headers: dict[str, str] | None = None
+) -> Response:
+    """Validate ORM rows once via ``from_attributes`` and serialize them."""
+    return json_response(
+        adapter, adapter.validate_python(rows, from_attributes=True), headers
+    )
@@ -1,18 +1,37 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, status
+from redis.asyncio import Redis
 
+from src.api.serialization import orm_json_response
+from src.redis_client import get_redis_client, get_redis_pool_stats
 from src.schemas.course_schema import CourseBase, CourseResponse, CourseUpdate
+from src.schemas.cohort_schema import CohortReportResponse
+from src.schemas.job_schema import JobCreate, JobResponse
+from src.schemas.question_stats_schema import CourseDifficultyResponse, LessonDifficultyResponse
+from src.schemas.test_question_schema import TestQuestionResponse
+from src.schemas.user_course_schema import BulkEnrollRequest, BulkEnrollResponse
+from src.schemas.redis_schema import RedisPoolStatsResponse
+from src.schemas.stats_schema import AdminStatsResponse
 from src.schemas.user_schema import (
+    BulkUserCreateRequest,
+    BulkUserCreateResponse,
     DeleteUserByAdminResponse,
     UpdateUserByAdminRequest,
     UserResponse,
     UserResponseWithId,
     UserRole,
+    user_with_id_list_adapter,
 )
 from src.services.auth_service import AuthService, get_auth_service
+from src.services.cohort_service import CohortService, get_cohort_service
 from src.services.course_service import CourseService, get_course_service
+from src.services.job_service import JobService, get_job_service
+from src.services.question_stats_service import QuestionStatsService, get_question_stats_service
+from src.services.stats_service import StatsService, get_stats_service
+from src.services.test_question_service import TestQuestionService, get_test_question_service
+from src.services.user_course_servise import UserCourseService, get_user_course_service
 from src.services.user_service import UserService, get_user_service
 
 router = APIRouter()
@@ -78,6 +97,113 @@ async def delete_course(
     return {"message": "Course delete successfully"}
 
 
+@router.post(
+    "/course/{course_id}/export",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Export a course with lessons and tests in the background",
+)
+async def export_course(
+    course_id: UUID,
+    service: CourseService = Depends(get_course_service),
+    job_service: JobService = Depends(get_job_service),
+    auth_service: AuthService = Depends(get_auth_service),
+):
+    current_user = await auth_service.get_current_user()
+
+    if UserRole.admin not in current_user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Course can only be exported by admin",
+        )
+
+    await service.get_by_id(course_id)
+
+    return await job_service.enqueue("export_course", {"course_id": str(course_id)})
+
+
+@router.post(
+    "/user_courses/enroll",
+    response_model=BulkEnrollResponse,
+    summary="Enroll a cohort of users in courses",
+)
+async def bulk_enroll(
+    data: BulkEnrollRequest,
+    auth_service: AuthService = Depends(get_auth_service),
+    user_course_service: UserCourseService = Depends(get_user_course_service),
+):
+    """
+    Enroll users (by id or email) in every listed course. Archived enrollments are
+    restored with their progress; the result has an outcome for every user and course.
+    """
+    current_user = await auth_service.get_current_user()
+
+    if UserRole.admin not in current_user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Users can only be enrolled in bulk by the admin",
+        )
+
+    return await user_course_service.bulk_enroll(data)
+
+
+@router.post(
+    "/users/bulk",
+    response_model=BulkUserCreateResponse,
+    summary="Create many users at once",
+)
+async def provision_users(
+    data: BulkUserCreateRequest,
+    auth_service: AuthService = Depends(get_auth_service),
+    user_service: UserService = Depends(get_user_service),
+):
+    """
+    Create users from a JSON list; existing and repeated emails are skipped
+    """
+    current_user = await auth_service.get_current_user()
+
+    if UserRole.admin not in current_user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Users can only be provisioned by the admin",
+        )
+
+    return await user_service.provision_users(data.users)
+
+
+@router.post(
+    "/users/bulk/csv",
+    response_model=BulkUserCreateResponse,
+    summary="Create many users from a CSV file",
+)
+async def provision_users_csv(
+    file: UploadFile,
+    auth_service: AuthService = Depends(get_auth_service),
+    user_service: UserService = Depends(get_user_service),
+):
+    """
+    CSV columns: email, password, optional username and roles separated by |.
+    Invalid rows are reported and skipped
+    """
+    current_user = await auth_service.get_current_user()
+
+    if UserRole.admin not in current_user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Users can only be provisioned by the admin",
+        )
+
+    try:
+        content = (await file.read()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CSV must be UTF-8 encoded",
+        )
+
+    return await user_service.provision_users_csv(content)
+
+
 @router.patch("/users", response_model=UserResponse, summary="Update user by admin")
 async def update_user_by_admin(
     data: UpdateUserByAdminRequest,
@@ -143,4 +269,291 @@ async def get_active_users_by_admin(
 
     users = await user_service.get_active_users_by_admin(skip=skip, limit=limit)
 
-    return users
+    return orm_json_response(user_with_id_list_adapter, users)
+
+
+@router.get(
+    "/users/search",
+    response_model=list[UserResponseWithId],
+    summary="Fuzzy search users by email or username",
+)
+async def search_users_by_admin(
+    q: Annotated[str, Query(min_length=2, max_length=200, description="Search query")],
+    limit: Annotated[int, Query(ge=1, le=100, description="Entries limit")] = 20,
+    auth_service: AuthService = Depends(get_auth_service),
+    user_service: UserService = Depends(get_user_service),
+):
+    current_user = await auth_service.get_current_user()
+
+    if UserRole.admin not in current_user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Users can only be accessed by the admin",
+        )
+
+    users = await user_service.search_users_by_admin(q, limit)
+
+    return orm_json_response(user_with_id_list_adapter, users)
+
+
+@router.get(
+    "/test_questions/search",
+    response_model=list[TestQuestionResponse],
+    summary="Fuzzy search test questions by text",
+)
+async def search_test_questions_by_admin(
+    q: Annotated[str, Query(min_length=2, max_length=200, description="Search query")],
+    limit: Annotated[int, Query(ge=1, le=100, description="Entries limit")] = 20,
+    auth_service: AuthService = Depends(get_auth_service),
+    service: TestQuestionService = Depends(get_test_question_service),
+):
+    current_user = await auth_service.get_current_user()
+
+    if UserRole.admin not in current_user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="All test questions are only available to admin",
+        )
+
+    return await service.search_test_questions(q, limit)
+
+
+@router.get(
+    "/stats",
+    response_model=AdminStatsResponse,
+    summary="Platform totals from a periodically refreshed snapshot",
+)
+async def get_admin_stats(
+    auth_service: AuthService = Depends(get_auth_service),
+    stats_service: StatsService = Depends(get_stats_service),
+):
+    current_user = await auth_service.get_current_user()
+
+    if UserRole.admin not in current_user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Stats can only be accessed by the admin",
+        )
+
+    return await stats_service.get_stats()
+
+
+@router.get(
+    "/redis/stats",
+    response_model=RedisPoolStatsResponse,
+    summary="Get Redis connection pool stats",
+)
+async def get_redis_stats(
+    auth_service: AuthService = Depends(get_auth_service),
+    redis: Redis = Depends(get_redis_client),
+):
+    current_user = await auth_service.get_current_user()
+
+    if UserRole.admin not in current_user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Redis stats can only be accessed by the admin",
+        )
+
+    return get_redis_pool_stats(redis)
+
+
+@router.post(
+    "/jobs",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Enqueue a background job",
+)
+async def create_job(
+    job_data: JobCreate,
+    auth_service: AuthService = Depends(get_auth_service),
+    job_service: JobService = Depends(get_job_service),
+):
+    current_user = await auth_service.get_current_user()
+
+    if UserRole.admin not in current_user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Jobs can only be accessed by the admin",
+        )
+
+    return await job_service.create_job(job_data)
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse, summary="Get background job status")
+async def get_job(
+    job_id: UUID,
+    auth_service: AuthService = Depends(get_auth_service),
+    job_service: JobService = Depends(get_job_service),
+):
+    current_user = await auth_service.get_current_user()
+
+    if UserRole.admin not in current_user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Jobs can only be accessed by the admin",
+        )
+
+    return await job_service.get_job(job_id)
+
+
+@router.post(
+    "/leaderboards/rebuild",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Rebuild course leaderboards from the database in the background",
+)
+async def rebuild_leaderboards(
+    course_id: Annotated[
+        UUID | None, Query(description="Only this course, all courses if omitted")
+    ] = None,
+    auth_service: AuthService = Depends(get_auth_service),
+    job_service: JobService = Depends(get_job_service),
+):
+    current_user = await auth_service.get_current_user()
+
+    if UserRole.admin not in current_user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Leaderboards can only be rebuilt by the admin",
+        )
+
+    payload = {"course_id": str(course_id)} if course_id else {}
+    return await job_service.enqueue("rebuild_leaderboards", payload)
+
+
+@router.post(
+    "/archive/purge",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Move rows archived longer than the retention period out of the live tables",
+)
+async def purge_archived(
+    retention_days: Annotated[
+        int | None, Query(ge=1, description="Retention in days, archive.retention_days if omitted")
+    ] = None,
+    auth_service: AuthService = Depends(get_auth_service),
+    job_service: JobService = Depends(get_job_service),
+):
+    current_user = await auth_service.get_current_user()
+
+    if UserRole.admin not in current_user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Archived data can only be purged by the admin",
+        )
+
+    payload = {"retention_days": retention_days} if retention_days else {}
+    return await job_service.enqueue("purge_archived", payload)
+
+
+@router.post(
+    "/archive/export",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Export purged rows to a compressed file and remove them from the database",
+)
+async def export_archived(
+    auth_service: AuthService = Depends(get_auth_service),
+    job_service: JobService = Depends(get_job_service),
+):
+    current_user = await auth_service.get_current_user()
+
+    if UserRole.admin not in current_user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Archived data can only be exported by the admin",
+        )
+
+    return await job_service.enqueue("export_archived", {})
+
+
+@router.get(
+    "/lesson/{lesson_id}/difficulty",
+    response_model=LessonDifficultyResponse,
+    summary="Answer counts and pass rates of the lesson's questions",
+)
+async def get_lesson_difficulty(
+    lesson_id: UUID,
+    auth_service: AuthService = Depends(get_auth_service),
+    stats_service: QuestionStatsService = Depends(get_question_stats_service),
+):
+    current_user = await auth_service.get_current_user()
+
+    if UserRole.admin not in current_user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Difficulty reports can only be accessed by the admin",
+        )
+
+    return await stats_service.get_lesson_difficulty(lesson_id)
+
+
+@router.get(
+    "/course/{course_id}/difficulty",
+    response_model=CourseDifficultyResponse,
+    summary="Answer counts and pass rates of the course's lessons",
+)
+async def get_course_difficulty(
+    course_id: UUID,
+    auth_service: AuthService = Depends(get_auth_service),
+    stats_service: QuestionStatsService = Depends(get_question_stats_service),
+):
+    current_user = await auth_service.get_current_user()
+
+    if UserRole.admin not in current_user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Difficulty reports can only be accessed by the admin",
+        )
+
+    return await stats_service.get_course_difficulty(course_id)
+
+
+@router.get(
+    "/course/{course_id}/analytics",
+    response_model=CohortReportResponse,
+    summary="Completion funnel, score distribution and time to complete of a course",
+)
+async def get_course_analytics(
+    course_id: UUID,
+    auth_service: AuthService = Depends(get_auth_service),
+    cohort_service: CohortService = Depends(get_cohort_service),
+):
+    """
+    Built on request for courses with up to analytics.max_sync_enrollments
+    enrollments; larger courses need POST (background job)
+    """
+    current_user = await auth_service.get_current_user()
+
+    if UserRole.admin not in current_user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Course analytics can only be accessed by the admin",
+        )
+
+    return await cohort_service.get_report(course_id)
+
+
+@router.post(
+    "/course/{course_id}/analytics",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Build the course analytics report in the background",
+)
+async def create_course_analytics_job(
+    course_id: UUID,
+    auth_service: AuthService = Depends(get_auth_service),
+    cohort_service: CohortService = Depends(get_cohort_service),
+    job_service: JobService = Depends(get_job_service),
+):
+    current_user = await auth_service.get_current_user()
+
+    if UserRole.admin not in current_user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Course analytics can only be accessed by the admin",
+        )
+
+    await cohort_service.check_course(course_id)
+    return await job_service.enqueue("course_analytics", {"course_id": str(course_id)})
@@ -18,12 +18,18 @@ from src.schemas.user_schema import (
     UserSignupRequest,
 )
 from src.services.auth_service import AuthService, get_auth_service, get_req_service
+from src.services.rate_limit_service import RateLimiter
 from src.services.user_service import UserService, get_user_service
 
 router = APIRouter()
 
 
-@router.post("/signup", response_model=UserResponse, summary="User signup")
+@router.post(
+    "/signup",
+    response_model=UserResponse,
+    summary="User signup",
+    dependencies=[Depends(RateLimiter("signup"))],
+)
 async def signup(
     data: UserSignupRequest,
     service: UserService = Depends(get_user_service),
@@ -33,7 +39,12 @@ async def signup(
     return res
 
 
-@router.post("/signup-admin", response_model=UserResponse, summary="Admin signup")
+@router.post(
+    "/signup-admin",
+    response_model=UserResponse,
+    summary="Admin signup",
+    dependencies=[Depends(RateLimiter("signup"))],
+)
 async def signup_admin(
     data: UserSignupRequest,
     service: UserService = Depends(get_user_service),
@@ -43,7 +54,12 @@ async def signup_admin(
     return res
 
 
-@router.post("/signin", response_model=SigninResponse, summary="User signin")
+@router.post(
+    "/signin",
+    response_model=SigninResponse,
+    summary="User signin",
+    dependencies=[Depends(RateLimiter("signin"))],
+)
 async def signin(
     data: SigninRequest,
     service: AuthService = Depends(get_req_service),
@@ -110,7 +126,10 @@ async def get_user_me(
 
 
 @router.post(
-    "/change-password", response_model=ChangePasswordResponse, summary="Change password"
+    "/change-password",
+    response_model=ChangePasswordResponse,
+    summary="Change password",
+    dependencies=[Depends(RateLimiter("change_password", key_by="user"))],
 )
 async def change_password(
     data: ChangePasswordRequest,
@@ -1,10 +1,21 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 
-from src.schemas.course_schema import CourseResponse
+from src.api.etag import etag_for, is_not_modified, not_modified
+from src.api.serialization import orm_json_response
+from src.schemas.course_schema import (
+    CourseRatingResponse,
+    CourseResponse,
+    CourseSearchResponse,
+    CourseSort,
+    course_list_adapter,
+)
+from src.schemas.leaderboard_schema import LeaderboardEntry, LeaderboardResponse
+from src.services.auth_service import AuthService, get_auth_service
 from src.services.course_service import CourseService, get_course_service
+from src.services.leaderboard_service import LeaderboardService, get_leaderboard_service
 
 router = APIRouter()
 
@@ -15,18 +26,46 @@ router = APIRouter()
     summary="Get all courses",
 )
 async def get_all_courses(
+    request: Request,
     skip: Annotated[int | None, Query(ge=0, description="Entries number to skip")] = 0,
     limit: Annotated[
         int | None, Query(ge=1, le=1000, description="Entries limit")
     ] = 100,
+    sort: Annotated[
+        CourseSort | None, Query(description="rating - highest average rating first")
+    ] = None,
     service: CourseService = Depends(get_course_service),
 ):
     """
     Get all paginated courses list
     """
-    courses = await service.get_all(skip=skip, limit=limit)
+    courses = await service.get_all(skip=skip, limit=limit, sort=sort)
+
+    etag = etag_for(courses, sort)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    return orm_json_response(course_list_adapter, courses, headers={"ETag": etag})
 
-    return courses
+
+@router.get(
+    "/search",
+    response_model=CourseSearchResponse,
+    summary="Search courses and lessons",
+)
+async def search_courses(
+    q: Annotated[str, Query(min_length=1, max_length=200, description="Search query")],
+    limit: Annotated[int, Query(ge=1, le=100, description="Entries limit")] = 20,
+    cursor: Annotated[
+        str | None, Query(description="next_cursor from the previous page")
+    ] = None,
+    service: CourseService = Depends(get_course_service),
+):
+    """
+    Full-text search over course names/descriptions and lesson names/descriptions/content,
+    ranked by relevance
+    """
+    return await service.search(q, limit, cursor)
 
 
 @router.get(
@@ -35,11 +74,68 @@ async def get_all_courses(
     summary="Get course by id",
 )
 async def get_course(
-    course_id: UUID, service: CourseService = Depends(get_course_service)
+    course_id: UUID,
+    request: Request,
+    response: Response,
+    service: CourseService = Depends(get_course_service),
 ):
     """
     Get course by id
     """
     course = await service.get_by_id(course_id)
 
+    etag = etag_for([course])
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
     return course
+
+
+@router.get(
+    "/{course_id}/rating",
+    response_model=CourseRatingResponse,
+    summary="Get course rating with histogram",
+)
+async def get_course_rating(
+    course_id: UUID,
+    service: CourseService = Depends(get_course_service),
+):
+    """
+    Average rating, number of ratings and number of ratings per star
+    """
+    return await service.get_rating(course_id)
+
+
+@router.get(
+    "/{course_id}/leaderboard",
+    response_model=LeaderboardResponse,
+    summary="Get course leaderboard",
+)
+async def get_course_leaderboard(
+    course_id: UUID,
+    limit: Annotated[int, Query(ge=1, le=100, description="Entries limit")] = 10,
+    service: LeaderboardService = Depends(get_leaderboard_service),
+):
+    """
+    Top students of the course by the sum of question estimates
+    """
+    return await service.get_top(course_id, limit)
+
+
+@router.get(
+    "/{course_id}/leaderboard/me",
+    response_model=LeaderboardEntry,
+    summary="Get current user's place on the course leaderboard",
+)
+async def get_my_leaderboard_rank(
+    course_id: UUID,
+    auth_service: AuthService = Depends(get_auth_service),
+    service: LeaderboardService = Depends(get_leaderboard_service),
+):
+    """
+    Rank and score of the current user on the course leaderboard
+    """
+    current_user = await auth_service.get_current_user()
+
+    return await service.get_user_rank(course_id, current_user.uuid)
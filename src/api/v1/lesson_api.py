@@ -1,13 +1,19 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status, HTTPException
+from fastapi import APIRouter, Depends, Query, Request, Response, status, HTTPException
 
+from src.api.etag import etag_for, is_not_modified, not_modified
+from src.api.serialization import json_response
 from src.schemas.lesson_schema import (
     LessonResponse,
     LessonCreate,
     LessonUpdate,
-    LessonVideoResponse
+    LessonVideoResponse,
+    LessonListView,
+    LessonSummaryResponse,
+    lesson_list_adapter,
+    lesson_summary_list_adapter,
 )
 from src.schemas.user_schema import UserRole
 from src.services.auth_service import AuthService, get_auth_service
@@ -24,6 +30,8 @@ router = APIRouter(tags=["lessons"])
 )
 async def get_lesson(
     lesson_id: UUID,
+    request: Request,
+    response: Response,
     video_only: Annotated[
         bool, 
         Query(
@@ -41,20 +49,31 @@ async def get_lesson(
     """
     current_user = await auth_service.get_current_user()
     lesson = await service.get_by_id(lesson_id, video_only=video_only)
+
+    etag = etag_for([lesson], video_only)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     return lesson
 
 
 @router.get(
     "/get_all/{course_id}",
-    response_model=list[LessonResponse],
+    response_model=list[LessonResponse] | list[LessonSummaryResponse],
     summary="Get all lessons for course",
+    description="Use query parameter 'view=summary' to get only lesson names without content."
 )
 async def get_course_lessons(
     course_id: UUID,
+    request: Request,
     skip: Annotated[int | None, Query(ge=0, description="Entries number to skip")] = 0,
     limit: Annotated[
         int | None, Query(ge=1, le=1000, description="Entries limit")
     ] = 100,
+    view: Annotated[
+        LessonListView,
+        Query(description="'summary' returns only uuid, name, video_url and course_id")
+    ] = LessonListView.full,
     service: LessonService = Depends(get_lesson_service),
     auth_service: AuthService = Depends(get_auth_service),
 ):
@@ -62,8 +81,17 @@ async def get_course_lessons(
     Get all lessons for a specific course
     """
     current_user = await auth_service.get_current_user()
-    lessons = await service.get_all_by_course(course_id, skip=skip, limit=limit)
-    return lessons
+    if view == LessonListView.summary:
+        lessons = await service.get_summaries_by_course(course_id, skip=skip, limit=limit)
+        adapter = lesson_summary_list_adapter
+    else:
+        lessons = await service.get_all_by_course(course_id, skip=skip, limit=limit)
+        adapter = lesson_list_adapter
+
+    etag = etag_for(lessons, view.value)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    return json_response(adapter, lessons, headers={"ETag": etag})
 
 
 @router.post(
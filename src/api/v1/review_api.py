@@ -1,9 +1,14 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 
-from src.schemas.review_schema import ReviewCreate, ReviewResponse, ReviewUpdate
+from src.schemas.review_schema import (
+    ReviewCreate,
+    ReviewPageResponse,
+    ReviewResponse,
+    ReviewUpdate,
+)
 from src.services.review_service import ReviewService, get_review_service
 from src.services.auth_service import AuthService, get_auth_service
 
@@ -16,10 +21,36 @@ router = APIRouter()
     summary="Get reviews for course",
 )
 async def get_reviews_for_course(
+    course_id: UUID,
+    response: Response,
+    service: Annotated[ReviewService, Depends(get_review_service)],
+    skip: Annotated[int, Query(ge=0, description="Entries number to skip")] = 0,
+    limit: Annotated[int, Query(ge=1, le=100, description="Entries limit")] = 100,
+    cursor: Annotated[
+        str | None, Query(description="X-Next-Cursor from the previous page")
+    ] = None,
+):
+    """
+    Reviews for course, newest first. If there are more reviews, the cursor
+    for the next page is returned in the X-Next-Cursor header
+    """
+    page = await service.get_by_course(course_id, skip=skip, limit=limit, cursor=cursor)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.reviews
+
+
+@router.get(
+    "/{course_id}/summary",
+    response_model=ReviewPageResponse,
+    summary="Get review count and first page of reviews for course",
+)
+async def get_review_summary_for_course(
     course_id: UUID,
     service: Annotated[ReviewService, Depends(get_review_service)],
+    limit: Annotated[int, Query(ge=1, le=100, description="Entries limit")] = 10,
 ):
-    return await service.get_by_course(course_id)
+    return await service.get_by_course(course_id, limit=limit)
 
 
 @router.post(
@@ -1,9 +1,13 @@
+from datetime import datetime
 from typing import List
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, Query, status, HTTPException
+from fastapi import APIRouter, Depends, Query, Request, status, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.etag import make_etag, is_not_modified, not_modified
+from src.api.serialization import json_response
+from src.configs.app import settings
 from src.database import get_session
 from src.schemas.test_question_schema import (
     TestQuestionCreate,
@@ -14,12 +18,16 @@ from src.schemas.test_question_schema import (
     TestQuestionWithoutAnswerListResponse,
     LessonAnswer,
     CheckAnswerListResponse,
-    LessonEstimateResponse
+    LessonEstimateResponse,
+    test_question_list_adapter,
+    test_question_without_answer_list_adapter,
 )
 from src.schemas.user_schema import UserRole
 from src.services.auth_service import AuthService, get_auth_service
+from src.services.rate_limit_service import RateLimiter
 from src.services.test_question_service import TestQuestionService, get_test_question_service
 from src.services.user_course_servise import UserCourseService, get_user_course_service
+from src.repositories.answer_attempt import AnswerAttemptQueue, get_answer_attempt_queue
 from src.repositories.course import CourseRepository, get_course_repository
 from src.repositories.user_course import UserCourseRepository, get_user_course_repository
 from src.repositories.lesson import LessonRepository, get_lesson_repository
@@ -47,12 +55,15 @@ async def get_all_test_questions(
     
     test_questions = await service.get_all_test_questions(skip, limit)
     total = await service.get_test_questions_count()
-    return TestQuestionListResponse(
-        questions_list=test_questions,
-        total=total,
-        skip=skip,
-        limit=limit
-        )
+    return json_response(
+        test_question_list_adapter,
+        TestQuestionListResponse(
+            questions_list=test_questions,
+            total=total,
+            skip=skip,
+            limit=limit
+            ),
+    )
 
 
 @router.get("/{test_question_id}", response_model=TestQuestionWithoutAnswerResponse, summary="Get test question by id")
@@ -181,6 +192,7 @@ async def delete_test_question(
 )
 async def get_test_questions_by_lesson_id(
     lesson_id: UUID,
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     service: TestQuestionService = Depends(get_test_question_service),
@@ -190,30 +202,40 @@ async def get_test_questions_by_lesson_id(
     Получить тест к уроку без ответов (тестовые вопросы отсортированы по порядку)
     """
     await auth_service.get_current_user()
+
+    headers = {}
+    version = await service.get_test_questions_version(lesson_id)
+    if version is not None:
+        etag = make_etag(version, skip, limit)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        headers["ETag"] = etag
+
     test_questions = await service.get_test_questions_by_lesson_id(lesson_id)
 
-    return TestQuestionWithoutAnswerListResponse(
-        questions_list=test_questions,
-        skip=skip,
-        limit=limit,
-        )
+    return json_response(
+        test_question_without_answer_list_adapter,
+        TestQuestionWithoutAnswerListResponse(
+            questions_list=test_questions,
+            skip=skip,
+            limit=limit,
+            ),
+        headers=headers,
+    )
 
 
 @router.post(
     "/check", 
     response_model=CheckAnswerListResponse, 
-    summary="Check answers and update progress"
-)
-@router.post(
-    "/check", 
-    response_model=CheckAnswerListResponse, 
-    summary="Check answers and update progress"
+    summary="Check answers and update progress",
+    dependencies=[Depends(RateLimiter("check_answers", key_by="user"))],
 )
 async def check_test(
     user_data: LessonAnswer,
     auth_service: AuthService = Depends(get_auth_service),
     test_service: TestQuestionService = Depends(get_test_question_service),
     db: AsyncSession = Depends(get_session),
+    answer_log: AnswerAttemptQueue = Depends(get_answer_attempt_queue),
 ):
     """
     Проверить ответы на тест и обновить прогресс с детализацией по вопросам
@@ -244,6 +266,25 @@ async def check_test(
         await test_service.validate_questions_belong_to_same_lesson(
             [answer.uuid for answer in user_data.user_answers]
         )
+
+        # В журнал попадают все ответы, включая повторные; в answer_attempts
+        # их пачками пишет воркер
+        if settings.answer_log.enabled:
+            passed = {item.uuid: item.passed for item in checked_answers}
+            created_at = datetime.utcnow().isoformat()
+            await answer_log.push([
+                {
+                    "attempt_id": uuid4(),
+                    "user_id": current_user.uuid,
+                    "question_id": answer.uuid,
+                    "lesson_id": lesson_id,
+                    "answer": answer.user_answer,
+                    "passed": passed[answer.uuid],
+                    "created_at": created_at,
+                }
+                for answer in user_data.user_answers
+                if answer.uuid in passed
+            ])
         
         # Создаем необходимые репозитории
         from src.repositories.user_course import UserCourseRepository
@@ -271,7 +312,8 @@ async def check_test(
             # Получаем текущий прогресс по уроку
             current_progress = await user_course_repo.get_lesson_progress(
                 user_course.uuid,
-                lesson_id
+                lesson_id,
+                user_id=current_user.uuid
             )
             
             # Фильтруем вопросы, на которые пользователь уже отвечал
@@ -318,13 +360,15 @@ async def check_test(
                 await user_course_repo.update_progress(
                     user_course_id=user_course.uuid,
                     lesson_id=lesson_id,
-                    question_progress=new_question_progress
+                    question_progress=new_question_progress,
+                    user_id=current_user.uuid
                 )
                 
                 # Получаем обновленный прогресс для ответа
                 updated_progress = await user_course_repo.get_lesson_progress(
                     user_course_id=user_course.uuid,
-                    lesson_id=lesson_id
+                    lesson_id=lesson_id,
+                    user_id=current_user.uuid
                 )
                 
                 # Добавляем информацию о новых ответах в результат
@@ -349,11 +393,13 @@ async def check_test(
         else:
             # Если user_course не найден, создаем его
             from src.services.user_course_servise import UserCourseService
+            from src.repositories.user import UserRepository
             user_course_service_full = UserCourseService(
                 user_course_repo=user_course_repo,
                 course_repo=course_repo,
                 lesson_repo=lesson_repo,
-                test_question_repo= test_question_repo
+                test_question_repo= test_question_repo,
+                user_repo=UserRepository(db)
             )
             
             # Записываем пользователя на курс
@@ -379,7 +425,8 @@ async def check_test(
             await user_course_repo.update_progress(
                 user_course_id=new_user_course.uuid,
                 lesson_id=lesson_id,
-                question_progress=question_progress
+                question_progress=question_progress,
+                user_id=current_user.uuid
             )
             
             return CheckAnswerListResponse(
@@ -387,6 +434,10 @@ async def check_test(
                 message="Курс создан и прогресс сохранен."
             )
             
+    except HTTPException:
+        # 409 после исчерпания повторов update_progress и т.п. - отдаем как есть,
+        # иначе ошибка вернулась бы 200 и закрепилась бы по Idempotency-Key
+        raise
     except Exception as e:
         # Если что-то пошло не так, все равно возвращаем результаты теста
         import traceback
@@ -7,6 +7,19 @@ class APPConfig(BaseModel):
     app_name: str
     app_host: str
     app_port: int
+    app_gzip_minimum_size: int = 1024
+    app_workers: int = 1
+    app_loop: str = "uvloop"
+    app_http: str = "httptools"
+    app_backlog: int = 2048
+    app_keep_alive_timeout: int = 5
+    app_graceful_shutdown_timeout: int = 30
+    app_limit_concurrency: int | None = None
+    app_access_log: bool = False
+    app_restart_backoff: float = 1.0
+    app_restart_max_backoff: float = 30.0
+    app_restart_min_uptime: float = 10.0
+    app_restart_max_failures: int = 5
 
 
 class DBConfig(BaseModel):
@@ -47,6 +60,117 @@ class RedisConfig(BaseModel):
     redis_port: int
     redis_db: int
     redis_password: str
+    redis_max_connections: int = 50
+    redis_pool_timeout: float = 2.0
+    redis_socket_connect_timeout: float = 1.0
+    redis_socket_timeout: float = 1.0
+    redis_health_check_interval: int = 30
+    redis_retry_attempts: int = 2
+    redis_retry_backoff_base: float = 0.05
+    redis_retry_backoff_cap: float = 0.5
+    redis_circuit_failure_threshold: int = 5
+    redis_circuit_reset_timeout: float = 10.0
+
+
+class RateLimitRule(BaseModel):
+    limit: int
+    window: int
+
+
+class RateLimitConfig(BaseModel):
+    enabled: bool = True
+    signin: RateLimitRule
+    signup: RateLimitRule
+    change_password: RateLimitRule
+    check_answers: RateLimitRule
+
+
+class CacheConfig(BaseModel):
+    quiz_redis_ttl: int = 300
+    quiz_local_ttl: float = 5.0
+    quiz_local_max_size: int = 1024
+
+
+class JobConfig(BaseModel):
+    concurrency: int = 4
+    max_attempts: int = 3
+    retry_backoff_base: float = 2.0
+    retry_backoff_cap: float = 300.0
+    timeout: float = 600.0
+    result_ttl: int = 86400
+    poll_timeout: float = 1.0
+    lease_ttl: float = 60.0
+
+
+class OutboxConfig(BaseModel):
+    enabled: bool = True
+    stream_key: str = "lms:events"
+    stream_maxlen: int = 100000
+    batch_size: int = 500
+    poll_interval: float = 0.5
+    retention_days: int = 7
+    cleanup_interval: float = 3600.0
+    cleanup_batch_size: int = 5000
+
+
+class LeaderboardConfig(BaseModel):
+    consumer_group: str = "leaderboards"
+    batch_size: int = 200
+    rebuild_chunk_size: int = 1000
+
+
+class ProvisioningConfig(BaseModel):
+    max_users: int = 10000
+    hash_workers: int | None = None  # None - по числу CPU
+    hash_chunk_size: int = 50
+    insert_batch_size: int = 1000
+    enroll_max_pairs: int = 100000
+    enroll_batch_size: int = 5000
+
+
+class IdempotencyConfig(BaseModel):
+    enabled: bool = True
+    ttl: int = 86400
+    lock_ttl: int = 60
+    max_key_length: int = 255
+
+
+class ProgressConfig(BaseModel):
+    update_attempts: int = 10
+    retry_backoff: float = 0.005
+
+
+class ArchiveConfig(BaseModel):
+    retention_days: int = 90
+    batch_size: int = 500
+    batch_pause: float = 0.05
+    max_runtime: float = 300.0  # меньше jobs.timeout
+    export_dir: str = "archive"
+    export_batch_size: int = 5000
+
+
+class AnswerLogConfig(BaseModel):
+    enabled: bool = True
+    queue_key: str = "lms:answer_attempts"
+    dead_letter_key: str = "lms:answer_attempts:dead"
+    max_queue_length: int = 1000000
+    max_retries: int = 5
+    batch_size: int = 1000
+    flush_interval: float = 1.0
+    retention_months: int = 12
+    maintenance_interval: float = 3600.0
+
+
+class AnalyticsConfig(BaseModel):
+    chunk_size: int = 2000
+    max_sync_enrollments: int = 5000
+    histogram_bins: int = 10
+
+
+class StatsConfig(BaseModel):
+    snapshot_key: str = "admin:stats"
+    refresh_interval: float = 300.0
+    snapshot_ttl: int = 3600
 
 
 class Settings(BaseModel):
@@ -54,6 +178,18 @@ class Settings(BaseModel):
     db: DBConfig
     auth: AuthConfig
     redis: RedisConfig
+    rate_limit: RateLimitConfig
+    cache: CacheConfig
+    jobs: JobConfig
+    outbox: OutboxConfig
+    leaderboard: LeaderboardConfig
+    provisioning: ProvisioningConfig
+    idempotency: IdempotencyConfig
+    progress: ProgressConfig
+    archive: ArchiveConfig
+    answer_log: AnswerLogConfig
+    analytics: AnalyticsConfig
+    stats: StatsConfig
 
 
 env_settings = Dynaconf(settings_file=["settings.toml"])
@@ -63,4 +199,16 @@ settings = Settings(
     db=env_settings["db_settings"],
     auth=env_settings["auth_settings"],
     redis=env_settings["redis_settings"],
+    rate_limit=env_settings["rate_limit_settings"],
+    cache=env_settings["cache_settings"],
+    jobs=env_settings["job_settings"],
+    outbox=env_settings["outbox_settings"],
+    leaderboard=env_settings["leaderboard_settings"],
+    provisioning=env_settings["provisioning_settings"],
+    idempotency=env_settings["idempotency_settings"],
+    progress=env_settings["progress_settings"],
+    archive=env_settings["archive_settings"],
+    answer_log=env_settings["answer_log_settings"],
+    analytics=env_settings["analytics_settings"],
+    stats=env_settings["stats_settings"],
 )
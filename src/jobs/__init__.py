@@ -0,0 +1,4 @@
+from .registry import JOB_HANDLERS, job
+from . import tasks
+
+__all__ = ["JOB_HANDLERS", "job", "tasks"]
@@ -0,0 +1,14 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+JobHandler = Callable[..., Awaitable[Any]]
+
+JOB_HANDLERS: dict[str, JobHandler] = {}
+
+
+def job(name: str) -> Callable[[JobHandler], JobHandler]:
+    '''Зарегистрировать обработчик фоновой задачи под именем name'''
+    def decorator(handler: JobHandler) -> JobHandler:
+        JOB_HANDLERS[name] = handler
+        return handler
+    return decorator
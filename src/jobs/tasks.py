@@ -0,0 +1,189 @@
+import asyncio
+import gzip
+import json
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import IO, Any
+from uuid import UUID
+
+from src.configs.app import settings
+from src.database import async_session_maker
+from src.jobs.registry import job
+from src.leaderboard_consumer import last_event_id, replay_events
+from src.redis_client import get_redis_client
+from src.repositories.archive import PURGE_ORDER, ArchiveRepository
+from src.repositories.cohort import CohortRepository
+from src.repositories.course import CourseRepository
+from src.repositories.leaderboard import LeaderboardRepository
+from src.repositories.lesson import LessonRepository
+from src.repositories.test_question import TestQuestionRepository
+from src.repositories.user_course import UserCourseRepository
+from src.schemas.course_schema import CourseResponse
+from src.schemas.lesson_schema import LessonResponse
+from src.schemas.test_question_schema import TestQuestionResponse
+from src.services.cohort_service import CohortService
+
+
+@job("export_course")
+async def export_course(course_id: str) -> dict[str, Any]:
+    '''Выгрузить курс с уроками и тестами'''
+    async with async_session_maker() as session:
+        course = await CourseRepository(session).get_by_id(course_id)
+        if course is None:
+            raise ValueError(f"Course {course_id} not found")
+
+        lessons = await LessonRepository(session).get_all_by_course(course_id, skip=0, limit=None)
+        test_question_repo = TestQuestionRepository(session)
+
+        exported_lessons = []
+        for lesson in lessons:
+            test_questions = await test_question_repo.get_by_lesson_id(lesson.uuid) or []
+            exported_lessons.append({
+                **LessonResponse.model_validate(lesson).model_dump(mode="json"),
+                "test_questions": [
+                    TestQuestionResponse.model_validate(question).model_dump(mode="json")
+                    for question in test_questions
+                ],
+            })
+
+    return {
+        **CourseResponse.model_validate(course).model_dump(mode="json"),
+        "lessons": exported_lessons,
+    }
+
+
+@job("rebuild_leaderboards")
+async def rebuild_leaderboards(course_id: str | None = None) -> dict[str, int]:
+    '''Пересобрать рейтинги курсов по прогрессу из базы (одного курса или всех)'''
+    leaderboards = LeaderboardRepository(get_redis_client())
+    chunk_size = settings.leaderboard.rebuild_chunk_size
+
+    async with async_session_maker() as session:
+        if course_id is not None:
+            course_ids = [course_id]
+        else:
+            courses = await CourseRepository(session).get_all(skip=0, limit=None)
+            course_ids = [course.uuid for course in courses]
+
+        user_course_repo = UserCourseRepository(session)
+        entries = {}
+        for cid in course_ids:
+            # События после этого id могли не попасть в выборку из базы, а
+            # примененные потребителем к старому ключу затрет RENAME.
+            offset = await last_event_id(leaderboards.db)
+            entries[str(cid)] = await leaderboards.replace(
+                cid,
+                user_course_repo.get_scores_by_course(cid, chunk_size),
+                chunk_size,
+            )
+            await replay_events(leaderboards, leaderboards.db, cid, offset)
+
+    return entries
+
+
+@job("purge_archived")
+async def purge_archived(retention_days: int | None = None) -> dict[str, Any]:
+    '''Перенести строки, архивированные дольше срока хранения, в archived_records.
+
+    Каждая пачка - отдельная короткая транзакция, между пачками пауза.
+    Через archive.max_runtime задача останавливается (completed = false),
+    следующий запуск продолжит с оставшихся строк.
+    '''
+    config = settings.archive
+    cutoff = datetime.utcnow() - timedelta(days=retention_days or config.retention_days)
+    deadline = time.monotonic() + config.max_runtime
+    moved: dict[str, int] = {}
+    completed = True
+
+    for table in PURGE_ORDER:
+        moved[table.name] = 0
+        while True:
+            if time.monotonic() >= deadline:
+                completed = False
+                break
+            async with async_session_maker() as session:
+                count = await ArchiveRepository(session).move_batch(
+                    table, cutoff, config.batch_size
+                )
+                await session.commit()
+            moved[table.name] += count
+            if count < config.batch_size:
+                break
+            await asyncio.sleep(config.batch_pause)
+        if not completed:
+            break
+
+    return {"cutoff": cutoff.isoformat(), "moved": moved, "completed": completed}
+
+
+def write_lines(file: IO[bytes], lines: list[str]) -> None:
+    file.write("".join(lines).encode())
+    file.flush()
+
+
+@job("export_archived")
+async def export_archived() -> dict[str, Any]:
+    '''Выгрузить archived_records в сжатый JSON Lines файл в archive.export_dir.
+
+    Записи удаляются из базы только после того, как файл полностью записан,
+    и только те, что попали в файл: purge_archived может параллельно дописать
+    строки с меньшим id, которые закоммитятся уже после чтения этой пачки.
+    '''
+    config = settings.archive
+    export_dir = Path(config.export_dir)
+    export_dir.mkdir(parents=True, exist_ok=True)
+    path = export_dir / f"archived_records-{datetime.utcnow():%Y%m%dT%H%M%S}.jsonl.gz"
+    deadline = time.monotonic() + config.max_runtime
+    last_id = 0
+    exported_ids: list[list[int]] = []
+
+    file = await asyncio.to_thread(gzip.open, path, "wb")
+    try:
+        while time.monotonic() < deadline:
+            async with async_session_maker() as session:
+                records = await ArchiveRepository(session).get_after(
+                    last_id, config.export_batch_size
+                )
+            if not records:
+                break
+            last_id = records[-1].id
+            lines = [
+                json.dumps({
+                    "table_name": record.table_name,
+                    "record_id": str(record.record_id),
+                    "archived_at": record.archived_at.isoformat(),
+                    "moved_at": record.moved_at.isoformat(),
+                    "data": record.data,
+                }, ensure_ascii=False) + "\n"
+                for record in records
+            ]
+            await asyncio.to_thread(write_lines, file, lines)
+            exported_ids.append([record.id for record in records])
+    finally:
+        await asyncio.to_thread(file.close)
+
+    if not exported_ids:
+        path.unlink(missing_ok=True)
+        return {"file": None, "exported": 0}
+
+    for ids in exported_ids:
+        async with async_session_maker() as session:
+            await ArchiveRepository(session).delete_many(ids)
+            await session.commit()
+
+    return {"file": str(path), "exported": sum(len(ids) for ids in exported_ids)}
+
+
+@job("course_analytics")
+async def course_analytics(course_id: str) -> dict[str, Any]:
+    '''Отчет по записям на курс (воронка, оценки, время прохождения) для больших курсов'''
+    async with async_session_maker() as session:
+        course_repo = CourseRepository(session)
+        if await course_repo.get_by_id(course_id) is None:
+            raise ValueError(f"Course {course_id} not found")
+
+        report = await CohortService(CohortRepository(session), course_repo).build_report(
+            UUID(course_id)
+        )
+    return report.model_dump(mode="json")
@@ -0,0 +1,126 @@
+"""Keeps course leaderboards up to date from the outbox event stream.
+
+Reads ``user_course.*`` events from ``outbox.stream_key`` as a member of the
+``leaderboard.consumer_group`` consumer group. Every such event carries the
+user's total score for the course, so applying an event twice (the relay
+delivers at least once) leaves the same result. On start the consumer first
+re-reads its own unacknowledged events, then waits for new ones.
+
+``rebuild_leaderboards`` records the last stream id before reading the
+database and, after swapping the rebuilt board in, replays the course's
+events from that id with ``replay_events``, so updates the consumer applied
+to the old key during the rebuild are not lost.
+"""
+import asyncio
+import json
+import socket
+import sys
+import traceback
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from src.configs.app import settings
+from src.repositories.leaderboard import LeaderboardRepository
+
+SCORE_EVENTS = {
+    "user_course.enrolled",
+    "user_course.progress_updated",
+    "user_course.progress_reset",
+}
+REMOVE_EVENTS = {"user_course.archived"}
+
+
+async def ensure_group(redis: Redis) -> None:
+    try:
+        await redis.xgroup_create(
+            settings.outbox.stream_key,
+            settings.leaderboard.consumer_group,
+            id="0",
+            mkstream=True,
+        )
+    except ResponseError as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+
+async def apply_event(leaderboards: LeaderboardRepository, fields: dict[str, Any]) -> None:
+    event_type = fields.get("type")
+    if event_type not in SCORE_EVENTS and event_type not in REMOVE_EVENTS:
+        return
+
+    payload = json.loads(fields["payload"])
+    if event_type in REMOVE_EVENTS:
+        await leaderboards.remove(payload["course_id"], payload["user_id"])
+    elif "score" in payload:
+        await leaderboards.set_score(payload["course_id"], payload["user_id"], payload["score"])
+
+
+async def last_event_id(redis: Redis) -> str:
+    '''Id последнего события в потоке, "0-0" если поток пуст'''
+    entries = await redis.xrevrange(settings.outbox.stream_key, count=1)
+    return entries[0][0] if entries else "0-0"
+
+
+async def replay_events(
+    leaderboards: LeaderboardRepository,
+    redis: Redis,
+    course_id: Any,
+    after_id: str,
+) -> int:
+    '''Применить к рейтингу курса события потока, добавленные после after_id'''
+    applied = 0
+    while True:
+        messages = await redis.xrange(
+            settings.outbox.stream_key,
+            min=f"({after_id}",
+            count=settings.leaderboard.batch_size,
+        )
+        if not messages:
+            return applied
+        for _, fields in messages:
+            if "payload" not in fields:
+                continue
+            if str(json.loads(fields["payload"]).get("course_id")) == str(course_id):
+                await apply_event(leaderboards, fields)
+                applied += 1
+        after_id = messages[-1][0]
+
+
+async def run_leaderboard_consumer(redis: Redis, stopping: asyncio.Event) -> None:
+    leaderboards = LeaderboardRepository(redis)
+    stream = settings.outbox.stream_key
+    group = settings.leaderboard.consumer_group
+    consumer = socket.gethostname()
+    group_ready = False
+    # "0" - свои неподтвержденные события, ">" - новые
+    last_id = "0"
+
+    while not stopping.is_set():
+        try:
+            if not group_ready:
+                await ensure_group(redis)
+                group_ready = True
+
+            response = await redis.xreadgroup(
+                group,
+                consumer,
+                {stream: last_id},
+                count=settings.leaderboard.batch_size,
+                block=int(settings.jobs.poll_timeout * 1000) if last_id == ">" else None,
+            )
+            messages = response[0][1] if response else []
+            if not messages:
+                last_id = ">"
+                continue
+
+            for _, fields in messages:
+                # Pending entries already trimmed from the stream come back empty.
+                if fields:
+                    await apply_event(leaderboards, fields)
+            await redis.xack(stream, group, *(message_id for message_id, _ in messages))
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+            group_ready = False
+            await asyncio.sleep(settings.jobs.poll_timeout)
@@ -1,8 +1,13 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
-from redis.asyncio import Redis
+from fastapi import FastAPI, Request, status
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+from sqlalchemy.orm.exc import StaleDataError
 
+from src.api.idempotency import IdempotencyMiddleware
 from src.api.v1.auth_api import router as auth_router
 from src.api.v1.course_api import router as course_router
 from src.api.v1.admin_api import router as admin_router
@@ -10,24 +15,22 @@ from src.api.v1.test_question_api import router as test_question_router
 from src.api.v1.review_api import router as review_router
 from src.api.v1.lesson_api import router as lesson_router
 from src.api.v1.user_course_api import router as user_course_router
-from src.redis_client import set_redis_client
+from src.database import engine
+from src.redis_client import create_redis_client, set_redis_client
+from src.services.password_hasher import shutdown_hash_pool
 
 from src.configs.app import settings
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    redis = Redis(
-        host=settings.redis.redis_host,
-        port=settings.redis.redis_port,
-        db=settings.redis.redis_db,
-        password=settings.redis.redis_password or None,
-        decode_responses=True,
-    )
+    redis = create_redis_client(settings.redis)
     set_redis_client(redis)
     yield
+    shutdown_hash_pool()
     await redis.close()
     await redis.connection_pool.disconnect()
+    await engine.dispose()
 
 
 app = FastAPI(
@@ -37,6 +40,35 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Внутри GZip: сохраняются и повторяются несжатые ответы
+app.add_middleware(
+    IdempotencyMiddleware,
+    routes=[
+        ("POST", "/api/v1/test_questions/check"),
+        ("POST", "/api/v1/user_courses/enroll/{course_id}"),
+        ("POST", "/api/v1/reviews/"),
+    ],
+)
+app.add_middleware(GZipMiddleware, minimum_size=settings.app.app_gzip_minimum_size)
+
+
+@app.exception_handler(RedisConnectionError)
+@app.exception_handler(RedisTimeoutError)
+async def redis_unavailable_handler(request: Request, exc: Exception) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Service temporarily unavailable"},
+    )
+
+
+@app.exception_handler(StaleDataError)
+async def stale_data_handler(request: Request, exc: StaleDataError) -> JSONResponse:
+    # Строку с version_id_col изменил параллельный запрос
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"detail": "Resource was changed concurrently, please retry"},
+    )
+
 app.include_router(auth_router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(course_router, prefix="/api/v1/courses", tags=["course"])
 app.include_router(admin_router, prefix="/api/v1/admin", tags=["admin"])
@@ -53,4 +85,4 @@ app.include_router(
 )
 
 app.include_router(lesson_router, prefix="/api/v1/lessons",tags=["lessons"])
-app.include_router(user_course_router, prefix="/api/v1/user_courses", tags=["user_courses"])
\ No newline at end of file
+app.include_router(user_course_router, prefix="/api/v1/user_courses", tags=["user_courses"])
@@ -6,4 +6,8 @@ from .user import User
 from .lesson import Lesson
 from .review import Review
 from .user_course import UserCourse
-__all__ = ["Base", "BaseModelMixin", "Course", "Lesson", "TestQuestion", "User", "Review", "UserCourse"]
+from .outbox import OutboxEvent
+from .archived_record import ArchivedRecord
+from .answer_attempt import AnswerAttempt
+from .question_stats import QuestionStats
+__all__ = ["Base", "BaseModelMixin", "Course", "Lesson", "TestQuestion", "User", "Review", "UserCourse", "OutboxEvent", "ArchivedRecord", "AnswerAttempt", "QuestionStats"]
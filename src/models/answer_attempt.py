@@ -0,0 +1,50 @@
+from datetime import datetime
+from uuid import UUID as PyUUID
+
+from sqlalchemy import BigInteger, Boolean, DateTime, Identity, Index, Text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, partition_by_month
+
+# На сколько месяцев вперед держать готовые партиции answer_attempts
+ANSWER_ATTEMPT_MONTHS_AHEAD = 2
+
+
+class AnswerAttempt(Base):
+    """Ответ пользователя на вопрос теста (журнал, строки только добавляются).
+
+    Таблица секционирована PARTITION BY RANGE (created_at) по месяцам, поэтому
+    created_at входит в первичный ключ; старые месяцы удаляются целой
+    партицией. Внешних ключей нет: журнал переживает удаление вопросов и
+    пользователей. attempt_id назначается в /check, по нему повторно
+    доставленный из очереди ответ не записывается второй раз.
+    """
+
+    __tablename__ = "answer_attempts"
+    __table_args__ = (
+        Index("ix_answer_attempts_question_id_created_at", "question_id", "created_at"),
+        Index("ix_answer_attempts_user_id_created_at", "user_id", "created_at"),
+        Index("uq_answer_attempts_attempt_id", "attempt_id", "created_at", unique=True),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, primary_key=True, default=datetime.utcnow
+    )
+    attempt_id: Mapped[PyUUID | None] = mapped_column(PG_UUID(as_uuid=True), nullable=True)
+    user_id: Mapped[PyUUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    question_id: Mapped[PyUUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    lesson_id: Mapped[PyUUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    answer: Mapped[str] = mapped_column(Text, nullable=False)
+    passed: Mapped[bool] = mapped_column(Boolean, nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"AnswerAttempt(id={self.id}, user_id={self.user_id}, "
+            f"question_id={self.question_id}, passed={self.passed})"
+        )
+
+
+partition_by_month(AnswerAttempt.__table__, ANSWER_ATTEMPT_MONTHS_AHEAD)
@@ -0,0 +1,38 @@
+from datetime import datetime
+from typing import Any, Dict
+from uuid import UUID as PyUUID
+
+from sqlalchemy import BigInteger, DateTime, Index, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class ArchivedRecord(Base):
+    """Строка, перенесенная из рабочей таблицы после срока хранения архива.
+
+    data - вся строка в JSONB, поэтому архив не зависит от схемы исходной
+    таблицы; экспорт в файлы удаляет записи отсюда.
+    """
+
+    __tablename__ = "archived_records"
+    __table_args__ = (
+        Index("ix_archived_records_table_name_record_id", "table_name", "record_id"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    table_name: Mapped[str] = mapped_column(String, nullable=False)
+    record_id: Mapped[PyUUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    # update_at строки на момент переноса (для архивных строк - время архивации)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    moved_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.utcnow
+    )
+    data: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"ArchivedRecord(id={self.id}, table_name={self.table_name!r}, "
+            f"record_id={self.record_id})"
+        )
@@ -1,16 +1,104 @@
-from datetime import datetime
+import re
+from datetime import date, datetime
 from uuid import UUID as PyUUID
 from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime
+from sqlalchemy import DDL, Boolean, DateTime, Index, Table, event, text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, declarative_mixin, mapped_column
 
+# Конфигурация полнотекстового поиска (tsvector-колонки и запросы)
+SEARCH_CONFIG = "russian"
+
 
 class Base(DeclarativeBase):
     pass
 
 
+# Триграммные индексы (users, test_questions) требуют расширения pg_trgm
+event.listen(
+    Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+)
+
+
+# Таблицы, секционированные PARTITION BY HASH: имя таблицы -> число партиций
+HASH_PARTITIONS: dict[str, int] = {}
+
+
+def hash_partition_ddl(table_name: str, modulus: int) -> list[str]:
+    """CREATE TABLE для каждой партиции (и для create_all, и для миграций)"""
+    return [
+        f"CREATE TABLE IF NOT EXISTS {table_name}_p{remainder} PARTITION OF {table_name} "
+        f"FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder})"
+        for remainder in range(modulus)
+    ]
+
+
+def partition_by_hash(table: Table, modulus: int) -> None:
+    """Создавать партиции вместе с таблицей; в метаданные они не попадают"""
+    HASH_PARTITIONS[table.name] = modulus
+    for ddl in hash_partition_ddl(table.name, modulus):
+        event.listen(table, "after_create", DDL(ddl))
+
+
+# Таблицы, секционированные PARTITION BY RANGE по месяцам
+MONTHLY_PARTITIONS: set[str] = set()
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_partition_name(table_name: str, month: date) -> str:
+    return f"{table_name}_y{month:%Y}m{month:%m}"
+
+
+def month_partition_ddl(table_name: str, month: date) -> str:
+    """CREATE TABLE для партиции месяца, в который попадает month"""
+    start = month.replace(day=1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {month_partition_name(table_name, start)} "
+        f"PARTITION OF {table_name} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{add_months(start, 1).isoformat()}')"
+    )
+
+
+def partition_by_month(table: Table, months_ahead: int) -> None:
+    """Создавать вместе с таблицей DEFAULT-партицию и партиции на months_ahead месяцев вперед.
+
+    Следующие месяцы создаются заранее фоновым процессом; DEFAULT принимает
+    строки, если он не успел.
+    """
+    MONTHLY_PARTITIONS.add(table.name)
+    event.listen(table, "after_create", DDL(
+        f"CREATE TABLE IF NOT EXISTS {table.name}_default PARTITION OF {table.name} DEFAULT"
+    ))
+    today = date.today()
+    for months in range(months_ahead + 1):
+        event.listen(
+            table, "after_create", DDL(month_partition_ddl(table.name, add_months(today, months)))
+        )
+
+
+def is_partition(name: str) -> bool:
+    """Партиция известной таблицы (alembic autogenerate их пропускает)"""
+    return any(
+        name.startswith(f"{table}_p") and name[len(table) + 2:].isdigit()
+        for table in HASH_PARTITIONS
+    ) or any(
+        re.fullmatch(rf"{table}_(y\d{{4}}m\d{{2}}|default)", name)
+        for table in MONTHLY_PARTITIONS
+    )
+
+
+def archived_index(table_name: str) -> Index:
+    """Частичный индекс архивных строк по update_at (поиск строк с истекшим сроком хранения)"""
+    return Index(
+        f"ix_{table_name}_archived_update_at", "update_at", postgresql_where=text("archived")
+    )
+
+
 @declarative_mixin
 class BaseModelMixin:
     uuid: Mapped[PyUUID] = mapped_column(
@@ -20,6 +108,6 @@ class BaseModelMixin:
         DateTime, nullable=False, default=datetime.utcnow
     )
     update_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.utcnow
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
     )
     archived: Mapped[bool] = mapped_column(Boolean, default=False)
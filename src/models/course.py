@@ -1,16 +1,51 @@
 from typing import Any, List
 
-from sqlalchemy import String, Text
+from sqlalchemy import Computed, Float, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import Base, BaseModelMixin
+from .base import SEARCH_CONFIG, Base, BaseModelMixin, archived_index
 
 
 class Course(Base, BaseModelMixin):
     __tablename__ = "courses"
+    __table_args__ = (
+        archived_index("courses"),
+        Index("ix_courses_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_courses_rating_avg", "rating_avg"),
+    )
 
     name: Mapped[str] = mapped_column(String, nullable=False, unique=True)
     desc: Mapped[str | None] = mapped_column(Text, nullable=True)
+    search_vector: Mapped[Any] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(\"desc\", '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+    # Количество активных отзывов, поддерживается ReviewRepository
+    review_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    # Агрегаты оценок (1-5) активных отзывов, поддерживаются ReviewRepository
+    rating_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    rating_sum: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    rating_1: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_2: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_3: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_4: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_5: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_avg: Mapped[float | None] = mapped_column(
+        Float,
+        Computed("rating_sum::double precision / NULLIF(rating_count, 0)", persisted=True),
+    )
 
     lessons: Mapped[List["Lesson"]] = relationship(  # type: ignore  # noqa: F821
         "Lesson", back_populates="course", cascade="all, delete-orphan"
@@ -26,6 +61,10 @@ class Course(Base, BaseModelMixin):
         cascade="all, delete-orphan",
     )
 
+    @property
+    def rating_histogram(self) -> dict[int, int]:
+        return {star: getattr(self, f"rating_{star}") for star in range(1, 6)}
+
     def __repr__(self) -> str:
         return f"Course(uuid={self.uuid}, name={self.name!r}, desc={self.desc!r})"
 
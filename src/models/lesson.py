@@ -1,19 +1,34 @@
 from typing import Any, List
 from uuid import UUID as PyUUID
 
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import Computed, ForeignKey, Index, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import Base, BaseModelMixin
+from .base import SEARCH_CONFIG, Base, BaseModelMixin, archived_index
 from .course import Course
 
 class Lesson(Base, BaseModelMixin):
     __tablename__ = "lessons"
+    __table_args__ = (
+        archived_index("lessons"),
+        Index("ix_lessons_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     desc: Mapped[str | None] = mapped_column(Text, nullable=True)
     content: Mapped[str | None] = mapped_column(Text, nullable=True)
     video_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    search_vector: Mapped[Any] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(\"desc\", '')), 'B') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
     
     # Foreign key to course
     course_id: Mapped[PyUUID] = mapped_column(
@@ -0,0 +1,39 @@
+from datetime import datetime
+from uuid import UUID as PyUUID
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class QuestionStats(Base):
+    """Счетчики ответов на вопрос, поддерживаются QuestionStatsRepository.
+
+    Увеличиваются вместе с записью пачки в answer_attempts, поэтому отчеты
+    о сложности читают только эту таблицу, а не прогресс пользователей.
+    """
+
+    __tablename__ = "question_stats"
+    __table_args__ = (
+        Index("ix_question_stats_lesson_id", "lesson_id"),
+    )
+
+    question_id: Mapped[PyUUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("test_questions.uuid", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    lesson_id: Mapped[PyUUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    attempts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    correct: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    update_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"QuestionStats(question_id={self.question_id}, "
+            f"attempts={self.attempts}, correct={self.correct})"
+        )
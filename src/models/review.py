@@ -1,15 +1,20 @@
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import Text, ForeignKey
+from sqlalchemy import CheckConstraint, Index, SmallInteger, Text, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import Base, BaseModelMixin
+from .base import Base, BaseModelMixin, archived_index
 
 
 class Review(Base, BaseModelMixin):
     __tablename__ = "reviews"
+    __table_args__ = (
+        archived_index("reviews"),
+        Index("ix_reviews_course_id_create_at", "course_id", "create_at", "uuid"),
+        CheckConstraint("rating BETWEEN 1 AND 5", name="ck_reviews_rating"),
+    )
 
     user_id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -22,6 +27,7 @@ class Review(Base, BaseModelMixin):
         nullable=False,
     )
     content: Mapped[str] = mapped_column(Text, nullable=False)
+    rating: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
 
     course = relationship("Course", back_populates="reviews")
 
@@ -34,4 +40,5 @@ class Review(Base, BaseModelMixin):
             "user_id": self.user_id,
             "course_id": self.course_id,
             "content": self.content,
+            "rating": self.rating,
         }
@@ -1,21 +1,32 @@
 from typing import Any, List
 from uuid import UUID
 
-from sqlalchemy import String, Text, ForeignKey, ARRAY, Integer
+from sqlalchemy import String, Text, ForeignKey, ARRAY, Index, Integer
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
-from .base import Base, BaseModelMixin
+from .base import Base, BaseModelMixin, archived_index
 from .lesson import Lesson
 
 
 class TestQuestion(Base, BaseModelMixin):
     __tablename__ = "test_questions"
+    __table_args__ = (
+        archived_index("test_questions"),
+        Index(
+            "ix_test_questions_question_trgm", "question",
+            postgresql_using="gin", postgresql_ops={"question": "gin_trgm_ops"},
+        ),
+    )
 
     question_num: Mapped[int] = mapped_column(Integer, nullable=False)
     desc: Mapped[str | None] = mapped_column(Text, nullable=True)
     question: Mapped[str] = mapped_column(Text, nullable=False)
     choices: Mapped[List[str]] = mapped_column(ARRAY(String), nullable=False)
     correct_answer: Mapped[str] = mapped_column(String, nullable=False)
+    # Нормализованный правильный ответ и его позиция в choices,
+    # вычисляются при записи (см. TestQuestionService.answer_columns)
+    answer_key: Mapped[str] = mapped_column(String, nullable=False)
+    answer_index: Mapped[int | None] = mapped_column(Integer, nullable=True)
     lesson_id: Mapped[UUID] = mapped_column(
         ForeignKey("lessons.uuid", ondelete="CASCADE"),
         nullable=False
@@ -1,14 +1,25 @@
 from typing import Any, List
 
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import Base, BaseModelMixin
+from .base import Base, BaseModelMixin, archived_index
 
 
 class User(Base, BaseModelMixin):
     __tablename__ = "users"
+    __table_args__ = (
+        archived_index("users"),
+        Index(
+            "ix_users_email_trgm", "email",
+            postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_users_username_trgm", "username",
+            postgresql_using="gin", postgresql_ops={"username": "gin_trgm_ops"},
+        ),
+    )
 
     username: Mapped[str | None] = mapped_column(String, nullable=True)
     email: Mapped[str] = mapped_column(String, nullable=False, unique=True)
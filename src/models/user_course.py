@@ -2,22 +2,37 @@ from typing import Any, List, Dict
 from uuid import UUID as PyUUID
 import json
 
-from sqlalchemy import ForeignKey, JSON, Float
+from sqlalchemy import ForeignKey, JSON, Float, Integer, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 
-from .base import Base, BaseModelMixin
+from .base import Base, BaseModelMixin, archived_index, partition_by_hash
 from .user import User
 from .course import Course
 from .lesson import Lesson
 
+# Число партиций user_courses; меняется только миграцией с переносом данных
+USER_COURSE_PARTITIONS = 16
+
+
 class UserCourse(Base, BaseModelMixin):
+    """Запись пользователя на курс с прогрессом.
+
+    Таблица секционирована PARTITION BY HASH (user_id), поэтому user_id входит
+    в первичный ключ и во все уникальные ограничения; запросы с условием на
+    user_id читают одну партицию.
+    """
     __tablename__ = "user_courses"
+    __table_args__ = (
+        archived_index("user_courses"),
+        UniqueConstraint("user_id", "course_id", name="uq_user_courses_user_id_course_id"),
+        {"postgresql_partition_by": "HASH (user_id)"},
+    )
 
     user_id: Mapped[PyUUID] = mapped_column(
         PG_UUID(as_uuid=True),
         ForeignKey("users.uuid", ondelete="CASCADE"),
-        nullable=False
+        primary_key=True
     )
     course_id: Mapped[PyUUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -29,10 +44,19 @@ class UserCourse(Base, BaseModelMixin):
         nullable=False,
         default= list
     )
+    # Версия строки: ORM обновляет user_courses с условием на version
+    # и увеличивает ее (оптимистическая блокировка прогресса)
+    version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default="1"
+    )
     # Связи
     user: Mapped[User] = relationship("User", back_populates="user_courses")
     course: Mapped[Course] = relationship("Course", back_populates="user_courses")
 
+    __mapper_args__ = {"version_id_col": version}
+
     def __repr__(self) -> str:
         return f"UserCourse(uuid={self.uuid}, user_id={self.user_id}, course_id={self.course_id}"
 
@@ -45,3 +69,6 @@ class UserCourse(Base, BaseModelMixin):
             "create_at": self.create_at,
             "update_at": self.update_at,
         }
+
+
+partition_by_hash(UserCourse.__table__, USER_COURSE_PARTITIONS)
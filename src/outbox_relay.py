@@ -0,0 +1,112 @@
+"""Publishes outbox events to a Redis stream.
+
+Events are read in id order with ``FOR UPDATE SKIP LOCKED``, appended to
+``outbox.stream_key`` in one pipeline and marked published in the same
+transaction. If the commit fails after XADD the batch is sent again, so
+consumers should deduplicate by the ``id`` field.
+
+The stream is trimmed once per batch, not by XADD: it keeps the last
+``outbox.stream_maxlen`` events plus everything the slowest consumer group
+has not acknowledged yet (its pending entries and lag), so a lagging
+consumer does not lose events to trimming.
+
+Once per ``outbox.cleanup_interval`` events published more than
+``outbox.retention_days`` ago are deleted in batches of
+``outbox.cleanup_batch_size``, so the table does not grow without bound.
+"""
+import asyncio
+import json
+import sys
+import time
+import traceback
+from datetime import datetime, timedelta
+
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from src.configs.app import settings
+from src.database import async_session_maker
+from src.repositories.outbox import OutboxRepository
+
+
+async def stream_retention(redis: Redis) -> int | None:
+    '''Сколько последних событий оставить в потоке, None - пока не обрезать'''
+    try:
+        groups = await redis.xinfo_groups(settings.outbox.stream_key)
+    except ResponseError:
+        return settings.outbox.stream_maxlen
+
+    backlog = 0
+    for group in groups:
+        # lag неизвестен (например, после XDEL) - не рискуем непрочитанными событиями
+        if group.get("lag") is None:
+            return None
+        backlog = max(backlog, group["pending"] + group["lag"])
+    return settings.outbox.stream_maxlen + backlog
+
+
+async def relay_batch(redis: Redis) -> int:
+    async with async_session_maker() as session, session.begin():
+        repo = OutboxRepository(session)
+        events = await repo.lock_unpublished(settings.outbox.batch_size)
+        if not events:
+            return 0
+
+        async with redis.pipeline(transaction=False) as pipe:
+            for event in events:
+                pipe.xadd(
+                    settings.outbox.stream_key,
+                    {
+                        "id": event.id,
+                        "type": event.event_type,
+                        "aggregate_type": event.aggregate_type,
+                        "aggregate_id": str(event.aggregate_id),
+                        "payload": json.dumps(event.payload),
+                        "created_at": event.create_at.isoformat(),
+                    },
+                )
+            await pipe.execute()
+
+        retention = await stream_retention(redis)
+        if retention is not None:
+            await redis.xtrim(settings.outbox.stream_key, maxlen=retention, approximate=True)
+
+        await repo.mark_published([event.id for event in events])
+        return len(events)
+
+
+async def delete_published() -> int:
+    cutoff = datetime.utcnow() - timedelta(days=settings.outbox.retention_days)
+    deleted = 0
+    while True:
+        async with async_session_maker() as session, session.begin():
+            count = await OutboxRepository(session).delete_published_before(
+                cutoff, settings.outbox.cleanup_batch_size
+            )
+        deleted += count
+        if count < settings.outbox.cleanup_batch_size:
+            return deleted
+
+
+async def run_relay(redis: Redis, stopping: asyncio.Event) -> None:
+    next_cleanup = 0.0
+    while not stopping.is_set():
+        if time.monotonic() >= next_cleanup:
+            next_cleanup = time.monotonic() + settings.outbox.cleanup_interval
+            try:
+                await delete_published()
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+        try:
+            published = await relay_batch(redis)
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+            published = 0
+
+        # A full batch means there is probably more waiting.
+        if published < settings.outbox.batch_size:
+            try:
+                await asyncio.wait_for(stopping.wait(), settings.outbox.poll_interval)
+            except TimeoutError:
+                pass
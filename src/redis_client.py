@@ -1,8 +1,118 @@
-from redis.asyncio import Redis
+import time
+from typing import Any
+
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.retry import Retry
+from redis.backoff import EqualJitterBackoff
+from redis.exceptions import ConnectionError, TimeoutError
+
+from src.configs.app import RedisConfig
 
 _redis_client: Redis | None = None
 
 
+class CircuitOpenError(ConnectionError):
+    pass
+
+
+class CircuitBreaker:
+    """Fails Redis calls fast after repeated connection errors.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    every call is rejected until ``reset_timeout`` seconds have passed.
+    The next call is then let through (half-open): success closes the
+    circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.rejected = 0
+        self.opened_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> None:
+        if self.state == "open":
+            self.rejected += 1
+            raise CircuitOpenError("Redis circuit breaker is open")
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class CircuitBreakerRedis(Redis):
+    breaker: CircuitBreaker
+
+    async def execute_command(self, *args, **options):
+        self.breaker.before_call()
+        try:
+            result = await super().execute_command(*args, **options)
+        except (ConnectionError, TimeoutError):
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return result
+
+
+def create_redis_client(config: RedisConfig) -> CircuitBreakerRedis:
+    pool = BlockingConnectionPool(
+        host=config.redis_host,
+        port=config.redis_port,
+        db=config.redis_db,
+        password=config.redis_password or None,
+        decode_responses=True,
+        max_connections=config.redis_max_connections,
+        timeout=config.redis_pool_timeout,
+        socket_connect_timeout=config.redis_socket_connect_timeout,
+        socket_timeout=config.redis_socket_timeout,
+        health_check_interval=config.redis_health_check_interval,
+        retry=Retry(
+            EqualJitterBackoff(
+                cap=config.redis_retry_backoff_cap,
+                base=config.redis_retry_backoff_base,
+            ),
+            config.redis_retry_attempts,
+        ),
+    )
+    client = CircuitBreakerRedis(connection_pool=pool)
+    client.breaker = CircuitBreaker(
+        failure_threshold=config.redis_circuit_failure_threshold,
+        reset_timeout=config.redis_circuit_reset_timeout,
+    )
+    return client
+
+
+def get_redis_pool_stats(client: Redis) -> dict[str, Any]:
+    pool = client.connection_pool
+    in_use = len(pool._in_use_connections)
+    idle = len(pool._available_connections)
+    breaker = getattr(client, "breaker", None)
+
+    return {
+        "max_connections": pool.max_connections,
+        "in_use_connections": in_use,
+        "idle_connections": idle,
+        "created_connections": in_use + idle,
+        "circuit_state": breaker.state if breaker else "disabled",
+        "circuit_failures": breaker.failures if breaker else 0,
+        "circuit_rejected": breaker.rejected if breaker else 0,
+    }
+
+
 def set_redis_client(client: Redis) -> None:
     global _redis_client
     _redis_client = client
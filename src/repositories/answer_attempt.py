@@ -0,0 +1,166 @@
+import json
+import re
+from collections.abc import Sequence
+from datetime import date
+from typing import Any
+
+from fastapi import Depends
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError, TimeoutError
+from sqlalchemy import RowMapping, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.configs.app import settings
+from src.models.answer_attempt import AnswerAttempt
+from src.models.base import add_months, month_partition_ddl, month_partition_name
+from src.redis_client import get_redis_client
+
+
+# Добавляет ответы, только если в очереди меньше ARGV[1] элементов
+PUSH_CAPPED_SCRIPT = """
+if redis.call('LLEN', KEYS[1]) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('RPUSH', KEYS[1], unpack(ARGV, 2))
+return #ARGV - 1
+"""
+
+
+class AnswerAttemptQueue:
+    """Буфер ответов в списке Redis до пакетной записи в answer_attempts.
+
+    /check добавляет ответы в очередь, пока она короче max_queue_length
+    (если база долго недоступна, новые ответы в журнал не попадают); воркер
+    читает голову списка и удаляет ее только после записи в базу (ответ может
+    быть записан дважды, если воркер упадет между INSERT и LTRIM). Ответы,
+    которые не удалось записать за max_retries попыток, переносятся в
+    dead_letter_key.
+    """
+
+    def __init__(self, db: Redis):
+        self.db = db
+        self.push_script = db.register_script(PUSH_CAPPED_SCRIPT)
+
+    @property
+    def failures_key(self) -> str:
+        return f"{settings.answer_log.queue_key}:failures"
+
+    async def push(self, attempts: list[dict[str, Any]]) -> None:
+        '''Добавить ответы в очередь; без Redis ответы не попадают в журнал'''
+        if not attempts:
+            return
+        try:
+            await self.push_script(
+                keys=[settings.answer_log.queue_key],
+                args=[
+                    settings.answer_log.max_queue_length,
+                    *(json.dumps(attempt, default=str) for attempt in attempts),
+                ],
+            )
+        except (ConnectionError, TimeoutError):
+            pass
+
+    async def peek(self, count: int) -> list[str]:
+        return await self.db.lrange(settings.answer_log.queue_key, 0, count - 1)
+
+    async def record_failure(self) -> int:
+        '''Учесть неудачную запись головы очереди, вернуть число неудач подряд'''
+        return await self.db.incr(self.failures_key)
+
+    async def trim(self, count: int, dead: list[str] | None = None) -> None:
+        '''Удалить count ответов из головы очереди, dead - в dead-letter список'''
+        async with self.db.pipeline(transaction=True) as pipe:
+            if dead:
+                pipe.rpush(settings.answer_log.dead_letter_key, *dead)
+                pipe.ltrim(
+                    settings.answer_log.dead_letter_key, -settings.answer_log.max_queue_length, -1
+                )
+            pipe.ltrim(settings.answer_log.queue_key, count, -1)
+            pipe.delete(self.failures_key)
+            await pipe.execute()
+
+
+class AnswerAttemptRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add_many(self, attempts: list[dict[str, Any]]) -> Sequence[RowMapping]:
+        '''Записать пачку ответов одним INSERT, вернуть (question_id, passed) новых.
+
+        Ответы, уже записанные раньше (тот же attempt_id), пропускаются.
+        '''
+        if not attempts:
+            return []
+        result = await self.db.execute(
+            insert(AnswerAttempt)
+            .on_conflict_do_nothing(index_elements=["attempt_id", "created_at"])
+            .returning(AnswerAttempt.question_id, AnswerAttempt.passed),
+            attempts,
+        )
+        return result.mappings().all()
+
+    async def create_partitions(self, today: date, months_ahead: int) -> None:
+        """Создать партиции текущего и months_ahead следующих месяцев.
+
+        Если строки месяца уже попали в DEFAULT-партицию (воркер долго не
+        работал), CREATE ... PARTITION OF упадет. Тогда DEFAULT на время
+        отсоединяется, строки месяца переносятся в новую партицию и DEFAULT
+        подключается обратно.
+        """
+        table = AnswerAttempt.__tablename__
+        for months in range(months_ahead + 1):
+            start = add_months(today, months)
+            name = month_partition_name(table, start)
+            if await self.db.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}):
+                continue
+
+            bounds = {"start": start, "end": add_months(start, 1)}
+            in_default = await self.db.scalar(
+                text(
+                    f"SELECT EXISTS (SELECT 1 FROM {table}_default "
+                    "WHERE created_at >= :start AND created_at < :end)"
+                ),
+                bounds,
+            )
+            if not in_default:
+                await self.db.execute(text(month_partition_ddl(table, start)))
+                continue
+
+            await self.db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {table}_default"))
+            await self.db.execute(text(month_partition_ddl(table, start)))
+            await self.db.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM {table}_default "
+                    "WHERE created_at >= :start AND created_at < :end RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                ),
+                bounds,
+            )
+            await self.db.execute(
+                text(f"ALTER TABLE {table} ATTACH PARTITION {table}_default DEFAULT")
+            )
+
+    async def drop_partitions_before(self, month: date) -> list[str]:
+        '''Удалить партиции месяцев раньше month, вернуть их имена'''
+        table = AnswerAttempt.__tablename__
+        result = await self.db.execute(
+            text(
+                "SELECT inhrelid::regclass::text FROM pg_inherits "
+                "WHERE inhparent = CAST(:table AS regclass)"
+            ),
+            {"table": table},
+        )
+        dropped = []
+        for name in result.scalars():
+            found = re.fullmatch(rf"{table}_y(\d{{4}})m(\d{{2}})", name)
+            if found and date(int(found[1]), int(found[2]), 1) < month:
+                await self.db.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+        return dropped
+
+
+async def get_answer_attempt_queue(
+    db: Redis = Depends(get_redis_client),
+) -> AnswerAttemptQueue:
+    return AnswerAttemptQueue(db)
@@ -0,0 +1,118 @@
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger, ColumnElement, Table, any_, delete, exists, func, insert, literal, literal_column,
+    or_, select,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.archived_record import ArchivedRecord
+from src.models.course import Course
+from src.models.lesson import Lesson
+from src.models.review import Review
+from src.models.test_question import TestQuestion
+from src.models.user import User
+from src.models.user_course import UserCourse
+
+courses: Table = Course.__table__  # type: ignore[assignment]
+lessons: Table = Lesson.__table__  # type: ignore[assignment]
+test_questions: Table = TestQuestion.__table__  # type: ignore[assignment]
+reviews: Table = Review.__table__  # type: ignore[assignment]
+user_courses: Table = UserCourse.__table__  # type: ignore[assignment]
+users: Table = User.__table__  # type: ignore[assignment]
+
+# Таблица -> [(внешний ключ, родитель)]. Строка переносится и тогда, когда
+# истек срок хранения ее родителя: иначе FK ON DELETE CASCADE удалил бы ее
+# вместе с родителем без копии в архиве.
+PARENTS: dict[str, list[tuple[str, Table]]] = {
+    "test_questions": [("lesson_id", lessons)],
+    "lessons": [("course_id", courses)],
+    "reviews": [("course_id", courses), ("user_id", users)],
+    "user_courses": [("course_id", courses), ("user_id", users)],
+}
+
+# Дочерние таблицы переносятся раньше родительских
+PURGE_ORDER: list[Table] = [test_questions, user_courses, reviews, lessons, courses, users]
+
+
+class ArchiveRepository:
+    """Перенос архивных строк с истекшим сроком хранения в archived_records."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def expired(table: Table, cutoff: datetime) -> ColumnElement[bool]:
+        '''Строка архивирована раньше cutoff или срок хранения истек у ее родителя'''
+        return or_(
+            (table.c.archived == True) & (table.c.update_at < cutoff),  # noqa: E712
+            *(
+                table.c[column].in_(
+                    select(parent.c.uuid).where(ArchiveRepository.expired(parent, cutoff))
+                )
+                for column, parent in PARENTS.get(table.name, [])
+            ),
+        )
+
+    @staticmethod
+    def has_children(table: Table) -> list[ColumnElement[bool]]:
+        return [
+            exists().where(child.c[column] == table.c.uuid)
+            for child in PURGE_ORDER
+            for column, parent in PARENTS.get(child.name, [])
+            if parent is table
+        ]
+
+    async def move_batch(self, table: Table, cutoff: datetime, limit: int) -> int:
+        '''Перенести до limit строк одним запросом (DELETE ... RETURNING -> INSERT).
+
+        Строки, занятые другими транзакциями, пропускаются (SKIP LOCKED), а
+        родительская строка переносится только после всех дочерних.
+        '''
+        batch = (
+            select(table.c.uuid)
+            .where(self.expired(table, cutoff), *(~c for c in self.has_children(table)))
+            .order_by(table.c.update_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        moved = (
+            delete(table)
+            .where(table.c.uuid.in_(batch))
+            .returning(
+                table.c.uuid,
+                table.c.update_at,
+                # search_vector вычисляется из других колонок
+                literal_column(f"to_jsonb({table.name}) - 'search_vector'").label("data"),
+            )
+            .cte("moved")
+        )
+        stmt = insert(ArchivedRecord).from_select(
+            ["table_name", "record_id", "archived_at", "moved_at", "data"],
+            select(
+                literal(table.name),
+                moved.c.uuid,
+                moved.c.update_at,
+                func.timezone("utc", func.now()),
+                moved.c.data,
+            ),
+        ).add_cte(moved)
+        result = await self.db.execute(stmt)
+        return result.rowcount
+
+    async def get_after(self, after_id: int, limit: int) -> Sequence[ArchivedRecord]:
+        result = await self.db.execute(
+            select(ArchivedRecord)
+            .where(ArchivedRecord.id > after_id)
+            .order_by(ArchivedRecord.id)
+            .limit(limit)
+        )
+        return result.scalars().all()
+
+    async def delete_many(self, ids: Sequence[int]) -> int:
+        result = await self.db.execute(
+            delete(ArchivedRecord).where(ArchivedRecord.id == any_(literal(list(ids), ARRAY(BigInteger))))
+        )
+        return result.rowcount
@@ -0,0 +1,85 @@
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy import Row, bindparam, func, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_session
+from src.models.lesson import Lesson
+from src.models.test_question import TestQuestion
+from src.models.user_course import UserCourse
+
+# Ответы каждой записи на курс как два массива: номер столбца вопроса в
+# матрице (1-based, по порядку question_ids) и оценка, и секунды от записи
+# до последнего изменения. JSON прогресса разбирается в Postgres, в Python
+# приходят только числа.
+COURSE_ANSWERS = text("""
+    SELECT extract(epoch FROM uc.update_at - uc.create_at)::float8 AS seconds,
+           answers.cols, answers.estimates
+    FROM user_courses uc
+    LEFT JOIN LATERAL (
+        SELECT array_agg(c.col) AS cols,
+               array_agg(coalesce((q.value ->> 'estimate')::float8, 0)) AS estimates
+        FROM json_array_elements(
+            CASE WHEN json_typeof(uc.progress) = 'array' THEN uc.progress ELSE '[]' END
+        ) AS l(value)
+        CROSS JOIN json_array_elements(
+            CASE WHEN json_typeof(l.value -> 'questions') = 'array'
+                 THEN l.value -> 'questions' ELSE '[]' END
+        ) AS q(value)
+        JOIN unnest(CAST(:question_ids AS uuid[])) WITH ORDINALITY AS c(question_id, col)
+            ON c.question_id::text = q.value ->> 'question_id'
+    ) AS answers ON true
+    WHERE uc.course_id = :course_id AND uc.archived = false
+""").bindparams(
+    bindparam("question_ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+    bindparam("course_id", type_=PG_UUID(as_uuid=True)),
+)
+
+
+class CohortRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_question_layout(self, course_id: Any) -> Sequence[Row]:
+        '''(lesson_id, lesson_name, question_id) активных уроков и вопросов курса по порядку'''
+        result = await self.db.execute(
+            select(Lesson.uuid.label("lesson_id"), Lesson.name, TestQuestion.uuid.label("question_id"))
+            .join(TestQuestion, TestQuestion.lesson_id == Lesson.uuid)
+            .where(
+                Lesson.course_id == course_id,
+                Lesson.archived == False,
+                TestQuestion.archived == False,
+            )
+            .order_by(Lesson.create_at, Lesson.uuid, TestQuestion.question_num)
+        )
+        return result.all()
+
+    async def count_enrollments(self, course_id: Any) -> int:
+        result = await self.db.execute(
+            select(func.count())
+            .select_from(UserCourse)
+            .where(UserCourse.course_id == course_id, UserCourse.archived == False)
+        )
+        return result.scalar_one()
+
+    async def stream_answers(
+        self, course_id: UUID, question_ids: list[UUID], chunk_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        '''Пачки строк (seconds, cols, estimates) одним потоковым запросом'''
+        result = await self.db.stream(
+            COURSE_ANSWERS,
+            {"course_id": course_id, "question_ids": question_ids},
+            execution_options={"yield_per": chunk_size},
+        )
+        async for partition in result.partitions():
+            yield partition
+
+
+async def get_cohort_repository(
+    db: AsyncSession = Depends(get_session),
+) -> CohortRepository:
+    return CohortRepository(db)
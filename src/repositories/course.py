@@ -1,17 +1,26 @@
 from collections.abc import Sequence
 from typing import Any
+from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import not_, select
+from sqlalchemy import Float, Row, and_, cast, func, literal_column, not_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_session
+from src.models.base import SEARCH_CONFIG
 from src.models.course import Course
+from src.models.lesson import Lesson
+from src.repositories.outbox import OutboxRepository
+
+
+# Совпадение только в уроке ранжируется ниже совпадения в самом курсе
+LESSON_MATCH_WEIGHT = 0.5
 
 
 class CourseRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.outbox = OutboxRepository(db)
 
     async def get_by_id(self, course_id: Any) -> Course | None:
         result = await self.db.execute(
@@ -20,6 +29,13 @@ class CourseRepository:
 
         return result.scalar_one_or_none()
 
+    async def get_by_ids(self, course_ids: Sequence[Any]) -> Sequence[Course]:
+        result = await self.db.execute(
+            select(Course).where(Course.uuid.in_(course_ids), not_(Course.archived))
+        )
+
+        return result.scalars().all()
+
     async def get_by_name(self, name: str) -> Course | None:
         result = await self.db.execute(select(Course).where(Course.name == name))
 
@@ -30,17 +46,83 @@ class CourseRepository:
         return course is not None
 
     async def get_all(
-        self, skip: int | None = 0, limit: int | None = 100
+        self,
+        skip: int | None = 0,
+        limit: int | None = 100,
+        order_by_rating: bool = False,
     ) -> Sequence[Course]:
-        result = await self.db.execute(
-            select(Course).where(not_(Course.archived)).offset(skip).limit(limit)
-        )
+        stmt = select(Course).where(not_(Course.archived))
+        if order_by_rating:
+            stmt = stmt.order_by(Course.rating_avg.desc().nulls_last(), Course.uuid)
+        result = await self.db.execute(stmt.offset(skip).limit(limit))
 
         return result.scalars().all()
 
+    async def search(
+        self, query: str, limit: int, after: tuple[float, UUID] | None = None
+    ) -> Sequence[Row]:
+        """Полнотекстовый поиск по курсам и их урокам по убыванию релевантности.
+
+        ``after`` - (rank, uuid) последней записи предыдущей страницы.
+        """
+        ts_query = func.websearch_to_tsquery(
+            literal_column(f"'{SEARCH_CONFIG}'::regconfig"), query
+        )
+        lesson_hits = (
+            select(
+                Lesson.course_id,
+                func.max(func.ts_rank(Lesson.search_vector, ts_query)).label("rank"),
+            )
+            .where(Lesson.search_vector.op("@@")(ts_query), not_(Lesson.archived))
+            .group_by(Lesson.course_id)
+            .subquery()
+        )
+        ranked = (
+            select(
+                Course.uuid,
+                Course.name,
+                Course.desc,
+                Course.review_count,
+                Course.rating_count,
+                Course.rating_avg,
+                cast(
+                    func.greatest(
+                        func.ts_rank(Course.search_vector, ts_query),
+                        func.coalesce(lesson_hits.c.rank, 0) * LESSON_MATCH_WEIGHT,
+                    ),
+                    Float,
+                ).label("rank"),
+            )
+            .outerjoin(lesson_hits, lesson_hits.c.course_id == Course.uuid)
+            .where(
+                not_(Course.archived),
+                or_(
+                    Course.search_vector.op("@@")(ts_query),
+                    lesson_hits.c.course_id.is_not(None),
+                ),
+            )
+            .subquery()
+        )
+
+        stmt = select(ranked)
+        if after is not None:
+            rank, uuid = after
+            stmt = stmt.where(
+                or_(
+                    ranked.c.rank < rank,
+                    and_(ranked.c.rank == rank, ranked.c.uuid > uuid),
+                )
+            )
+        result = await self.db.execute(
+            stmt.order_by(ranked.c.rank.desc(), ranked.c.uuid).limit(limit)
+        )
+        return result.all()
+
     async def create(self, course_date: dict) -> Course | None:
         course = Course(**course_date)
         self.db.add(course)
+        await self.db.flush()
+        self.outbox.add("created", "course", course.uuid)
         await self.db.commit()
         await self.db.refresh(course)
 
@@ -54,6 +136,7 @@ class CourseRepository:
         for key, value in update_data.items():
             setattr(course, key, value)
 
+        self.outbox.add("updated", "course", course.uuid, {"fields": list(update_data)})
         await self.db.commit()
         await self.db.refresh(course)
         return course
@@ -71,6 +154,7 @@ class CourseRepository:
         course = await self.get_by_id(course_id)
         if course:
             course.archived = True
+            self.outbox.add("archived", "course", course.uuid)
             await self.db.commit()
             await self.db.refresh(course)
 
@@ -0,0 +1,54 @@
+import json
+from typing import Any
+
+from redis.asyncio import Redis
+
+PROCESSING = "processing"
+COMPLETED = "completed"
+
+
+class IdempotencyRepository:
+    """Results of requests sent with an ``Idempotency-Key`` header.
+
+    ``idem:{identity}:{key}`` holds a JSON record: ``processing`` with a
+    short TTL while the first request runs, then the stored response.
+    """
+
+    def __init__(self, db: Redis):
+        self.db = db
+
+    @staticmethod
+    def key(identity: str, idempotency_key: str) -> str:
+        return f"idem:{identity}:{idempotency_key}"
+
+    async def claim(self, key: str, fingerprint: str, ttl: int) -> dict[str, Any] | None:
+        '''Занять ключ; если он уже занят - вернуть его запись (одна команда SET NX GET)'''
+        previous = await self.db.set(
+            key,
+            json.dumps({"state": PROCESSING, "fingerprint": fingerprint}),
+            nx=True,
+            ex=ttl,
+            get=True,
+        )
+        return json.loads(previous) if previous else None
+
+    async def save(
+        self,
+        key: str,
+        fingerprint: str,
+        status_code: int,
+        headers: list[tuple[str, str]],
+        body: bytes,
+        ttl: int,
+    ) -> None:
+        await self.db.set(key, json.dumps({
+            "state": COMPLETED,
+            "fingerprint": fingerprint,
+            "status_code": status_code,
+            "headers": headers,
+            # latin-1 переводит любые байты в строку и обратно без потерь
+            "body": body.decode("latin-1"),
+        }), ex=ttl)
+
+    async def release(self, key: str) -> None:
+        await self.db.delete(key)
@@ -0,0 +1,195 @@
+import json
+import time
+from datetime import datetime
+from typing import Any
+from uuid import uuid4
+
+from fastapi import Depends
+from redis.asyncio import Redis
+
+from src.redis_client import get_redis_client
+from src.schemas.job_schema import JobResponse, JobStatus
+
+QUEUE_KEY = "jobs:queue"
+PROCESSING_KEY = "jobs:processing"
+DELAYED_KEY = "jobs:delayed"
+LEASES_KEY = "jobs:leases"
+
+# Moves jobs whose retry time has come from the delayed set back to the queue.
+PROMOTE_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, job_id in ipairs(due) do
+    redis.call('ZREM', KEYS[1], job_id)
+    redis.call('LPUSH', KEYS[2], job_id)
+end
+return #due
+"""
+
+# Puts jobs whose lease has expired (their worker died) back at the head of
+# the queue. A job found in the processing list without a lease (the worker
+# died right after taking it) first gets a fresh lease, so a live worker
+# that is just about to record its lease is not robbed of the job.
+REQUEUE_EXPIRED_SCRIPT = """
+local now = tonumber(ARGV[1])
+for _, job_id in ipairs(redis.call('LRANGE', KEYS[1], 0, -1)) do
+    if not redis.call('ZSCORE', KEYS[3], job_id) then
+        redis.call('ZADD', KEYS[3], now + tonumber(ARGV[2]), job_id)
+    end
+end
+local requeued = 0
+for _, job_id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', now)) do
+    redis.call('ZREM', KEYS[3], job_id)
+    if redis.call('LREM', KEYS[1], 1, job_id) > 0 then
+        redis.call('RPUSH', KEYS[2], job_id)
+        requeued = requeued + 1
+    end
+end
+return requeued
+"""
+
+
+class JobRepository:
+    """Job storage and queue in Redis.
+
+    Each job is a hash ``job:{id}``. Queued ids are pushed to the left of
+    ``jobs:queue`` and taken from the right into ``jobs:processing`` until
+    the job finishes; failed attempts wait in the ``jobs:delayed`` sorted
+    set scored by the time of the next attempt. A taken job holds a lease in
+    the ``jobs:leases`` sorted set (scored by its expiry) that the worker
+    renews while the job runs; only jobs with an expired lease are requeued.
+    """
+
+    def __init__(self, db: Redis):
+        self.db = db
+        self.promote_script = db.register_script(PROMOTE_DUE_SCRIPT)
+        self.requeue_script = db.register_script(REQUEUE_EXPIRED_SCRIPT)
+
+    @staticmethod
+    def key(job_id: Any) -> str:
+        return f"job:{job_id}"
+
+    @staticmethod
+    def to_response(fields: dict[str, Any]) -> JobResponse:
+        return JobResponse(
+            id=fields["id"],
+            name=fields["name"],
+            status=fields["status"],
+            payload=json.loads(fields["payload"]),
+            attempts=int(fields["attempts"]),
+            max_attempts=int(fields["max_attempts"]),
+            result=json.loads(fields["result"]) if fields.get("result") else None,
+            error=fields.get("error") or None,
+            created_at=fields["created_at"],
+            updated_at=fields["updated_at"],
+        )
+
+    async def enqueue(self, name: str, payload: dict[str, Any], max_attempts: int) -> JobResponse:
+        job_id = str(uuid4())
+        now = datetime.utcnow().isoformat()
+        fields = {
+            "id": job_id,
+            "name": name,
+            "status": JobStatus.queued.value,
+            "payload": json.dumps(payload),
+            "attempts": 0,
+            "max_attempts": max_attempts,
+            "result": "",
+            "error": "",
+            "created_at": now,
+            "updated_at": now,
+        }
+        async with self.db.pipeline(transaction=True) as pipe:
+            pipe.hset(self.key(job_id), mapping=fields)
+            pipe.lpush(QUEUE_KEY, job_id)
+            await pipe.execute()
+        return self.to_response(fields)
+
+    async def get(self, job_id: Any) -> JobResponse | None:
+        fields = await self.db.hgetall(self.key(job_id))
+        if not fields:
+            return None
+        return self.to_response(fields)
+
+    async def reserve(self, timeout: float, lease_ttl: float) -> str | None:
+        '''Взять следующую задачу из очереди (None, если очередь пуста)'''
+        job_id = await self.db.blmove(QUEUE_KEY, PROCESSING_KEY, timeout, "RIGHT", "LEFT")
+        if job_id is not None:
+            await self.db.zadd(LEASES_KEY, {job_id: time.time() + lease_ttl})
+        return job_id
+
+    async def renew_leases(self, job_ids: list[str], lease_ttl: float) -> None:
+        '''Продлить аренду выполняющихся задач воркера'''
+        if job_ids:
+            expires_at = time.time() + lease_ttl
+            await self.db.zadd(LEASES_KEY, {job_id: expires_at for job_id in job_ids}, xx=True)
+
+    async def start(self, job_id: Any) -> JobResponse | None:
+        async with self.db.pipeline(transaction=True) as pipe:
+            pipe.hincrby(self.key(job_id), "attempts", 1)
+            pipe.hset(self.key(job_id), mapping={
+                "status": JobStatus.running.value,
+                "updated_at": datetime.utcnow().isoformat(),
+            })
+            pipe.hgetall(self.key(job_id))
+            *_, fields = await pipe.execute()
+        if "id" not in fields:
+            return None
+        return self.to_response(fields)
+
+    async def finish(
+        self,
+        job_id: Any,
+        status: JobStatus,
+        ttl: int,
+        result: Any = None,
+        error: str | None = None,
+    ) -> None:
+        async with self.db.pipeline(transaction=True) as pipe:
+            pipe.hset(self.key(job_id), mapping={
+                "status": status.value,
+                "result": json.dumps(result) if result is not None else "",
+                "error": error or "",
+                "updated_at": datetime.utcnow().isoformat(),
+            })
+            pipe.expire(self.key(job_id), ttl)
+            pipe.lrem(PROCESSING_KEY, 1, str(job_id))
+            pipe.zrem(LEASES_KEY, str(job_id))
+            await pipe.execute()
+
+    async def schedule_retry(self, job_id: Any, error: str, delay: float) -> None:
+        async with self.db.pipeline(transaction=True) as pipe:
+            pipe.hset(self.key(job_id), mapping={
+                "status": JobStatus.retrying.value,
+                "error": error,
+                "updated_at": datetime.utcnow().isoformat(),
+            })
+            pipe.zadd(DELAYED_KEY, {str(job_id): time.time() + delay})
+            pipe.lrem(PROCESSING_KEY, 1, str(job_id))
+            pipe.zrem(LEASES_KEY, str(job_id))
+            await pipe.execute()
+
+    async def discard(self, job_id: Any) -> None:
+        async with self.db.pipeline(transaction=True) as pipe:
+            pipe.delete(self.key(job_id))
+            pipe.lrem(PROCESSING_KEY, 1, str(job_id))
+            pipe.zrem(LEASES_KEY, str(job_id))
+            await pipe.execute()
+
+    async def promote_due(self, limit: int = 100) -> int:
+        return int(await self.promote_script(
+            keys=[DELAYED_KEY, QUEUE_KEY],
+            args=[time.time(), limit],
+        ))
+
+    async def requeue_expired(self, lease_ttl: float) -> int:
+        '''Вернуть в очередь задачи, чья аренда истекла (воркер упал)'''
+        return int(await self.requeue_script(
+            keys=[PROCESSING_KEY, QUEUE_KEY, LEASES_KEY],
+            args=[time.time(), lease_ttl],
+        ))
+
+
+async def get_job_repository(
+    db: Redis = Depends(get_redis_client),
+) -> JobRepository:
+    return JobRepository(db)
@@ -0,0 +1,80 @@
+from collections.abc import AsyncIterable
+from typing import Any
+
+from fastapi import Depends
+from redis.asyncio import Redis
+
+from src.redis_client import get_redis_client
+
+
+class LeaderboardRepository:
+    """Course leaderboards in Redis.
+
+    Each course has a sorted set ``leaderboard:{course_id}`` with user ids as
+    members and the sum of question estimates as score, so both the top of
+    the board and a single user's rank are O(log n) reads.
+    """
+
+    def __init__(self, db: Redis):
+        self.db = db
+
+    @staticmethod
+    def key(course_id: Any) -> str:
+        return f"leaderboard:{course_id}"
+
+    async def set_score(self, course_id: Any, user_id: Any, score: float) -> None:
+        await self.db.zadd(self.key(course_id), {str(user_id): score})
+
+    async def remove(self, course_id: Any, user_id: Any) -> None:
+        await self.db.zrem(self.key(course_id), str(user_id))
+
+    async def get_top(self, course_id: Any, limit: int) -> list[tuple[str, float]]:
+        return await self.db.zrevrange(self.key(course_id), 0, limit - 1, withscores=True)
+
+    async def get_rank(self, course_id: Any, user_id: Any) -> tuple[int, float] | None:
+        '''Место пользователя (с нуля) и его очки, None если его нет в рейтинге'''
+        async with self.db.pipeline(transaction=False) as pipe:
+            pipe.zrevrank(self.key(course_id), str(user_id))
+            pipe.zscore(self.key(course_id), str(user_id))
+            rank, score = await pipe.execute()
+        if rank is None or score is None:
+            return None
+        return rank, score
+
+    async def count(self, course_id: Any) -> int:
+        return await self.db.zcard(self.key(course_id))
+
+    async def replace(
+        self,
+        course_id: Any,
+        scores: AsyncIterable[tuple[Any, float]],
+        chunk_size: int = 1000,
+    ) -> int:
+        '''Пересобрать рейтинг курса во временном ключе и атомарно подменить им текущий'''
+        key = self.key(course_id)
+        tmp_key = f"{key}:rebuild"
+        await self.db.delete(tmp_key)
+
+        total = 0
+        chunk: dict[str, float] = {}
+        async for user_id, score in scores:
+            chunk[str(user_id)] = score
+            if len(chunk) >= chunk_size:
+                await self.db.zadd(tmp_key, chunk)
+                total += len(chunk)
+                chunk = {}
+        if chunk:
+            await self.db.zadd(tmp_key, chunk)
+            total += len(chunk)
+
+        if total:
+            await self.db.rename(tmp_key, key)
+        else:
+            await self.db.delete(key)
+        return total
+
+
+async def get_leaderboard_repository(
+    db: Redis = Depends(get_redis_client),
+) -> LeaderboardRepository:
+    return LeaderboardRepository(db)
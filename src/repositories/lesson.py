@@ -2,16 +2,18 @@ from collections.abc import Sequence
 from typing import Any
 
 from fastapi import Depends
-from sqlalchemy import select
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_session
 from src.models.lesson import Lesson
+from src.repositories.outbox import OutboxRepository
 
 
 class LessonRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.outbox = OutboxRepository(db)
 
     async def get_by_id(self, lesson_id: Any) -> Lesson | None:
         result = await self.db.execute(
@@ -30,6 +32,23 @@ class LessonRepository:
         )
         return result.scalars().all()
 
+    async def get_summaries_by_course(
+        self, course_id: Any, skip: int | None = 0, limit: int | None = 100
+    ) -> Sequence[Row]:
+        result = await self.db.execute(
+            select(
+                Lesson.uuid,
+                Lesson.name,
+                Lesson.video_url,
+                Lesson.course_id,
+                Lesson.update_at,
+            )
+            .where(Lesson.course_id == course_id, Lesson.archived == False)
+            .offset(skip)
+            .limit(limit)
+        )
+        return result.all()
+
     async def exists_by_name_in_course(self, name: str, course_id: Any) -> bool:
         result = await self.db.execute(
             select(Lesson).where(
@@ -43,6 +62,8 @@ class LessonRepository:
     async def create(self, lesson_data: dict) -> Lesson:
         lesson = Lesson(**lesson_data)
         self.db.add(lesson)
+        await self.db.flush()
+        self.outbox.add("created", "lesson", lesson.uuid, {"course_id": str(lesson.course_id)})
         await self.db.commit()
         await self.db.refresh(lesson)
         return lesson
@@ -55,6 +76,10 @@ class LessonRepository:
         for key, value in update_data.items():
             setattr(lesson, key, value)
 
+        self.outbox.add("updated", "lesson", lesson.uuid, {
+            "course_id": str(lesson.course_id),
+            "fields": list(update_data),
+        })
         await self.db.commit()
         await self.db.refresh(lesson)
         return lesson
@@ -63,6 +88,7 @@ class LessonRepository:
         lesson = await self.get_by_id(lesson_id)
         if lesson:
             lesson.archived = True
+            self.outbox.add("archived", "lesson", lesson.uuid, {"course_id": str(lesson.course_id)})
             await self.db.commit()
             await self.db.refresh(lesson)
         return lesson
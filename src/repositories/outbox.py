@@ -0,0 +1,87 @@
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.outbox import OutboxEvent
+
+
+class OutboxRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def add(
+        self,
+        event_type: str,
+        aggregate_type: str,
+        aggregate_id: Any,
+        payload: Dict[str, Any] | None = None,
+    ) -> None:
+        '''Добавить событие в текущую транзакцию (коммитит вызывающий код)'''
+        self.db.add(OutboxEvent(
+            event_type=f"{aggregate_type}.{event_type}",
+            aggregate_type=aggregate_type,
+            aggregate_id=aggregate_id,
+            payload=payload or {},
+        ))
+
+    async def add_many(
+        self,
+        event_type: str,
+        aggregate_type: str,
+        events: Sequence[tuple[Any, Dict[str, Any]]],
+    ) -> None:
+        '''Добавить пачку событий (aggregate_id, payload) одним INSERT в текущую транзакцию'''
+        if not events:
+            return
+        now = datetime.utcnow()
+        await self.db.execute(insert(OutboxEvent), [
+            {
+                "event_type": f"{aggregate_type}.{event_type}",
+                "aggregate_type": aggregate_type,
+                "aggregate_id": aggregate_id,
+                "payload": payload,
+                "create_at": now,
+            }
+            for aggregate_id, payload in events
+        ])
+
+    async def lock_unpublished(self, limit: int) -> Sequence[OutboxEvent]:
+        '''Неопубликованные события по порядку; строки, занятые другим relay, пропускаются'''
+        result = await self.db.execute(
+            select(OutboxEvent)
+            .where(OutboxEvent.published_at.is_(None))
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return result.scalars().all()
+
+    async def mark_published(self, event_ids: list[int]) -> None:
+        await self.db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(event_ids))
+            .values(published_at=datetime.utcnow())
+        )
+
+    async def delete_published_before(self, cutoff: datetime, limit: int) -> int:
+        '''Удалить события, опубликованные раньше cutoff, среди limit самых старых.
+
+        События публикуются по порядку id, поэтому старые опубликованные
+        строки идут в начале таблицы: запрос читает только голову первичного
+        ключа, и если удалено меньше limit строк, удалять больше нечего.
+        '''
+        oldest = (
+            select(OutboxEvent.id, OutboxEvent.published_at)
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("oldest")
+        )
+        result = await self.db.execute(
+            delete(OutboxEvent)
+            .where(OutboxEvent.id == oldest.c.id, oldest.c.published_at < cutoff)
+        )
+        return result.rowcount
@@ -0,0 +1,107 @@
+from collections.abc import Iterable, Sequence
+from typing import Any
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy import BigInteger, Row, column, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_session
+from src.models.lesson import Lesson
+from src.models.question_stats import QuestionStats
+from src.models.test_question import TestQuestion
+
+
+class QuestionStatsRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def increment(self, attempts: Iterable[dict[str, Any]]) -> None:
+        """Прибавить к счетчикам вопросов пачку ответов одним INSERT ... ON CONFLICT.
+
+        Ответы на удаленные вопросы пропускаются. Строки обновляются в порядке
+        question_id, чтобы параллельные пачки не блокировали друг друга крест-накрест.
+        """
+        totals: dict[UUID, list[int]] = {}
+        for attempt in attempts:
+            pair = totals.setdefault(attempt["question_id"], [0, 0])
+            pair[0] += 1
+            pair[1] += bool(attempt["passed"])
+        if not totals:
+            return
+
+        question_ids = sorted(totals)
+        counts = func.unnest(
+            literal(question_ids, ARRAY(PG_UUID(as_uuid=True))),
+            literal([totals[q][0] for q in question_ids], ARRAY(BigInteger)),
+            literal([totals[q][1] for q in question_ids], ARRAY(BigInteger)),
+        ).table_valued(
+            column("question_id", PG_UUID(as_uuid=True)),
+            column("attempts", BigInteger),
+            column("correct", BigInteger),
+        ).render_derived(name="counts")
+        stmt = insert(QuestionStats).from_select(
+            ["question_id", "lesson_id", "attempts", "correct", "update_at"],
+            select(
+                counts.c.question_id,
+                TestQuestion.lesson_id,
+                counts.c.attempts,
+                counts.c.correct,
+                func.timezone("utc", func.now()),
+            )
+            .join(TestQuestion, TestQuestion.uuid == counts.c.question_id)
+            .order_by(counts.c.question_id),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[QuestionStats.question_id],
+            set_={
+                "attempts": QuestionStats.attempts + stmt.excluded.attempts,
+                "correct": QuestionStats.correct + stmt.excluded.correct,
+                "update_at": stmt.excluded.update_at,
+            },
+        )
+        await self.db.execute(stmt)
+
+    async def get_by_lesson(self, lesson_id: Any) -> Sequence[Row]:
+        '''Счетчики активных вопросов урока (0 у вопросов без ответов)'''
+        result = await self.db.execute(
+            select(
+                TestQuestion.uuid,
+                TestQuestion.question_num,
+                TestQuestion.question,
+                func.coalesce(QuestionStats.attempts, 0).label("attempts"),
+                func.coalesce(QuestionStats.correct, 0).label("correct"),
+            )
+            .outerjoin(QuestionStats, QuestionStats.question_id == TestQuestion.uuid)
+            .where(TestQuestion.lesson_id == lesson_id, TestQuestion.archived == False)
+            .order_by(TestQuestion.question_num)
+        )
+        return result.all()
+
+    async def get_lessons_by_course(self, course_id: Any) -> Sequence[Row]:
+        '''Суммы счетчиков по активным урокам курса'''
+        result = await self.db.execute(
+            select(
+                Lesson.uuid,
+                Lesson.name,
+                func.count(TestQuestion.uuid).label("questions"),
+                func.coalesce(func.sum(QuestionStats.attempts), 0).label("attempts"),
+                func.coalesce(func.sum(QuestionStats.correct), 0).label("correct"),
+            )
+            .outerjoin(
+                TestQuestion,
+                (TestQuestion.lesson_id == Lesson.uuid) & (TestQuestion.archived == False),
+            )
+            .outerjoin(QuestionStats, QuestionStats.question_id == TestQuestion.uuid)
+            .where(Lesson.course_id == course_id, Lesson.archived == False)
+            .group_by(Lesson.uuid, Lesson.name, Lesson.create_at)
+            .order_by(Lesson.create_at)
+        )
+        return result.all()
+
+
+async def get_question_stats_repository(
+    db: AsyncSession = Depends(get_session),
+) -> QuestionStatsRepository:
+    return QuestionStatsRepository(db)
@@ -0,0 +1,129 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
+from fastapi import Depends
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError, TimeoutError
+
+from src.configs.app import settings
+from src.redis_client import get_redis_client
+from src.schemas.test_question_schema import QuizBundle
+
+# Per-process copy in front of Redis. Other workers learn about
+# invalidations through Redis once their local entry expires.
+_local_bundles: OrderedDict[str, tuple[float, QuizBundle]] = OrderedDict()
+# Bumped by every invalidation in this process.
+_local_generation = 0
+
+# Stores the bundle only if the lesson's generation is still the one read
+# before the database query, i.e. nobody invalidated the lesson meanwhile.
+SET_IF_GENERATION_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', tonumber(ARGV[3]))
+return 1
+"""
+
+
+class QuizCacheRepository:
+    """Cached lesson quizzes (questions and answer key).
+
+    A miss is filled with ``begin_fill`` before reading the database and
+    ``set`` after it. Every invalidation bumps the lesson's generation in
+    Redis, and ``set`` is a compare-on-write against the generation seen by
+    ``begin_fill``, so a fill that raced with an admin edit cannot put the
+    old quiz back for the whole TTL.
+    """
+
+    def __init__(self, db: Redis):
+        self.db = db
+        self.set_script = db.register_script(SET_IF_GENERATION_SCRIPT)
+
+    @staticmethod
+    def key(lesson_id: Any) -> str:
+        return f"quiz:v2:{lesson_id}"
+
+    @staticmethod
+    def generation_key(lesson_id: Any) -> str:
+        return f"quiz:generation:{lesson_id}"
+
+    def get_local(self, lesson_id: Any) -> QuizBundle | None:
+        entry = _local_bundles.get(str(lesson_id))
+        if entry is None:
+            return None
+        expires_at, bundle = entry
+        if expires_at < time.monotonic():
+            _local_bundles.pop(str(lesson_id), None)
+            return None
+        return bundle
+
+    def set_local(self, bundle: QuizBundle) -> None:
+        lesson_key = str(bundle.lesson_id)
+        _local_bundles[lesson_key] = (
+            time.monotonic() + settings.cache.quiz_local_ttl,
+            bundle,
+        )
+        _local_bundles.move_to_end(lesson_key)
+        while len(_local_bundles) > settings.cache.quiz_local_max_size:
+            _local_bundles.popitem(last=False)
+
+    async def get(self, lesson_id: Any) -> QuizBundle | None:
+        bundle = self.get_local(lesson_id)
+        if bundle is not None:
+            return bundle
+
+        try:
+            raw = await self.db.get(self.key(lesson_id))
+        except (ConnectionError, TimeoutError):
+            return None
+        if raw is None:
+            return None
+
+        bundle = QuizBundle.model_validate_json(raw)
+        self.set_local(bundle)
+        return bundle
+
+    async def begin_fill(self, lesson_id: Any) -> tuple[int, str | None]:
+        '''Generations of the lesson's cache to pass to set() after the database read'''
+        try:
+            generation = await self.db.get(self.generation_key(lesson_id)) or "0"
+        except (ConnectionError, TimeoutError):
+            generation = None
+        return _local_generation, generation
+
+    async def set(self, bundle: QuizBundle, fill: tuple[int, str | None]) -> None:
+        local_generation, generation = fill
+        if generation is not None:
+            try:
+                stored = await self.set_script(
+                    keys=[self.key(bundle.lesson_id), self.generation_key(bundle.lesson_id)],
+                    args=[generation, bundle.model_dump_json(), settings.cache.quiz_redis_ttl],
+                )
+            except (ConnectionError, TimeoutError):
+                stored = True
+            if not stored:
+                return
+        if local_generation == _local_generation:
+            self.set_local(bundle)
+
+    async def invalidate(self, *lesson_ids: Any) -> None:
+        global _local_generation
+        _local_generation += 1
+        for lesson_id in lesson_ids:
+            _local_bundles.pop(str(lesson_id), None)
+        try:
+            async with self.db.pipeline(transaction=True) as pipe:
+                for lesson_id in lesson_ids:
+                    pipe.incr(self.generation_key(lesson_id))
+                pipe.delete(*(self.key(lesson_id) for lesson_id in lesson_ids))
+                await pipe.execute()
+        except (ConnectionError, TimeoutError):
+            pass
+
+
+async def get_quiz_cache_repository(
+    db: Redis = Depends(get_redis_client),
+) -> QuizCacheRepository:
+    return QuizCacheRepository(db)
@@ -0,0 +1,47 @@
+import time
+from uuid import uuid4
+
+from fastapi import Depends
+from redis.asyncio import Redis
+
+from src.redis_client import get_redis_client
+
+# Sliding window over a sorted set of request timestamps (ms).
+# Returns {allowed, retry_after_ms} in a single round-trip.
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+
+if redis.call('ZCARD', key) < limit then
+    redis.call('ZADD', key, now, ARGV[4])
+    redis.call('PEXPIRE', key, window)
+    return {1, 0}
+end
+
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+return {0, tonumber(oldest[2]) + window - now}
+"""
+
+
+class RateLimitRepository:
+    def __init__(self, db: Redis):
+        self.db = db
+        self.script = db.register_script(SLIDING_WINDOW_SCRIPT)
+
+    async def hit(self, key: str, limit: int, window_sec: int) -> tuple[bool, int]:
+        now_ms = int(time.time() * 1000)
+        allowed, retry_after_ms = await self.script(
+            keys=[key],
+            args=[now_ms, window_sec * 1000, limit, f"{now_ms}:{uuid4().hex}"],
+        )
+        return bool(allowed), int(retry_after_ms)
+
+
+async def get_rate_limit_repository(
+    db: Redis = Depends(get_redis_client),
+) -> RateLimitRepository:
+    return RateLimitRepository(db)
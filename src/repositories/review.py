@@ -1,12 +1,13 @@
+from datetime import datetime
 from typing import Any, Sequence
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_session
-from src.models import Review
+from src.models import Course, Review
 from src.schemas.review_schema import ReviewCreate, ReviewUpdate
 
 
@@ -14,10 +15,16 @@ class ReviewRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def get_by_id(self, review_uuid: Any) -> Review | None:
-        result = await self.db.execute(
-            select(Review).where(Review.uuid == review_uuid)
-        )
+    async def get_by_id(self, review_uuid: Any, for_update: bool = False) -> Review | None:
+        """Отзыв по id.
+
+        ``for_update`` блокирует строку до конца транзакции и перечитывает ее,
+        даже если отзыв уже загружен в сессию.
+        """
+        stmt = select(Review).where(Review.uuid == review_uuid)
+        if for_update:
+            stmt = stmt.with_for_update().execution_options(populate_existing=True)
+        result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
     async def get_by_course(
@@ -25,44 +32,109 @@ class ReviewRepository:
         course_id: Any,
         skip: int = 0,
         limit: int = 100,
+        after: tuple[datetime, UUID] | None = None,
     ) -> Sequence[Review]:
+        """Отзывы к курсу, новые первыми.
+
+        ``after`` - (create_at, uuid) последнего отзыва предыдущей страницы.
+        """
+        stmt = select(Review).where(
+            Review.course_id == course_id, Review.archived.is_(False)
+        )
+        if after is not None:
+            create_at, uuid = after
+            stmt = stmt.where(
+                or_(
+                    Review.create_at < create_at,
+                    and_(Review.create_at == create_at, Review.uuid < uuid),
+                )
+            )
         result = await self.db.execute(
-            select(Review)
-            .where(Review.course_id == course_id, Review.archived.is_(False))
+            stmt.order_by(Review.create_at.desc(), Review.uuid.desc())
             .offset(skip)
             .limit(limit)
         )
         return result.scalars().all()
 
+    async def change_course_stats(
+        self,
+        course_id: Any,
+        review_delta: int = 0,
+        removed_rating: int | None = None,
+        added_rating: int | None = None,
+    ) -> None:
+        """Изменить счетчики отзывов и оценок курса одним UPDATE.
+
+        Оценка ``removed_rating`` вычитается из агрегатов, ``added_rating`` добавляется.
+        """
+        values: dict[str, Any] = {}
+        if review_delta:
+            values["review_count"] = Course.review_count + review_delta
+
+        rating_delta = (added_rating is not None) - (removed_rating is not None)
+        if rating_delta:
+            values["rating_count"] = Course.rating_count + rating_delta
+
+        sum_delta = (added_rating or 0) - (removed_rating or 0)
+        if sum_delta:
+            values["rating_sum"] = Course.rating_sum + sum_delta
+
+        if removed_rating != added_rating:
+            if removed_rating is not None:
+                column = f"rating_{removed_rating}"
+                values[column] = getattr(Course, column) - 1
+            if added_rating is not None:
+                column = f"rating_{added_rating}"
+                values[column] = getattr(Course, column) + 1
+
+        if values:
+            await self.db.execute(
+                update(Course).where(Course.uuid == course_id).values(**values)
+            )
+
     async def create(self, user_id: UUID, data: ReviewCreate) -> Review:
         review = Review(
             user_id=user_id,
             course_id=data.course_id,
             content=data.content,
+            rating=data.rating,
         )
         self.db.add(review)
+        await self.change_course_stats(data.course_id, review_delta=1, added_rating=data.rating)
         await self.db.commit()
         await self.db.refresh(review)
         return review
 
     async def update(self, review_uuid: Any, data: ReviewUpdate) -> Review | None:
-        review = await self.get_by_id(review_uuid)
+        # Без блокировки два параллельных изменения вычли бы одну и ту же старую оценку
+        review = await self.get_by_id(review_uuid, for_update=True)
         if not review:
             return None
 
         if data.content is not None:
             review.content = data.content
 
+        if data.rating is not None and data.rating != review.rating:
+            if not review.archived:
+                await self.change_course_stats(
+                    review.course_id, removed_rating=review.rating, added_rating=data.rating
+                )
+            review.rating = data.rating
+
         await self.db.commit()
         await self.db.refresh(review)
         return review
 
     async def delete(self, review_uuid: Any) -> Review | None:
-        review = await self.get_by_id(review_uuid)
+        review = await self.get_by_id(review_uuid, for_update=True)
         if not review:
             return None
 
-        review.archived = True
+        if not review.archived:
+            review.archived = True
+            await self.change_course_stats(
+                review.course_id, review_delta=-1, removed_rating=review.rating
+            )
         await self.db.commit()
         await self.db.refresh(review)
         return review
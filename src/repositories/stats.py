@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+
+from fastapi import Depends
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError, TimeoutError
+from sqlalchemy import ScalarSelect, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.configs.app import settings
+from src.database import get_session
+from src.models.answer_attempt import AnswerAttempt
+from src.models.course import Course
+from src.models.lesson import Lesson
+from src.models.review import Review
+from src.models.test_question import TestQuestion
+from src.models.user import User
+from src.models.user_course import UserCourse
+from src.redis_client import get_redis_client
+from src.schemas.stats_schema import AdminStatsResponse
+
+
+class StatsRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def collect(self) -> AdminStatsResponse:
+        '''Посчитать все показатели одним запросом (скалярные подзапросы)'''
+        now = datetime.utcnow()
+
+        def active(model) -> ScalarSelect[int]:
+            return (
+                select(func.count()).select_from(model)
+                .where(model.archived == False).scalar_subquery()
+            )
+
+        result = await self.db.execute(select(
+            active(User).label("users"),
+            active(Course).label("courses"),
+            active(Lesson).label("lessons"),
+            active(TestQuestion).label("questions"),
+            active(UserCourse).label("enrollments"),
+            active(Review).label("reviews"),
+            select(func.count()).select_from(AnswerAttempt)
+            .where(AnswerAttempt.created_at >= now - timedelta(days=1))
+            .scalar_subquery().label("answers_last_24h"),
+        ))
+        return AdminStatsResponse(**result.one()._asdict(), computed_at=now)
+
+
+class StatsSnapshotRepository:
+    """Последний снимок показателей в Redis, обновляется воркером."""
+
+    def __init__(self, db: Redis):
+        self.db = db
+
+    async def get(self) -> AdminStatsResponse | None:
+        try:
+            raw = await self.db.get(settings.stats.snapshot_key)
+        except (ConnectionError, TimeoutError):
+            return None
+        return AdminStatsResponse.model_validate_json(raw) if raw else None
+
+    async def save(self, stats: AdminStatsResponse) -> None:
+        try:
+            await self.db.set(
+                settings.stats.snapshot_key, stats.model_dump_json(), ex=settings.stats.snapshot_ttl
+            )
+        except (ConnectionError, TimeoutError):
+            pass
+
+    async def claim_refresh(self) -> bool:
+        '''Занять обновление на refresh_interval, чтобы снимок считал один процесс'''
+        try:
+            return bool(await self.db.set(
+                f"{settings.stats.snapshot_key}:refresh",
+                1,
+                nx=True,
+                px=int(settings.stats.refresh_interval * 1000),
+            ))
+        except (ConnectionError, TimeoutError):
+            return False
+
+
+async def get_stats_repository(
+    db: AsyncSession = Depends(get_session),
+) -> StatsRepository:
+    return StatsRepository(db)
+
+
+async def get_stats_snapshot_repository(
+    db: Redis = Depends(get_redis_client),
+) -> StatsSnapshotRepository:
+    return StatsSnapshotRepository(db)
@@ -7,11 +7,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_session
 from src.models.test_question import TestQuestion
+from src.repositories.outbox import OutboxRepository
+from src.schemas.test_question_schema import normalize_answer
 
 
 class TestQuestionRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.outbox = OutboxRepository(db)
 
     async def get_by_id(self, question_id: Any) -> TestQuestion | None:
         '''Получить тест по ID'''
@@ -33,6 +36,16 @@ class TestQuestionRepository:
                 .order_by(TestQuestion.question_num))
         return result.scalars().all()
 
+    async def search(self, query: str, limit: int = 20) -> Sequence[TestQuestion]:
+        '''Нечеткий поиск по тексту вопроса (триграммный индекс)'''
+        result = await self.db.execute(
+            select(TestQuestion)
+            .where(not_(TestQuestion.archived), TestQuestion.question.op("%>")(query))
+            .order_by(func.word_similarity(query, TestQuestion.question).desc(), TestQuestion.uuid)
+            .limit(limit)
+        )
+        return result.scalars().all()
+
     async def get_count(self) -> int | None:
         '''Получить общее количество тестов'''
         result = await self.db.execute(select(func.count(TestQuestion.uuid)).where(
@@ -52,6 +65,10 @@ class TestQuestionRepository:
         '''Создать новый тест'''
         test_question = TestQuestion(**test_question_data)
         self.db.add(test_question)
+        await self.db.flush()
+        self.outbox.add("created", "test_question", test_question.uuid, {
+            "lesson_id": str(test_question.lesson_id),
+        })
         await self.db.commit()
         await self.db.refresh(test_question)
         return test_question
@@ -63,6 +80,11 @@ class TestQuestionRepository:
             teast_question = TestQuestion(**data)
             test_questions.append(teast_question)
             self.db.add(teast_question)
+        await self.db.flush()
+        for teast_question in test_questions:
+            self.outbox.add("created", "test_question", teast_question.uuid, {
+                "lesson_id": str(teast_question.lesson_id),
+            })
         await self.db.commit()
 
         for teast_question in test_questions:
@@ -74,8 +96,14 @@ class TestQuestionRepository:
         '''Обновить тест'''
         test_question = await self.get_by_id(test_question_id)
         if test_question:
+            previous_lesson_id = test_question.lesson_id
             for key, value in test_question_data.items():
                 setattr(test_question, key, value)
+            self.outbox.add("updated", "test_question", test_question.uuid, {
+                "lesson_id": str(test_question.lesson_id),
+                "previous_lesson_id": str(previous_lesson_id),
+                "fields": list(test_question_data),
+            })
             await self.db.commit()
             await self.db.refresh(test_question)
         return test_question
@@ -85,6 +113,9 @@ class TestQuestionRepository:
         test_question = await self.get_by_id(test_question_id)
         if test_question:
             test_question.archived = True
+            self.outbox.add("archived", "test_question", test_question.uuid, {
+                "lesson_id": str(test_question.lesson_id),
+            })
             await self.db.commit()
             await self.db.refresh(test_question)
         return test_question
@@ -100,21 +131,28 @@ class TestQuestionRepository:
 
     async def check_answer(self, question_id: Any, user_answer: str) -> bool:
         '''Проверить ответ пользователя на вопрос'''
-        correct_answer = await self.get_correct_answer(question_id)
-        return correct_answer is not None and user_answer.strip().lower() == correct_answer.strip().lower()
+        result = await self.db.execute(
+            select(TestQuestion.answer_key).where(TestQuestion.uuid == question_id)
+        )
+        answer_key = result.scalar_one_or_none()
+        return answer_key is not None and normalize_answer(user_answer) == answer_key
 
     async def bulk_check_answers(self, answers_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         '''Проверить ответ пользователя на тест'''
-        results = []
+        question_ids = [answer_data["uuid"] for answer_data in answers_data]
+        result = await self.db.execute(
+            select(TestQuestion.uuid, TestQuestion.correct_answer, TestQuestion.answer_key)
+            .where(TestQuestion.uuid.in_(question_ids))
+        )
+        answer_keys = {row.uuid: row for row in result}
 
+        results = []
         for answer_data in answers_data:
-            passed = await self.check_answer(answer_data["uuid"], answer_data["user_answer"])
-            correct_answer = await self.get_correct_answer(answer_data["uuid"])
-
+            row = answer_keys.get(answer_data["uuid"])
             results.append({
                 "uuid": answer_data["uuid"],
-                "passed": passed,
-                "correct_answer": correct_answer or ""
+                "passed": row is not None and normalize_answer(answer_data["user_answer"]) == row.answer_key,
+                "correct_answer": row.correct_answer if row else ""
             })
 
         return results
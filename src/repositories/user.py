@@ -1,9 +1,10 @@
 from collections.abc import Sequence
 from datetime import datetime
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import Depends, HTTPException, status
-from sqlalchemy import not_, select
+from sqlalchemy import String, any_, func, literal, not_, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -32,6 +33,52 @@ class UserRepository:
 
         return result.scalar_one_or_none()
 
+    async def get_active_ids(
+        self, ids: Sequence[UUID], emails: Sequence[str]
+    ) -> Sequence[tuple[UUID, str]]:
+        """(uuid, email) активных пользователей по списку id и email одним запросом"""
+        # Массивы вместо IN: списки в тысячи элементов упираются в лимит параметров
+        result = await self.db.execute(
+            select(User.uuid, User.email).where(
+                not_(User.archived),
+                or_(
+                    User.uuid == any_(literal(list(ids), ARRAY(PG_UUID(as_uuid=True)))),
+                    User.email == any_(literal(list(emails), ARRAY(String))),
+                ),
+            )
+        )
+
+        return result.tuples().all()
+
+    async def get_existing_emails(self, emails: Sequence[str]) -> set[str]:
+        """Какие из email уже заняты (в том числе архивными пользователями)"""
+        result = await self.db.execute(
+            select(User.email).where(User.email == any_(literal(list(emails), ARRAY(String))))
+        )
+
+        return set(result.scalars().all())
+
+    async def create_many(
+        self, users: Sequence[dict], batch_size: int = 1000
+    ) -> dict[str, UUID]:
+        """Вставить пользователей пачками в одной транзакции.
+
+        Email, занятые параллельно (после проверки), пропускаются; возвращает
+        email -> uuid вставленных пользователей.
+        """
+        created: dict[str, UUID] = {}
+        for i in range(0, len(users), batch_size):
+            result = await self.db.execute(
+                insert(User)
+                .values([{"uuid": uuid4(), **user} for user in users[i:i + batch_size]])
+                .on_conflict_do_nothing(index_elements=[User.email])
+                .returning(User.email, User.uuid)
+            )
+            created.update(result.tuples().all())
+        await self.db.commit()
+
+        return created
+
     async def get_all_active(
         self, skip: int | None = 0, limit: int | None = 100
     ) -> Sequence[User]:
@@ -41,6 +88,24 @@ class UserRepository:
 
         return result.scalars().all()
 
+    async def search(self, query: str, limit: int = 20) -> Sequence[User]:
+        """Нечеткий поиск по email и имени (триграммные индексы)"""
+        score = func.greatest(
+            func.word_similarity(query, User.email),
+            func.word_similarity(query, func.coalesce(User.username, "")),
+        )
+        result = await self.db.execute(
+            select(User)
+            .where(
+                not_(User.archived),
+                or_(User.email.op("%>")(query), User.username.op("%>")(query)),
+            )
+            .order_by(score.desc(), User.uuid)
+            .limit(limit)
+        )
+
+        return result.scalars().all()
+
     async def update_password(self, user: User, hashed_password: str) -> None:
         user.password = hashed_password
         user.update_at = datetime.utcnow()
@@ -1,22 +1,48 @@
-from collections.abc import Sequence
+import asyncio
+import random
+from collections.abc import AsyncIterator, Sequence
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from fastapi import Depends
-from sqlalchemy import and_, select, func
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import Select, and_, column, literal, literal_column, select, func, true
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 
+from src.configs.app import settings
 from src.database import get_session
 from src.models.user_course import UserCourse
 from src.models.test_question import TestQuestion
 from src.models.course import Course
 from src.models.lesson import Lesson
 from src.models.user import User
+from src.repositories.outbox import OutboxRepository
 
 
 class UserCourseRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.outbox = OutboxRepository(db)
+
+    @staticmethod
+    def progress_score(progress: Any) -> float:
+        """Сумма оценок по всем вопросам курса (очки для рейтинга)"""
+        if not isinstance(progress, list):
+            return 0.0
+        return float(sum(
+            q.get("estimate") or 0
+            for lesson in progress if isinstance(lesson, dict)
+            for q in lesson.get("questions") or [] if isinstance(q, dict)
+        ))
+
+    def add_event(self, event_type: str, user_course: UserCourse, **payload: Any) -> None:
+        self.outbox.add(event_type, "user_course", user_course.uuid, {
+            "user_id": str(user_course.user_id),
+            "course_id": str(user_course.course_id),
+            "score": self.progress_score(user_course.progress),
+            **payload,
+        })
 
     async def is_user_course_active(self, user_course_id: UUID) -> bool:
         """Проверяет, активен ли user_course (не архивирован)"""
@@ -26,13 +52,25 @@ class UserCourseRepository:
         return result.scalar_one_or_none() is not None
     
     
-    async def get_by_id(self, user_course_id: UUID) -> Optional[UserCourse]: #UserCourse | None:
-        result = await self.db.execute(
-            select(UserCourse).where(
-                UserCourse.uuid == user_course_id,
-                UserCourse.archived == False
-            )
+    @staticmethod
+    def by_id(user_course_id: UUID, user_id: Optional[UUID] = None) -> Select:
+        """Выборка активной записи по uuid.
+
+        Таблица секционирована по user_id: если он известен, запрос читает
+        одну партицию вместо всех.
+        """
+        stmt = select(UserCourse).where(
+            UserCourse.uuid == user_course_id,
+            UserCourse.archived == False
         )
+        if user_id is not None:
+            stmt = stmt.where(UserCourse.user_id == user_id)
+        return stmt
+
+    async def get_by_id(
+        self, user_course_id: UUID, user_id: Optional[UUID] = None
+    ) -> Optional[UserCourse]: #UserCourse | None:
+        result = await self.db.execute(self.by_id(user_course_id, user_id))
         return result.scalar_one_or_none()
     async def get_active_by_user(self, user_id: UUID) -> List[UserCourse]:
         """Получить активные курсы пользователя (не архивированные)"""
@@ -73,11 +111,79 @@ class UserCourseRepository:
     async def create(self, user_course_data: Dict[str, Any]) -> UserCourse:
         user_course = UserCourse(**user_course_data)
         self.db.add(user_course)
+        await self.db.flush()
+        self.add_event("enrolled", user_course)
+        await self.db.commit()
+        await self.db.refresh(user_course)
+        return user_course
+
+
+    async def bulk_enroll(
+        self, user_ids: List[UUID], course_ids: List[UUID], batch_size: int = 5000
+    ) -> List[tuple[UUID, UUID, bool]]:
+        """Записать пары (user_ids[i], course_ids[i]) пачками INSERT ... ON CONFLICT
+        в одной транзакции.
+
+        Архивированные записи восстанавливаются с прежним прогрессом, активные
+        не меняются и в результат не попадают. Возвращает (user_id, course_id,
+        inserted) для новых и восстановленных записей.
+        """
+        rows = []
+        for i in range(0, len(user_ids), batch_size):
+            pairs = func.unnest(
+                literal(user_ids[i:i + batch_size], ARRAY(PG_UUID(as_uuid=True))),
+                literal(course_ids[i:i + batch_size], ARRAY(PG_UUID(as_uuid=True))),
+            ).table_valued(
+                column("user_id", PG_UUID(as_uuid=True)),
+                column("course_id", PG_UUID(as_uuid=True)),
+            ).render_derived(name="pairs")
+            now = func.timezone("utc", func.now())
+            stmt = insert(UserCourse).from_select(
+                ["uuid", "user_id", "course_id", "progress", "create_at", "update_at", "archived"],
+                select(
+                    func.gen_random_uuid(),
+                    pairs.c.user_id,
+                    pairs.c.course_id,
+                    literal_column("'[]'::json"),
+                    now,
+                    now,
+                    False,
+                ),
+            )
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_user_courses_user_id_course_id",
+                set_={"archived": False, "update_at": now},
+                where=UserCourse.archived == true(),
+            ).returning(
+                UserCourse.uuid,
+                UserCourse.user_id,
+                UserCourse.course_id,
+                UserCourse.progress,
+                # xmax = 0 только у только что вставленных строк
+                literal_column("xmax = 0").label("inserted"),
+            )
+
+            batch = (await self.db.execute(stmt)).all()
+            await self.outbox.add_many("enrolled", "user_course", [
+                (row.uuid, {
+                    "user_id": str(row.user_id),
+                    "course_id": str(row.course_id),
+                    "score": self.progress_score(row.progress),
+                })
+                for row in batch
+            ])
+            rows.extend(batch)
+        await self.db.commit()
+        return [(row.user_id, row.course_id, row.inserted) for row in rows]
+
+    async def restore(self, user_course: UserCourse) -> UserCourse:
+        """Восстановить архивированную запись на курс"""
+        user_course.archived = False
+        self.add_event("enrolled", user_course)
         await self.db.commit()
         await self.db.refresh(user_course)
         return user_course
 
-    
     async def update(self, user_course_id: UUID, update_data: Dict[str, Any]) -> Optional[UserCourse]:
         user_course = await self.get_by_id(user_course_id)
         if not user_course:
@@ -90,28 +196,24 @@ class UserCourseRepository:
         await self.db.refresh(user_course)
         return user_course
     
-    async def update_progress(
-        self,
-        user_course_id: UUID,
+    @staticmethod
+    def merge_progress(
+        progress: Any,
         lesson_id: UUID,
         question_progress: List[Dict[str, Any]]
-    ) -> Optional[UserCourse]:
-        """Обновить прогресс по уроку с детализацией по вопросам"""
-        user_course = await self.get_by_id(user_course_id)
-        if not user_course:
-            return None
-        
+    ) -> List[Dict[str, Any]]:
+        """Новый прогресс курса: копия progress с обновленными оценками по уроку"""
         lesson_id_str = str(lesson_id)
         
         # Инициализируем прогресс как список словарей
         current_progress: List[Dict[str, Any]]
         
-        if user_course.progress is None:
+        if progress is None:
             current_progress = []
-        elif isinstance(user_course.progress, list):
+        elif isinstance(progress, list):
             # Создаем глубокую копию прогресса
             current_progress = []
-            for item in user_course.progress:
+            for item in progress:
                 if isinstance(item, dict):
                     item_copy = dict(item)
                     # Нормализуем lesson_id если есть
@@ -202,21 +304,71 @@ class UserCourseRepository:
             # Обновляем список вопросов
             current_progress[lesson_index]["questions"] = list(questions_dict.values())
         
-        # Присваиваем обновленный прогресс
-        user_course.progress = current_progress  # type: ignore
-        
-        await self.db.commit()
-        await self.db.refresh(user_course)
-        return user_course
+        return current_progress
+
+    async def update_progress(
+        self,
+        user_course_id: UUID,
+        lesson_id: UUID,
+        question_progress: List[Dict[str, Any]],
+        user_id: Optional[UUID] = None,
+    ) -> Optional[UserCourse]:
+        """Обновить прогресс по уроку с детализацией по вопросам.
+
+        Прогресс читается и сливается в Python, а записывается с проверкой
+        version (compare-and-swap). Если строку успел изменить параллельный
+        запрос, слияние повторяется на свежих данных, не более
+        progress.update_attempts раз.
+        """
+        attempts = settings.progress.update_attempts
+        for attempt in range(1, attempts + 1):
+            # populate_existing: строка могла быть загружена в сессию раньше
+            result = await self.db.execute(
+                self.by_id(user_course_id, user_id)
+                .execution_options(populate_existing=True)
+            )
+            user_course = result.scalar_one_or_none()
+            if not user_course:
+                return None
+
+            user_course.progress = self.merge_progress(  # type: ignore
+                user_course.progress, lesson_id, question_progress
+            )
+            self.add_event(
+                "progress_updated",
+                user_course,
+                lesson_id=str(lesson_id),
+                questions=[
+                    {"question_id": str(qp["question_id"]), "estimate": qp["estimate"]}
+                    for qp in question_progress
+                    if isinstance(qp, dict) and qp.get("question_id") and qp.get("estimate") is not None
+                ],
+            )
+            try:
+                await self.db.commit()
+            except StaleDataError:
+                await self.db.rollback()
+                if attempt == attempts:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="Progress was changed concurrently, please retry",
+                    )
+                await asyncio.sleep(random.uniform(0, settings.progress.retry_backoff * attempt))
+                continue
+
+            await self.db.refresh(user_course)
+            return user_course
+        return None
 
     #обновлен
     async def get_lesson_progress(
         self,
         user_course_id: UUID,
-        lesson_id: UUID
+        lesson_id: UUID,
+        user_id: Optional[UUID] = None,
     ) -> Optional[Dict[str, Any]]:
         """Получить прогресс по конкретному уроку"""
-        user_course = await self.get_by_id(user_course_id)
+        user_course = await self.get_by_id(user_course_id, user_id)
         if not user_course:
             return None
         
@@ -287,6 +439,7 @@ class UserCourseRepository:
             return None
     
         user_course.archived = True
+        self.add_event("archived", user_course)
         await self.db.commit()
         await self.db.refresh(user_course)
         return user_course
@@ -330,9 +483,11 @@ class UserCourseRepository:
 
         return completed_count
 
-    async def is_lesson_completed(self, user_course_id: UUID, lesson_id: UUID) -> bool:
+    async def is_lesson_completed(
+        self, user_course_id: UUID, lesson_id: UUID, user_id: Optional[UUID] = None
+    ) -> bool:
         """Проверить, пройден ли конкретный урок"""
-        user_course = await self.get_by_id(user_course_id)
+        user_course = await self.get_by_id(user_course_id, user_id)
         if not user_course or not user_course.progress:
             return False
 
@@ -365,9 +520,11 @@ class UserCourseRepository:
         # Урок считается пройденным, если ответы даны на все вопросы
         return total_questions > 0 and answered_count >= total_questions
 
-    async def get_lesson_average_estimate(self, user_course_id: UUID, lesson_id: UUID) -> Optional[float]:
+    async def get_lesson_average_estimate(
+        self, user_course_id: UUID, lesson_id: UUID, user_id: Optional[UUID] = None
+    ) -> Optional[float]:
         """Получить среднюю оценку за урок"""
-        user_course = await self.get_by_id(user_course_id)
+        user_course = await self.get_by_id(user_course_id, user_id)
         if not user_course or not user_course.progress:
             return None
 
@@ -391,6 +548,18 @@ class UserCourseRepository:
         total_estimate = sum(q.get("estimate", 0) for q in answered_questions if isinstance(q, dict))
         return total_estimate / len(answered_questions)
     
+    async def get_scores_by_course(
+        self, course_id: UUID, chunk_size: int = 1000
+    ) -> AsyncIterator[tuple[UUID, float]]:
+        """Очки всех активных записей курса, без загрузки всех строк в память"""
+        result = await self.db.stream(
+            select(UserCourse.user_id, UserCourse.progress)
+            .where(UserCourse.course_id == course_id, UserCourse.archived == False)
+            .execution_options(yield_per=chunk_size)
+        )
+        async for user_id, progress in result:
+            yield user_id, self.progress_score(progress)
+
     async def reset_progress(self, user_course_id: UUID) -> Optional[UserCourse]:
         """Сбросить прогресс пользователя по курсу (очищает поле progress)"""
         user_course = await self.get_by_id(user_course_id)
@@ -402,7 +571,8 @@ class UserCourseRepository:
     
         # Сбрасываем прогресс на пустой список
         user_course.progress = []  # type: ignore
-        
+        self.add_event("progress_reset", user_course)
+
         await self.db.commit()
         await self.db.refresh(user_course)
         return user_course
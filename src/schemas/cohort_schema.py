@@ -0,0 +1,36 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class LessonFunnelStep(BaseModel):
+    lesson_id: UUID
+    name: str
+    questions: int
+    started: int
+    completed: int
+    # Прошли этот урок и все предыдущие
+    reached: int
+    average_score: float | None
+
+
+class ScoreDistribution(BaseModel):
+    learners: int  # Записи хотя бы с одним ответом
+    mean: float | None
+    percentiles: dict[str, float | None]
+    histogram: list[int]
+    bin_edges: list[float]
+
+
+class TimeToComplete(BaseModel):
+    completed: int
+    mean_hours: float | None
+    percentiles: dict[str, float | None]
+
+
+class CohortReportResponse(BaseModel):
+    course_id: UUID
+    enrollments: int
+    funnel: list[LessonFunnelStep]
+    scores: ScoreDistribution
+    time_to_complete: TimeToComplete
@@ -1,7 +1,8 @@
+from enum import Enum
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 
 class CourseBase(BaseModel):
@@ -11,9 +12,37 @@ class CourseBase(BaseModel):
 
 class CourseResponse(CourseBase):
     uuid: UUID
+    review_count: int = 0
+    rating_count: int = 0
+    rating_avg: float | None = None
 
     model_config = {"from_attributes": True}
 
 class CourseUpdate(BaseModel):
     name: Optional[str] = None
-    desc: Optional[str] = None
\ No newline at end of file
+    desc: Optional[str] = None
+
+
+class CourseSort(str, Enum):
+    rating = "rating"
+
+
+class CourseRatingResponse(BaseModel):
+    uuid: UUID
+    rating_count: int
+    rating_avg: float | None
+    rating_histogram: dict[int, int]
+
+    model_config = {"from_attributes": True}
+
+
+class CourseSearchResult(CourseResponse):
+    rank: float
+
+
+class CourseSearchResponse(BaseModel):
+    items: list[CourseSearchResult]
+    next_cursor: str | None = None
+
+
+course_list_adapter = TypeAdapter(list[CourseResponse])
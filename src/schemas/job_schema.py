@@ -0,0 +1,32 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    retrying = "retrying"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class JobCreate(BaseModel):
+    name: str
+    payload: Dict[str, Any] = {}
+
+
+class JobResponse(BaseModel):
+    id: UUID
+    name: str
+    status: JobStatus
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
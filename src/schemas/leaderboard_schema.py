@@ -0,0 +1,15 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class LeaderboardEntry(BaseModel):
+    user_id: UUID
+    rank: int  # Место в рейтинге, начиная с 1
+    score: float
+
+
+class LeaderboardResponse(BaseModel):
+    course_id: UUID
+    total: int
+    entries: list[LeaderboardEntry]
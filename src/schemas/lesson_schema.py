@@ -1,8 +1,9 @@
+from enum import Enum
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, HttpUrl, TypeAdapter
 
 
 class LessonBase(BaseModel):
@@ -39,4 +40,23 @@ class LessonVideoResponse(LessonBase):
     name: str
     video_url: Optional[str] = None
     
-    model_config = {"from_attributes": True}
\ No newline at end of file
+    model_config = {"from_attributes": True}
+
+
+class LessonListView(str, Enum):
+    full = "full"
+    summary = "summary"
+
+
+class LessonSummaryResponse(BaseModel):
+    uuid: UUID
+    name: str
+    video_url: Optional[str] = None
+    course_id: UUID
+    update_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+lesson_list_adapter = TypeAdapter(list[LessonResponse])
+lesson_summary_list_adapter = TypeAdapter(list[LessonSummaryResponse])
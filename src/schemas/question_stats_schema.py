@@ -0,0 +1,39 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class QuestionDifficulty(BaseModel):
+    question_id: UUID
+    question_num: int
+    question: str
+    attempts: int
+    correct: int
+    pass_rate: float | None  # Доля верных ответов, None без ответов
+
+
+class LessonDifficultyResponse(BaseModel):
+    lesson_id: UUID
+    attempts: int
+    correct: int
+    pass_rate: float | None
+    # Число вопросов с долей верных ответов в [0, 0.1), [0.1, 0.2), ... [0.9, 1]
+    pass_rate_histogram: list[int]
+    questions: list[QuestionDifficulty]
+
+
+class LessonDifficultySummary(BaseModel):
+    lesson_id: UUID
+    name: str
+    questions: int
+    attempts: int
+    correct: int
+    pass_rate: float | None
+
+
+class CourseDifficultyResponse(BaseModel):
+    course_id: UUID
+    attempts: int
+    correct: int
+    pass_rate: float | None
+    lessons: list[LessonDifficultySummary]
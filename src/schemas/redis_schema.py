@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+class RedisPoolStatsResponse(BaseModel):
+    max_connections: int
+    in_use_connections: int
+    idle_connections: int
+    created_connections: int
+    circuit_state: str
+    circuit_failures: int
+    circuit_rejected: int
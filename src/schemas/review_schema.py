@@ -1,7 +1,10 @@
-from typing import Optional
+from typing import Annotated, Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+
+Rating = Annotated[int, Field(ge=1, le=5)]
 
 
 class ReviewBase(BaseModel):
@@ -10,6 +13,7 @@ class ReviewBase(BaseModel):
 
 class ReviewCreate(ReviewBase):
     course_id: UUID
+    rating: Optional[Rating] = None
     #user_id:
 
 
@@ -17,9 +21,19 @@ class ReviewResponse(ReviewBase):
     uuid: UUID
     user_id: UUID
     course_id: UUID
+    rating: Optional[int] = None
 
     model_config = {"from_attributes": True}
 
 
 class ReviewUpdate(BaseModel):
     content: Optional[str] = None
+    rating: Optional[Rating] = None
+
+
+class ReviewPageResponse(BaseModel):
+    course_id: UUID
+    review_count: int
+    reviews: list[ReviewResponse]
+    next_cursor: Optional[str] = None
+
@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class AdminStatsResponse(BaseModel):
+    users: int
+    courses: int
+    lessons: int
+    questions: int
+    enrollments: int
+    reviews: int
+    answers_last_24h: int
+    # Время расчета снимка (UTC); данные отстают не более чем на stats.refresh_interval
+    computed_at: datetime
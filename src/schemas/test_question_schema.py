@@ -1,13 +1,28 @@
 from uuid import UUID
 from datetime import datetime
-from pydantic import BaseModel, Field, BeforeValidator, model_validator, ConfigDict
-from typing import Optional, List, Annotated
+from pydantic import BaseModel, Field, BeforeValidator, model_validator, ConfigDict, TypeAdapter
+from typing import Optional, List, Dict, FrozenSet, Annotated
 
 def non_empty_str(v: str) -> str:
     if not v.strip():
             raise ValueError("String can't be empty")
     return v
 
+
+def normalize_answer(v: str) -> str:
+    '''Ключ ответа для сравнения: без пробелов по краям и без учета регистра'''
+    return v.strip().lower()
+
+
+def find_choice_index(choices: List[str], answer: str) -> Optional[int]:
+    '''Позиция ответа среди вариантов (None, если его там нет)'''
+    answer = answer.strip()
+    for index, choice in enumerate(choices):
+        if choice.strip() == answer:
+            return index
+    return None
+
+
 NonEmptyStr = Annotated[str, Field(min_length=1), BeforeValidator(non_empty_str)]
 PositiveInt = Annotated[int, Field(gt=0)]
 
@@ -25,7 +40,7 @@ class TestQuestionCreate(TestQuestionBase):
 
     @model_validator(mode='after')
     def validate_answer(self) -> 'TestQuestionCreate':
-        if self.correct_answer.strip() not in [choice.strip() for choice in self.choices]:
+        if find_choice_index(self.choices, self.correct_answer) is None:
             raise ValueError(f"Answer {self.correct_answer} must be among the choices {self.choices}")
         return self
 
@@ -64,6 +79,21 @@ class TestQuestionListResponse(BaseModel):
     limit: int
 
 
+class QuizAnswerKey(BaseModel):
+    correct_answer: str
+    # Принимаемые нормализованные ответы; больше одного - для вопросов
+    # с несколькими правильными вариантами
+    answer_keys: FrozenSet[str]
+
+
+class QuizBundle(BaseModel):
+    '''Тест урока: вопросы без ответов и ключ ответов для проверки'''
+    lesson_id: UUID
+    version: Optional[str] = None
+    questions: List[TestQuestionWithoutAnswerResponse]
+    answer_key: Dict[UUID, QuizAnswerKey]
+
+
 class TestQuestionAnswer(BaseModel):
     uuid: UUID
     user_answer: NonEmptyStr
@@ -98,4 +128,8 @@ class TestQuestionCount(BaseModel):
 
 class TestQuestionsCountByLesson(BaseModel):
     lesson_id: UUID
-    total: int
\ No newline at end of file
+    total: int
+
+
+test_question_list_adapter = TypeAdapter(TestQuestionListResponse)
+test_question_without_answer_list_adapter = TypeAdapter(TestQuestionWithoutAnswerListResponse)
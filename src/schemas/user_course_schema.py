@@ -1,8 +1,9 @@
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime
+from enum import Enum
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 
 class QuestionProgress(BaseModel):
     """Прогресс по одному вопросу"""
@@ -118,3 +119,29 @@ class StartLessonResponse(BaseModel):
     
 
 
+class BulkEnrollRequest(BaseModel):
+    """Запись группы пользователей (id или email) на один или несколько курсов"""
+    users: List[str] = Field(min_length=1, max_length=50000)
+    course_ids: List[UUID] = Field(min_length=1, max_length=50)
+
+
+class BulkEnrollStatus(str, Enum):
+    enrolled = "enrolled"
+    restored = "restored"
+    already_enrolled = "already_enrolled"
+    user_not_found = "user_not_found"
+
+
+class BulkEnrollResult(BaseModel):
+    user: str  # Как передан в запросе
+    user_id: Optional[UUID] = None
+    course_id: Optional[UUID] = None
+    status: BulkEnrollStatus
+
+
+class BulkEnrollResponse(BaseModel):
+    enrolled: int
+    restored: int
+    already_enrolled: int
+    user_not_found: int
+    results: List[BulkEnrollResult]
@@ -2,7 +2,7 @@ import re
 from enum import Enum
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr, field_validator, model_validator
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter, field_validator, model_validator
 
 
 def validate_password(v: str) -> str:
@@ -100,3 +100,37 @@ class UpdateUserByAdminRequest(UserBase):
 
 class DeleteUserByAdminResponse(BaseModel):
     msg: str
+
+
+class BulkUserCreate(UserSignupRequest):
+    username: str | None = None
+    roles: list[UserRole] = [UserRole.student]
+
+
+class BulkUserCreateRequest(BaseModel):
+    users: list[BulkUserCreate] = Field(min_length=1)
+
+
+class BulkUserStatus(str, Enum):
+    created = "created"
+    exists = "exists"
+    duplicate = "duplicate"
+    invalid = "invalid"
+
+
+class BulkUserResult(BaseModel):
+    email: str
+    status: BulkUserStatus
+    uuid: UUID | None = None
+    error: str | None = None
+
+
+class BulkUserCreateResponse(BaseModel):
+    created: int
+    exists: int
+    duplicate: int
+    invalid: int
+    results: list[BulkUserResult]
+
+
+user_with_id_list_adapter = TypeAdapter(list[UserResponseWithId])
@@ -0,0 +1,137 @@
+"""Production entry point: ``python -m src.server``.
+
+The app is imported once in the master process and the listening socket is
+bound before forking, so every worker shares the loaded modules
+copy-on-write and accepts from the same socket. SIGTERM/SIGINT are
+forwarded to the workers, which stop accepting, drain in-flight requests
+and run the lifespan shutdown (DB and Redis pools) before exiting.
+
+A worker that exits is restarted. If workers keep dying within
+``app_restart_min_uptime`` seconds of starting (bad config, database down),
+restarts are delayed with exponential backoff, and after
+``app_restart_max_failures`` such exits in a row the server stops.
+"""
+import logging
+import os
+import signal
+import sys
+import time
+
+from uvicorn import Config, Server
+
+from src.configs.app import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def build_config() -> Config:
+    return Config(
+        "src.main:app",
+        host=settings.app.app_host,
+        port=settings.app.app_port,
+        loop=settings.app.app_loop,
+        http=settings.app.app_http,
+        backlog=settings.app.app_backlog,
+        timeout_keep_alive=settings.app.app_keep_alive_timeout,
+        timeout_graceful_shutdown=settings.app.app_graceful_shutdown_timeout,
+        limit_concurrency=settings.app.app_limit_concurrency,
+        proxy_headers=True,
+        access_log=settings.app.app_access_log,
+    )
+
+
+def spawn_worker(config: Config, sockets: list) -> int:
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        Server(config).run(sockets=sockets)
+        os._exit(0)
+    return pid
+
+
+def run_workers(config: Config, workers: int) -> None:
+    sockets = [config.bind_socket()]
+    children: dict[int, float] = {}  # pid -> время запуска
+    shutting_down = False
+    failures = 0
+
+    def stop_children() -> None:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def shutdown(signum, frame) -> None:
+        nonlocal shutting_down
+        shutting_down = True
+        stop_children()
+
+    def sleep(delay: float) -> None:
+        deadline = time.monotonic() + delay
+        while not shutting_down and time.monotonic() < deadline:
+            time.sleep(0.1)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    for _ in range(workers):
+        children[spawn_worker(config, sockets)] = time.monotonic()
+
+    while children:
+        try:
+            pid, wait_status = os.wait()
+        except ChildProcessError:
+            break
+        exit_status = os.waitstatus_to_exitcode(wait_status)
+        started = children.pop(pid, time.monotonic())
+        if shutting_down:
+            continue
+
+        if time.monotonic() - started < settings.app.app_restart_min_uptime:
+            failures += 1
+        else:
+            failures = 0
+        if failures >= settings.app.app_restart_max_failures:
+            logger.error(
+                "Worker %s exited with status %s, %s workers failed right after start, giving up",
+                pid, exit_status, failures,
+            )
+            shutting_down = True
+            stop_children()
+            continue
+
+        delay = (
+            min(
+                settings.app.app_restart_backoff * 2 ** (failures - 1),
+                settings.app.app_restart_max_backoff,
+            )
+            if failures
+            else 0
+        )
+        logger.warning(
+            "Worker %s exited with status %s, restarting in %.1f s", pid, exit_status, delay
+        )
+        sleep(delay)
+        if not shutting_down:
+            children[spawn_worker(config, sockets)] = time.monotonic()
+
+    for sock in sockets:
+        sock.close()
+    if failures >= settings.app.app_restart_max_failures:
+        sys.exit(1)
+
+
+def main() -> None:
+    config = build_config()
+    config.load()
+
+    if settings.app.app_workers <= 1:
+        Server(config).run()
+    else:
+        run_workers(config, settings.app.app_workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Vectorized analytics over the enrollments of one course.
+
+Answers are loaded into a float32 matrix of enrollments x questions (NaN for
+unanswered questions, columns grouped by lesson in course order). Funnels,
+per-lesson averages, score percentiles, histograms and time to complete are
+then computed with NumPy reductions instead of loops over progress dicts.
+"""
+from collections.abc import Sequence
+from itertools import chain
+from typing import Any
+
+import numpy as np
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+class CohortBuilder:
+    '''Собирает матрицу ответов из пачек строк CohortRepository.stream_answers'''
+
+    def __init__(self, questions: int):
+        self.questions = questions
+        self.blocks: list[np.ndarray] = []
+        self.seconds: list[np.ndarray] = []
+
+    def add_rows(self, rows: Sequence[Any]) -> None:
+        n = len(rows)
+        block = np.full((n, self.questions), np.nan, dtype=np.float32)
+        lengths = np.fromiter((len(row.cols or ()) for row in rows), dtype=np.int64, count=n)
+        total = int(lengths.sum())
+        if total:
+            answered_rows = np.repeat(np.arange(n), lengths)
+            cols = np.fromiter(
+                chain.from_iterable(row.cols or () for row in rows), dtype=np.int64, count=total
+            )
+            estimates = np.fromiter(
+                chain.from_iterable(row.estimates or () for row in rows),
+                dtype=np.float32,
+                count=total,
+            )
+            # Номера столбцов из запроса начинаются с 1
+            block[answered_rows, cols - 1] = estimates
+        self.blocks.append(block)
+        self.seconds.append(np.fromiter((row.seconds for row in rows), dtype=np.float64, count=n))
+
+    def build(self, lesson_sizes: Sequence[int]) -> "CourseCohort":
+        if self.blocks:
+            scores = np.concatenate(self.blocks)
+            seconds = np.concatenate(self.seconds)
+        else:
+            scores = np.empty((0, self.questions), dtype=np.float32)
+            seconds = np.empty(0)
+        return CourseCohort(scores, np.asarray(lesson_sizes, dtype=np.int64), seconds)
+
+
+class CourseCohort:
+    def __init__(
+        self,
+        scores: np.ndarray,
+        lesson_sizes: np.ndarray,
+        seconds: np.ndarray,
+    ):
+        self.scores = scores
+        self.lesson_sizes = lesson_sizes
+        # Секунды от записи на курс до последнего изменения прогресса
+        self.seconds = seconds
+
+        self.answered = ~np.isnan(scores)
+        if scores.shape[1]:
+            starts = np.concatenate(([0], np.cumsum(lesson_sizes)[:-1]))
+            self.answered_by_lesson = np.add.reduceat(self.answered, starts, axis=1)
+            self.score_sum_by_lesson = np.add.reduceat(
+                np.nan_to_num(scores), starts, axis=1, dtype=np.float64
+            )
+        else:
+            self.answered_by_lesson = np.zeros((len(scores), 0), dtype=np.int64)
+            self.score_sum_by_lesson = np.zeros((len(scores), 0))
+        self.lesson_completed = self.answered_by_lesson == lesson_sizes
+        self.course_completed = (
+            self.lesson_completed.all(axis=1)
+            if scores.shape[1]
+            else np.zeros(len(scores), dtype=bool)
+        )
+
+    @property
+    def enrollments(self) -> int:
+        return len(self.scores)
+
+    def user_scores(self) -> np.ndarray:
+        '''Средняя оценка каждой записи с хотя бы одним ответом'''
+        counts = self.answered.sum(axis=1)
+        sums = np.nan_to_num(self.scores).sum(axis=1, dtype=np.float64)
+        mask = counts > 0
+        return sums[mask] / counts[mask]
+
+    def funnel(self) -> dict[str, np.ndarray]:
+        '''По урокам: начали, прошли, прошли этот и все предыдущие, средняя оценка'''
+        answered = self.answered_by_lesson.sum(axis=0)
+        average = np.full(answered.shape, np.nan)
+        np.divide(self.score_sum_by_lesson.sum(axis=0), answered, out=average, where=answered > 0)
+        return {
+            "started": (self.answered_by_lesson > 0).sum(axis=0),
+            "completed": self.lesson_completed.sum(axis=0),
+            "reached": np.logical_and.accumulate(self.lesson_completed, axis=1).sum(axis=0),
+            "average_score": average,
+        }
+
+    def score_distribution(self, bins: int) -> dict[str, Any]:
+        scores = self.user_scores()
+        histogram, edges = np.histogram(scores, bins=bins, range=(0, 100))
+        return {
+            "learners": len(scores),
+            "mean": float(scores.mean()) if len(scores) else None,
+            "percentiles": percentiles(scores),
+            "histogram": histogram.tolist(),
+            "bin_edges": edges.tolist(),
+        }
+
+    def time_to_complete(self) -> dict[str, Any]:
+        '''Часы от записи до последнего изменения прогресса у прошедших курс'''
+        hours = self.seconds[self.course_completed] / 3600
+        return {
+            "completed": len(hours),
+            "mean_hours": float(hours.mean()) if len(hours) else None,
+            "percentiles": percentiles(hours),
+        }
+
+
+def percentiles(values: np.ndarray) -> dict[str, float | None]:
+    if not len(values):
+        return {f"p{p}": None for p in PERCENTILES}
+    return {
+        f"p{p}": float(value)
+        for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES))
+    }
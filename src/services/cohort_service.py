@@ -0,0 +1,91 @@
+import asyncio
+import math
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, status
+
+from src.configs.app import settings
+from src.repositories.cohort import CohortRepository, get_cohort_repository
+from src.repositories.course import CourseRepository, get_course_repository
+from src.schemas.cohort_schema import (
+    CohortReportResponse,
+    LessonFunnelStep,
+    ScoreDistribution,
+    TimeToComplete,
+)
+from src.services.cohort_analytics import CohortBuilder
+
+
+class CohortService:
+    def __init__(self, repo: CohortRepository, course_repo: CourseRepository):
+        self.repo = repo
+        self.course_repo = course_repo
+
+    async def check_course(self, course_id: UUID) -> int:
+        '''Проверить курс и вернуть число активных записей на него'''
+        if not await self.course_repo.get_by_id(course_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found",
+            )
+        return await self.repo.count_enrollments(course_id)
+
+    async def build_report(self, course_id: UUID) -> CohortReportResponse:
+        '''Воронка по урокам, распределение оценок и время прохождения курса'''
+        layout = await self.repo.get_question_layout(course_id)
+        lessons: dict[UUID, tuple[str, int]] = {}
+        for row in layout:
+            name, size = lessons.get(row.lesson_id, (row.name, 0))
+            lessons[row.lesson_id] = (name, size + 1)
+
+        builder = CohortBuilder(len(layout))
+        async for rows in self.repo.stream_answers(
+            course_id, [row.question_id for row in layout], settings.analytics.chunk_size
+        ):
+            builder.add_rows(rows)
+
+        def compute() -> CohortReportResponse:
+            cohort = builder.build([size for _, size in lessons.values()])
+            funnel = cohort.funnel()
+            return CohortReportResponse(
+                course_id=course_id,
+                enrollments=cohort.enrollments,
+                funnel=[
+                    LessonFunnelStep(
+                        lesson_id=lesson_id,
+                        name=name,
+                        questions=size,
+                        started=int(funnel["started"][i]),
+                        completed=int(funnel["completed"][i]),
+                        reached=int(funnel["reached"][i]),
+                        average_score=(
+                            None if math.isnan(funnel["average_score"][i])
+                            else float(funnel["average_score"][i])
+                        ),
+                    )
+                    for i, (lesson_id, (name, size)) in enumerate(lessons.items())
+                ],
+                scores=ScoreDistribution(
+                    **cohort.score_distribution(settings.analytics.histogram_bins)
+                ),
+                time_to_complete=TimeToComplete(**cohort.time_to_complete()),
+            )
+
+        # Расчеты NumPy отпускают GIL и не блокируют event loop
+        return await asyncio.to_thread(compute)
+
+    async def get_report(self, course_id: UUID) -> CohortReportResponse:
+        enrollments = await self.check_course(course_id)
+        if enrollments > settings.analytics.max_sync_enrollments:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Course has too many enrollments, build the report in the background",
+            )
+        return await self.build_report(course_id)
+
+
+async def get_cohort_service(
+    repo: CohortRepository = Depends(get_cohort_repository),
+    course_repo: CourseRepository = Depends(get_course_repository),
+) -> CohortService:
+    return CohortService(repo, course_repo)
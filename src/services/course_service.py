@@ -3,9 +3,14 @@ from uuid import UUID
 from fastapi import Depends, HTTPException, status
 
 from src.repositories.course import CourseRepository, get_course_repository
+from src.services.cursor import decode_cursor, encode_cursor
 from src.schemas.course_schema import (
     CourseResponse,
     CourseBase,
+    CourseRatingResponse,
+    CourseSearchResponse,
+    CourseSearchResult,
+    CourseSort,
     CourseUpdate
 )
 
@@ -15,9 +20,11 @@ class CourseService:
         self.repo = repo
 
     async def get_all(
-        self, skip: int | None, limit: int | None
+        self, skip: int | None, limit: int | None, sort: CourseSort | None = None
     ) -> list[CourseResponse]:
-        res = await self.repo.get_all(skip=skip, limit=limit)
+        res = await self.repo.get_all(
+            skip=skip, limit=limit, order_by_rating=sort == CourseSort.rating
+        )
 
         if not res:
             raise HTTPException(
@@ -38,6 +45,23 @@ class CourseService:
 
         return res
 
+    async def get_rating(self, id: UUID) -> CourseRatingResponse:
+        course = await self.get_by_id(id)
+        return CourseRatingResponse.model_validate(course)
+
+    async def search(
+        self, query: str, limit: int, cursor: str | None = None
+    ) -> CourseSearchResponse:
+        after = decode_cursor(cursor, float, UUID) if cursor else None
+        rows = await self.repo.search(query, limit + 1, after)
+
+        items = [CourseSearchResult.model_validate(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(repr(items[-1].rank), items[-1].uuid)
+
+        return CourseSearchResponse(items=items, next_cursor=next_cursor)
+
     async def create_course(self, course_date: CourseBase) -> CourseResponse:
         if await self.check_name(course_date.name):
             raise HTTPException(
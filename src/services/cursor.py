@@ -0,0 +1,24 @@
+import base64
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(*parts: Any) -> str:
+    '''Непрозрачный курсор keyset-пагинации из значений последней записи страницы'''
+    return base64.urlsafe_b64encode("|".join(str(part) for part in parts).encode()).decode()
+
+
+def decode_cursor(cursor: str, *types: Callable[[str], Any]) -> tuple[Any, ...]:
+    '''Разобрать курсор, приводя части к types; 400 при некорректном курсоре'''
+    try:
+        parts = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        if len(parts) != len(types):
+            raise ValueError(cursor)
+        return tuple(convert(part) for convert, part in zip(types, parts))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
@@ -0,0 +1,52 @@
+import inspect
+from typing import Any, Dict
+
+from fastapi import Depends, HTTPException, status
+
+from src.configs.app import settings
+from src.jobs import JOB_HANDLERS
+from src.repositories.job import JobRepository, get_job_repository
+from src.schemas.job_schema import JobCreate, JobResponse
+
+
+class JobService:
+    def __init__(self, repo: JobRepository):
+        self.repo = repo
+
+    async def enqueue(self, name: str, payload: Dict[str, Any] | None = None) -> JobResponse:
+        '''Поставить задачу в очередь'''
+        if name not in JOB_HANDLERS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown job: {name}",
+            )
+        payload = payload or {}
+        # Воркер вызывает handler(**payload): лишние или недостающие аргументы
+        # отклоняются здесь, а не падают TypeError при выполнении
+        try:
+            inspect.signature(JOB_HANDLERS[name]).bind(**payload)
+        except TypeError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid payload for job {name}: {exc}",
+            )
+        return await self.repo.enqueue(name, payload, settings.jobs.max_attempts)
+
+    async def create_job(self, job_data: JobCreate) -> JobResponse:
+        return await self.enqueue(job_data.name, job_data.payload)
+
+    async def get_job(self, job_id: Any) -> JobResponse:
+        '''Получить состояние задачи'''
+        job = await self.repo.get(job_id)
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found",
+            )
+        return job
+
+
+async def get_job_service(
+    repo: JobRepository = Depends(get_job_repository),
+) -> JobService:
+    return JobService(repo)
@@ -0,0 +1,51 @@
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, status
+
+from src.repositories.course import CourseRepository, get_course_repository
+from src.repositories.leaderboard import LeaderboardRepository, get_leaderboard_repository
+from src.schemas.leaderboard_schema import LeaderboardEntry, LeaderboardResponse
+
+
+class LeaderboardService:
+    def __init__(self, repo: LeaderboardRepository, course_repo: CourseRepository):
+        self.repo = repo
+        self.course_repo = course_repo
+
+    async def check_course(self, course_id: UUID) -> None:
+        if not await self.course_repo.get_by_id(course_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found",
+            )
+
+    async def get_top(self, course_id: UUID, limit: int) -> LeaderboardResponse:
+        '''Первые limit мест рейтинга курса'''
+        await self.check_course(course_id)
+        top = await self.repo.get_top(course_id, limit)
+        return LeaderboardResponse(
+            course_id=course_id,
+            total=await self.repo.count(course_id),
+            entries=[
+                LeaderboardEntry(user_id=user_id, rank=rank, score=score)
+                for rank, (user_id, score) in enumerate(top, start=1)
+            ],
+        )
+
+    async def get_user_rank(self, course_id: UUID, user_id: UUID) -> LeaderboardEntry:
+        '''Место пользователя в рейтинге курса'''
+        res = await self.repo.get_rank(course_id, user_id)
+        if res is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User is not on the leaderboard",
+            )
+        rank, score = res
+        return LeaderboardEntry(user_id=user_id, rank=rank + 1, score=score)
+
+
+async def get_leaderboard_service(
+    repo: LeaderboardRepository = Depends(get_leaderboard_repository),
+    course_repo: CourseRepository = Depends(get_course_repository),
+) -> LeaderboardService:
+    return LeaderboardService(repo, course_repo)
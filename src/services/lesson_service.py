@@ -3,17 +3,24 @@ from uuid import UUID
 from fastapi import Depends, HTTPException, status
 
 from src.repositories.lesson import LessonRepository, get_lesson_repository
+from src.repositories.quiz_cache import QuizCacheRepository, get_quiz_cache_repository
 from src.schemas.lesson_schema import (
     LessonResponse,
     LessonCreate,
     LessonUpdate,
-    LessonVideoResponse
+    LessonVideoResponse,
+    LessonSummaryResponse,
 )
 
 
 class LessonService:
-    def __init__(self, repo: LessonRepository):
+    def __init__(
+        self,
+        repo: LessonRepository,
+        quiz_cache: QuizCacheRepository | None = None,
+    ):
         self.repo = repo
+        self.quiz_cache = quiz_cache
 
     async def get_by_id(
         self, 
@@ -53,6 +60,26 @@ class LessonService:
         
         return [LessonResponse.model_validate(lesson) for lesson in lessons]
         
+    async def get_summaries_by_course(
+        self,
+        course_id: UUID,
+        skip: int | None = 0,
+        limit: int | None = 100
+    ) -> list[LessonSummaryResponse]:
+        lessons = await self.repo.get_summaries_by_course(
+            course_id,
+            skip=skip,
+            limit=limit
+        )
+
+        if not lessons:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No lessons found for this course",
+            )
+
+        return [LessonSummaryResponse.model_validate(lesson) for lesson in lessons]
+
     async def create_lesson(self, lesson_data: LessonCreate) -> LessonResponse:
         # Проверяем, существует ли урок с таким именем в курсе
         if await self.repo.exists_by_name_in_course(
@@ -129,8 +156,12 @@ class LessonService:
                 detail="Lesson not found",
             )
 
+        if self.quiz_cache is not None:
+            await self.quiz_cache.invalidate(lesson_id)
+
 
 async def get_lesson_service(
     repo: LessonRepository = Depends(get_lesson_repository),
+    quiz_cache: QuizCacheRepository = Depends(get_quiz_cache_repository),
 ) -> LessonService:
-    return LessonService(repo)
\ No newline at end of file
+    return LessonService(repo, quiz_cache)
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""Password hashing in a process pool for bulk operations.
+
+argon2 is CPU-bound and deliberately slow, so hashing thousands of passwords
+on the event loop would block every other request of the app worker. Bulk
+provisioning sends small chunks of passwords to a pool of processes instead.
+The pool is created on first use and shut down with the app.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from passlib.context import CryptContext
+
+from src.configs.app import settings
+
+_pwd_context = CryptContext(schemes=["argon2"])
+_pool: ProcessPoolExecutor | None = None
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    return [_pwd_context.hash(password) for password in passwords]
+
+
+def get_hash_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: fork of a process with a running event loop and threads is unsafe
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.provisioning.hash_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_hash_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+async def hash_passwords_in_pool(passwords: list[str]) -> list[str]:
+    '''Захешировать пароли параллельно, порядок результата совпадает с порядком паролей'''
+    if not passwords:
+        return []
+    loop = asyncio.get_running_loop()
+    pool = get_hash_pool()
+    size = settings.provisioning.hash_chunk_size
+    chunks = await asyncio.gather(*(
+        loop.run_in_executor(pool, hash_passwords, passwords[i:i + size])
+        for i in range(0, len(passwords), size)
+    ))
+    return [hashed for chunk in chunks for hashed in chunk]
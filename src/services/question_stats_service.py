@@ -0,0 +1,106 @@
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, status
+
+from src.repositories.course import CourseRepository, get_course_repository
+from src.repositories.lesson import LessonRepository, get_lesson_repository
+from src.repositories.question_stats import (
+    QuestionStatsRepository,
+    get_question_stats_repository,
+)
+from src.schemas.question_stats_schema import (
+    CourseDifficultyResponse,
+    LessonDifficultyResponse,
+    LessonDifficultySummary,
+    QuestionDifficulty,
+)
+
+HISTOGRAM_BUCKETS = 10
+
+
+def pass_rate(attempts: int, correct: int) -> float | None:
+    return round(correct / attempts, 4) if attempts else None
+
+
+class QuestionStatsService:
+    def __init__(
+        self,
+        repo: QuestionStatsRepository,
+        lesson_repo: LessonRepository,
+        course_repo: CourseRepository,
+    ):
+        self.repo = repo
+        self.lesson_repo = lesson_repo
+        self.course_repo = course_repo
+
+    async def get_lesson_difficulty(self, lesson_id: UUID) -> LessonDifficultyResponse:
+        '''Доли верных ответов по вопросам урока'''
+        if not await self.lesson_repo.get_by_id(lesson_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Lesson not found",
+            )
+
+        questions = [
+            QuestionDifficulty(
+                question_id=row.uuid,
+                question_num=row.question_num,
+                question=row.question,
+                attempts=row.attempts,
+                correct=row.correct,
+                pass_rate=pass_rate(row.attempts, row.correct),
+            )
+            for row in await self.repo.get_by_lesson(lesson_id)
+        ]
+        histogram = [0] * HISTOGRAM_BUCKETS
+        for question in questions:
+            if question.pass_rate is not None:
+                histogram[min(int(question.pass_rate * HISTOGRAM_BUCKETS), HISTOGRAM_BUCKETS - 1)] += 1
+
+        attempts = sum(q.attempts for q in questions)
+        correct = sum(q.correct for q in questions)
+        return LessonDifficultyResponse(
+            lesson_id=lesson_id,
+            attempts=attempts,
+            correct=correct,
+            pass_rate=pass_rate(attempts, correct),
+            pass_rate_histogram=histogram,
+            questions=questions,
+        )
+
+    async def get_course_difficulty(self, course_id: UUID) -> CourseDifficultyResponse:
+        '''Доли верных ответов по урокам курса'''
+        if not await self.course_repo.get_by_id(course_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found",
+            )
+
+        lessons = [
+            LessonDifficultySummary(
+                lesson_id=row.uuid,
+                name=row.name,
+                questions=row.questions,
+                attempts=row.attempts,
+                correct=row.correct,
+                pass_rate=pass_rate(row.attempts, row.correct),
+            )
+            for row in await self.repo.get_lessons_by_course(course_id)
+        ]
+        attempts = sum(lesson.attempts for lesson in lessons)
+        correct = sum(lesson.correct for lesson in lessons)
+        return CourseDifficultyResponse(
+            course_id=course_id,
+            attempts=attempts,
+            correct=correct,
+            pass_rate=pass_rate(attempts, correct),
+            lessons=lessons,
+        )
+
+
+async def get_question_stats_service(
+    repo: QuestionStatsRepository = Depends(get_question_stats_repository),
+    lesson_repo: LessonRepository = Depends(get_lesson_repository),
+    course_repo: CourseRepository = Depends(get_course_repository),
+) -> QuestionStatsService:
+    return QuestionStatsService(repo, lesson_repo, course_repo)
@@ -0,0 +1,71 @@
+import math
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError, jwt
+from redis.exceptions import ConnectionError, TimeoutError
+
+from src.configs.app import settings
+from src.repositories.rate_limit import RateLimitRepository, get_rate_limit_repository
+
+optional_security = HTTPBearer(auto_error=False)
+
+
+def jwt_subject(token: str) -> str | None:
+    """Subject of a valid access token, without a database lookup."""
+    try:
+        payload = jwt.decode(
+            token, settings.auth.secret_key, algorithms=[settings.auth.algorithm]
+        )
+    except JWTError:
+        return None
+    return payload.get("sub") or None
+
+
+class RateLimiter:
+    """Dependency limiting requests to a route per client IP or per user.
+
+    ``scope`` names a rule in ``[rate_limit_settings]``. With
+    ``key_by="user"`` the JWT subject is used when present, falling back
+    to the client IP. Redis outages let requests through rather than
+    blocking the route.
+    """
+
+    def __init__(self, scope: str, key_by: str = "ip"):
+        self.scope = scope
+        self.key_by = key_by
+
+    def get_identity(
+        self, request: Request, credentials: HTTPAuthorizationCredentials | None
+    ) -> str:
+        if self.key_by == "user" and credentials is not None:
+            subject = jwt_subject(credentials.credentials)
+            if subject:
+                return f"user:{subject}"
+
+        host = request.client.host if request.client else "unknown"
+        return f"ip:{host}"
+
+    async def __call__(
+        self,
+        request: Request,
+        repo: RateLimitRepository = Depends(get_rate_limit_repository),
+        credentials: HTTPAuthorizationCredentials | None = Depends(optional_security),
+    ) -> None:
+        if not settings.rate_limit.enabled:
+            return
+
+        rule = getattr(settings.rate_limit, self.scope)
+        key = f"rl:{self.scope}:{self.get_identity(request, credentials)}"
+
+        try:
+            allowed, retry_after_ms = await repo.hit(key, rule.limit, rule.window)
+        except (ConnectionError, TimeoutError):
+            return
+
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after_ms / 1000)))},
+            )
@@ -1,10 +1,17 @@
+from datetime import datetime
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
 
 from src.repositories.review import ReviewRepository, get_review_repository
 from src.repositories.course import CourseRepository, get_course_repository
-from src.schemas.review_schema import ReviewCreate, ReviewUpdate
+from src.schemas.review_schema import (
+    ReviewCreate,
+    ReviewPageResponse,
+    ReviewResponse,
+    ReviewUpdate,
+)
+from src.services.cursor import decode_cursor, encode_cursor
 
 
 class ReviewService:
@@ -12,14 +19,36 @@ class ReviewService:
         self.review_repo = review_repo
         self.course_repo = course_repo
 
-    async def get_by_course(self, course_id: UUID):
+    async def get_by_course(
+        self,
+        course_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> ReviewPageResponse:
         course = await self.course_repo.get_by_id(course_id)
         if not course:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Course not found",
             )
-        return await self.review_repo.get_by_course(course_id)
+
+        after = decode_cursor(cursor, datetime.fromisoformat, UUID) if cursor else None
+        reviews = await self.review_repo.get_by_course(
+            course_id, skip=skip, limit=limit + 1, after=after
+        )
+
+        next_cursor = None
+        if len(reviews) > limit:
+            reviews = reviews[:limit]
+            next_cursor = encode_cursor(reviews[-1].create_at.isoformat(), reviews[-1].uuid)
+
+        return ReviewPageResponse(
+            course_id=course.uuid,
+            review_count=course.review_count,
+            reviews=[ReviewResponse.model_validate(review) for review in reviews],
+            next_cursor=next_cursor,
+        )
 
     async def create(self, user_id: UUID, data: ReviewCreate):
         course = await self.course_repo.get_by_id(data.course_id)
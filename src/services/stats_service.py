@@ -0,0 +1,49 @@
+from fastapi import Depends, HTTPException, status
+
+from src.repositories.stats import (
+    StatsRepository,
+    StatsSnapshotRepository,
+    get_stats_repository,
+    get_stats_snapshot_repository,
+)
+from src.schemas.stats_schema import AdminStatsResponse
+
+# Через сколько секунд повторить запрос, пока снимок считается
+STATS_RETRY_AFTER = 5
+
+
+class StatsService:
+    def __init__(self, repo: StatsRepository, snapshot_repo: StatsSnapshotRepository):
+        self.repo = repo
+        self.snapshot_repo = snapshot_repo
+
+    async def refresh(self) -> AdminStatsResponse:
+        stats = await self.repo.collect()
+        await self.snapshot_repo.save(stats)
+        return stats
+
+    async def get_stats(self) -> AdminStatsResponse:
+        """Снимок из Redis.
+
+        Если снимка еще нет, его считает тот запрос, что займет блокировку
+        обновления (ту же, что у воркера); остальные и запросы без Redis
+        получают 503, чтобы тяжелые COUNT(*) не шли параллельно.
+        """
+        stats = await self.snapshot_repo.get()
+        if stats is not None:
+            return stats
+
+        if not await self.snapshot_repo.claim_refresh():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Stats are being computed, try again later",
+                headers={"Retry-After": str(STATS_RETRY_AFTER)},
+            )
+        return await self.refresh()
+
+
+async def get_stats_service(
+    repo: StatsRepository = Depends(get_stats_repository),
+    snapshot_repo: StatsSnapshotRepository = Depends(get_stats_snapshot_repository),
+) -> StatsService:
+    return StatsService(repo, snapshot_repo)
@@ -1,25 +1,84 @@
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Sequence
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
 
 from src.repositories.test_question import TestQuestionRepository, get_test_question_repository
 from src.repositories.lesson import LessonRepository, get_lesson_repository
+from src.repositories.quiz_cache import QuizCacheRepository, get_quiz_cache_repository
 from src.schemas.test_question_schema import (
     TestQuestionCreate,
     TestQuestionUpdate,
     TestQuestionResponse,
     TestQuestionWithoutAnswerResponse,
     CheckAnswerResponse,
-    LessonAnswer
+    LessonAnswer,
+    QuizAnswerKey,
+    QuizBundle,
+    TestQuestionAnswer,
+    find_choice_index,
+    normalize_answer,
 )
 from src.models.test_question import TestQuestion
 
 
 class TestQuestionService:
-    def __init__(self, repo: TestQuestionRepository, lesson_repo: LessonRepository):
+    def __init__(
+        self,
+        repo: TestQuestionRepository,
+        lesson_repo: LessonRepository,
+        quiz_cache: QuizCacheRepository,
+    ):
         self.repo = repo
         self.lesson_repo = lesson_repo
+        self.quiz_cache = quiz_cache
+
+    @staticmethod
+    def answer_columns(choices: List[str], correct_answer: str) -> dict[str, Any]:
+        '''Ключ ответа, сохраняемый вместе с вопросом'''
+        return {
+            "answer_key": normalize_answer(correct_answer),
+            "answer_index": find_choice_index(choices, correct_answer),
+        }
+
+    @staticmethod
+    def build_quiz_bundle(lesson_id: Any, test_questions: Sequence[TestQuestion]) -> QuizBundle:
+        '''Собрать тест урока из вопросов, отсортированных по порядку'''
+        version = None
+        if test_questions:
+            last_update = max(question.update_at for question in test_questions)
+            version = f"{lesson_id}:{len(test_questions)}:{last_update.isoformat()}"
+
+        return QuizBundle(
+            lesson_id=lesson_id,
+            version=version,
+            questions=[
+                TestQuestionWithoutAnswerResponse.model_validate(question)
+                for question in test_questions
+            ],
+            answer_key={
+                question.uuid: QuizAnswerKey(
+                    correct_answer=question.correct_answer,
+                    answer_keys=frozenset((question.answer_key,)),
+                )
+                for question in test_questions
+            },
+        )
+
+    async def get_quiz_bundle(self, lesson_id: Any) -> Optional[QuizBundle]:
+        '''Получить тест урока из кэша (None, если урок не существует)'''
+        bundle = await self.quiz_cache.get(lesson_id)
+        if bundle is not None:
+            return bundle
+
+        if await self.lesson_repo.get_by_id(lesson_id) is None:
+            return None
+
+        fill = await self.quiz_cache.begin_fill(lesson_id)
+        test_questions = await self.repo.get_by_lesson_id(lesson_id) or []
+        bundle = self.build_quiz_bundle(lesson_id, test_questions)
+        await self.quiz_cache.set(bundle, fill)
+        return bundle
 
     async def get_test_question_by_id(self, test_question_id: Any) -> TestQuestionWithoutAnswerResponse:
         '''Получить тест по ID'''
@@ -43,6 +102,11 @@ class TestQuestionService:
             )
         return [TestQuestionResponse.model_validate(test_question) for test_question in test_questions]
 
+    async def search_test_questions(self, query: str, limit: int) -> List[TestQuestionResponse]:
+        '''Найти тесты по тексту вопроса'''
+        test_questions = await self.repo.search(query, limit=limit)
+        return [TestQuestionResponse.model_validate(test_question) for test_question in test_questions]
+
     async def create_test_question(self, test_question_data: TestQuestionCreate) -> TestQuestionResponse:
         '''Создать новый тест'''
 
@@ -61,7 +125,11 @@ class TestQuestionService:
                 detail="Question with this order number already exists in this lesson",
             )
         test_question_dict = test_question_data.model_dump()
+        test_question_dict.update(self.answer_columns(
+            test_question_data.choices, test_question_data.correct_answer
+        ))
         test_question = await self.repo.create(test_question_dict)
+        await self.quiz_cache.invalidate(test_question.lesson_id)
         return TestQuestionResponse.model_validate(test_question)
 
     async def create_multiple_test_questions(
@@ -86,8 +154,15 @@ class TestQuestionService:
             )
 
         test_questions_dict = [
-            test_question_data.model_dump() for test_question_data in test_questions_data]
+            {
+                **test_question_data.model_dump(),
+                **self.answer_columns(test_question_data.choices, test_question_data.correct_answer),
+            }
+            for test_question_data in test_questions_data]
         test_questions = await self.repo.create_many(test_questions_dict)
+        await self.quiz_cache.invalidate(
+            *{test_question.lesson_id for test_question in test_questions}
+        )
         return [TestQuestionResponse.model_validate(test_question) for test_question in test_questions]
 
     async def update_test_question(
@@ -115,7 +190,20 @@ class TestQuestionService:
         }
         if not update_dict:
             return None
+        if "correct_answer" in update_dict or "choices" in update_dict:
+            update_dict.update(self.answer_columns(
+                update_dict.get("choices", existing_test_question.choices),
+                update_dict.get("correct_answer", existing_test_question.correct_answer),
+            ))
+        previous_lesson_id = existing_test_question.lesson_id
         test_question = await self.repo.update(test_question_id, update_dict)
+        if test_question is None:
+            # Вопрос архивировали или удалили между get_by_id и update
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Test question not found",
+            )
+        await self.quiz_cache.invalidate(previous_lesson_id, test_question.lesson_id)
 
         return TestQuestionResponse.model_validate(test_question)
 
@@ -135,7 +223,7 @@ class TestQuestionService:
             else:
                 choices_to_check = existing.choices
             
-            if update_data.correct_answer not in choices_to_check:
+            if find_choice_index(choices_to_check, update_data.correct_answer) is None:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Answer '{update_data.correct_answer}' "
@@ -151,23 +239,29 @@ class TestQuestionService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Test question not found",
             )
+        await self.quiz_cache.invalidate(res.lesson_id)
 
     async def get_test_questions_by_lesson_id(self, lesson_id: Any) -> List[TestQuestionWithoutAnswerResponse]:
         '''Получить тесты для урока'''
 
-        if await self.lesson_repo.get_by_id(lesson_id) is None:
+        bundle = await self.get_quiz_bundle(lesson_id)
+        if bundle is None:
             raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Lesson with this ID does not exist",
                 )
         
-        test_questions = await self.repo.get_by_lesson_id(lesson_id)
-        if not test_questions:
+        if not bundle.questions:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Test questions not found",
             )
-        return [TestQuestionWithoutAnswerResponse.model_validate(test_question) for test_question in test_questions]
+        return bundle.questions
+
+    async def get_test_questions_version(self, lesson_id: Any) -> Optional[str]:
+        '''Получить версию набора тестов урока для ETag'''
+        bundle = await self.get_quiz_bundle(lesson_id)
+        return bundle.version if bundle else None
 
     async def get_test_questions_count(self) -> int | None:
         '''Получить общее количество тестов'''
@@ -194,54 +288,74 @@ class TestQuestionService:
             )
         return res
 
-    async def check_test(self, user_answers: LessonAnswer) -> List[CheckAnswerResponse]:
-        '''Проверить ответ пользователя на тест'''
-        answers = []
-        for ans in user_answers.user_answers:
-            if not await self.repo.exists_by_id(ans.uuid):
-                raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Test question not found",
+    async def _check_uncached_answer(self, ans: TestQuestionAnswer) -> CheckAnswerResponse:
+        '''Проверить ответ на вопрос, которого нет в тесте урока, через БД'''
+        if not await self.repo.exists_by_id(ans.uuid):
+            raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Test question not found",
+        )
+        if not await self.repo.is_question_active(ans.uuid):
+            raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot check answers for archived question {ans.uuid}",
             )
-            if not await self.repo.is_question_active(ans.uuid):
-                raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot check answers for archived question {ans.uuid}",
-                )
-            answers.append(ans.model_dump())
-            
-            
-        res = await self.repo.bulk_check_answers(answers)
-        
-        if not res:
+        res = await self.repo.bulk_check_answers([ans.model_dump()])
+        return CheckAnswerResponse.model_validate(res[0])
+
+    async def check_test(self, user_answers: LessonAnswer) -> List[CheckAnswerResponse]:
+        '''Проверить ответ пользователя на тест по ключу ответов урока'''
+        if not user_answers.user_answers:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Test questions not found",
             )
+
+        lesson_id = await self.repo.get_lesson_id_by_question_id(user_answers.user_answers[0].uuid)
+        bundle = await self.get_quiz_bundle(lesson_id) if lesson_id else None
+        answer_key = bundle.answer_key if bundle else {}
+
         check = []
-        for result in res:
-            check.append(CheckAnswerResponse.model_validate(result))
+        for ans in user_answers.user_answers:
+            key = answer_key.get(ans.uuid)
+            if key is None:
+                check.append(await self._check_uncached_answer(ans))
+                continue
+            check.append(CheckAnswerResponse(
+                uuid=ans.uuid,
+                passed=normalize_answer(ans.user_answer) in key.answer_keys,
+                correct_answer=key.correct_answer,
+            ))
         return check
 
     async def get_estimate_by_lesson(self, lesson_id: Any, user_answers: LessonAnswer) -> float:
         '''Получить оценку за тест к уроку'''
         
-        if await self.lesson_repo.get_by_id(lesson_id) is None:
+        bundle = await self.get_quiz_bundle(lesson_id)
+        if bundle is None:
             raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Lesson with this ID does not exist",
                 )
 
-        answers = []
+        total_correct = 0
         for ans in user_answers.user_answers:
-            if not await self.repo.exists_by_id(ans.uuid):
+            key = bundle.answer_key.get(ans.uuid)
+            if key is not None:
+                passed = normalize_answer(ans.user_answer) in key.answer_keys
+            elif await self.repo.exists_by_id(ans.uuid):
+                passed = await self.repo.check_answer(ans.uuid, ans.user_answer)
+            else:
                 raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Test question not found",
             )
-            answers.append(ans.model_dump())
-        percentage = await self.repo.calculate_estimate(lesson_id, answers)
-        return percentage
+            if passed:
+                total_correct += 1
+
+        if not bundle.questions:
+            return 0.0
+        return (total_correct / len(bundle.questions)) * 100
 
     async def test_question_exists(self, test_question_id: Any) -> bool:
         '''Проверить существование теста'''
@@ -279,5 +393,6 @@ class TestQuestionService:
 async def get_test_question_service(
     repo: TestQuestionRepository = Depends(get_test_question_repository),
     lesson_repo: LessonRepository = Depends(get_lesson_repository),
+    quiz_cache: QuizCacheRepository = Depends(get_quiz_cache_repository),
 ) -> TestQuestionService:
-    return TestQuestionService(repo, lesson_repo)
+    return TestQuestionService(repo, lesson_repo, quiz_cache)
@@ -1,12 +1,15 @@
+from collections import Counter
 from typing import List, Dict, Any
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
 
+from src.configs.app import settings
 from src.repositories.user_course import UserCourseRepository, get_user_course_repository
 from src.repositories.course import CourseRepository, get_course_repository
 from src.repositories.lesson import LessonRepository, get_lesson_repository
 from src.repositories.test_question import TestQuestionRepository, get_test_question_repository
+from src.repositories.user import UserRepository, get_user_repository
 from src.schemas.user_course_schema import (
     UserCourseCreate,
     UserCourseProgressUpdate,
@@ -14,7 +17,11 @@ from src.schemas.user_course_schema import (
     CourseWithProgressResponse,
     UserCourseDetailResponse,
     UserCourseListResponse,
-    StartLessonResponse
+    StartLessonResponse,
+    BulkEnrollRequest,
+    BulkEnrollResponse,
+    BulkEnrollResult,
+    BulkEnrollStatus
 )
 
 
@@ -24,12 +31,14 @@ class UserCourseService:
         user_course_repo: UserCourseRepository,
         course_repo: CourseRepository,
         lesson_repo: LessonRepository,
-        test_question_repo: TestQuestionRepository
+        test_question_repo: TestQuestionRepository,
+        user_repo: UserRepository
     ):
         self.user_course_repo = user_course_repo
         self.course_repo = course_repo
         self.lesson_repo = lesson_repo
         self.test_question_repo = test_question_repo
+        self.user_repo = user_repo
         
     async def get_user_courses(self, user_id: UUID) -> UserCourseListResponse:
         """Получить все курсы пользователя с прогрессом"""
@@ -46,7 +55,7 @@ class UserCourseService:
             if course.archived:
                 continue
             # Получаем все уроки курса
-            lessons = await self.lesson_repo.get_all_by_course(course.uuid)
+            lessons = await self.lesson_repo.get_summaries_by_course(course.uuid)
             
             # Вычисляем прогресс
             total_lessons = len(lessons)
@@ -193,10 +202,8 @@ class UserCourseService:
         existing_archived = await self.user_course_repo.get_by_user_and_course(user_id, course_id)
         if existing_archived and existing_archived.archived:
             # Активируем архивированный курс
-            existing_archived.archived = False
-            await self.user_course_repo.db.commit()
-            await self.user_course_repo.db.refresh(existing_archived)
-            return UserCourseResponse.model_validate(existing_archived)
+            restored = await self.user_course_repo.restore(existing_archived)
+            return UserCourseResponse.model_validate(restored)
         
         # Создаем новую запись о курсе пользователя
         user_course_data = {
@@ -208,7 +215,75 @@ class UserCourseService:
         user_course = await self.user_course_repo.create(user_course_data)
         return UserCourseResponse.model_validate(user_course)
         
-    
+
+    async def bulk_enroll(self, data: BulkEnrollRequest) -> BulkEnrollResponse:
+        """Записать группу пользователей на курсы одним запросом к базе"""
+        course_ids = list(dict.fromkeys(data.course_ids))
+        # Пользователь может быть указан по id или по email
+        users = list(dict.fromkeys(user.strip() for user in data.users))
+        max_pairs = settings.provisioning.enroll_max_pairs
+        if len(users) * len(course_ids) > max_pairs:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Too many enrollments, the limit is {max_pairs} user-course pairs",
+            )
+
+        courses = await self.course_repo.get_by_ids(course_ids)
+        if len(courses) != len(course_ids):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found"
+            )
+
+        ids: Dict[str, UUID] = {}
+        for user in users:
+            try:
+                ids[user] = UUID(user)
+            except ValueError:
+                pass
+        emails = [user for user in users if user not in ids]
+
+        found = await self.user_repo.get_active_ids(list(ids.values()), emails)
+        by_id = {user_id: user_id for user_id, _ in found}
+        by_email = {email: user_id for user_id, email in found}
+        resolved = {
+            user: by_id.get(ids[user]) if user in ids else by_email.get(user)
+            for user in users
+        }
+
+        user_ids = list(dict.fromkeys(uid for uid in resolved.values() if uid is not None))
+        changed = await self.user_course_repo.bulk_enroll(
+            [uid for uid in user_ids for _ in course_ids],
+            [cid for _ in user_ids for cid in course_ids],
+            batch_size=settings.provisioning.enroll_batch_size,
+        )
+        outcomes = {
+            (user_id, course_id): BulkEnrollStatus.enrolled if inserted else BulkEnrollStatus.restored
+            for user_id, course_id, inserted in changed
+        }
+
+        results = []
+        for user, user_id in resolved.items():
+            if user_id is None:
+                results.append(BulkEnrollResult(user=user, status=BulkEnrollStatus.user_not_found))
+                continue
+            for course_id in course_ids:
+                results.append(BulkEnrollResult(
+                    user=user,
+                    user_id=user_id,
+                    course_id=course_id,
+                    status=outcomes.get((user_id, course_id), BulkEnrollStatus.already_enrolled),
+                ))
+
+        counts = Counter(result.status for result in results)
+        return BulkEnrollResponse(
+            enrolled=counts[BulkEnrollStatus.enrolled],
+            restored=counts[BulkEnrollStatus.restored],
+            already_enrolled=counts[BulkEnrollStatus.already_enrolled],
+            user_not_found=counts[BulkEnrollStatus.user_not_found],
+            results=results,
+        )
+
     async def update_question_progress(
         self,
         user_course_id: UUID,
@@ -338,7 +413,8 @@ class UserCourseService:
         # Получаем прогресс по уроку
         lesson_progress = await self.user_course_repo.get_lesson_progress(
             user_course.uuid,
-            lesson_id
+            lesson_id,
+            user_course.user_id
         )
         
         # Проверяем, начат ли урок
@@ -347,7 +423,8 @@ class UserCourseService:
         # Проверяем, пройден ли урок
         completed = await self.user_course_repo.is_lesson_completed(
             user_course.uuid,
-            lesson_id
+            lesson_id,
+            user_course.user_id
         )
         
         response = {
@@ -361,7 +438,8 @@ class UserCourseService:
         if completed and lesson_progress:
             avg_estimate = await self.user_course_repo.get_lesson_average_estimate(
                 user_course.uuid,
-                lesson_id
+                lesson_id,
+                user_course.user_id
             )
             if avg_estimate is not None:
                 response["estimate"] = round(avg_estimate, 2)
@@ -436,5 +514,8 @@ async def get_user_course_service(
     course_repo: CourseRepository = Depends(get_course_repository),
     lesson_repo: LessonRepository = Depends(get_lesson_repository),
     test_question_repo: TestQuestionRepository = Depends(get_test_question_repository),
+    user_repo: UserRepository = Depends(get_user_repository),
 ):
-    return UserCourseService(user_course_repo, course_repo, lesson_repo, test_question_repo)
\ No newline at end of file
+    return UserCourseService(
+        user_course_repo, course_repo, lesson_repo, test_question_repo, user_repo
+    )
\ No newline at end of file
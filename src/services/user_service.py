@@ -1,13 +1,23 @@
+import csv
+import io
+from collections import Counter
 from collections.abc import Sequence
 from datetime import datetime
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
 from passlib.context import CryptContext
+from pydantic import ValidationError
 
+from src.configs.app import settings
 from src.models.user import User
 from src.repositories.user import UserRepository, get_user_repository
+from src.services.password_hasher import hash_passwords_in_pool
 from src.schemas.user_schema import (
+    BulkUserCreate,
+    BulkUserCreateResponse,
+    BulkUserResult,
+    BulkUserStatus,
     UpdateUserByAdminRequest,
     UpdateUserRequest,
     UserRole,
@@ -62,6 +72,88 @@ class UserService:
 
         return user
 
+    async def provision_users(
+        self, users: list[BulkUserCreate], invalid: list[BulkUserResult] | None = None
+    ) -> BulkUserCreateResponse:
+        """Создать пользователей пачкой: одна проверка email, хеширование в пуле процессов"""
+        invalid = invalid or []
+        if len(users) + len(invalid) > settings.provisioning.max_users:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Too many users, the limit is {settings.provisioning.max_users}",
+            )
+
+        results = list(invalid)
+        unique: dict[str, BulkUserCreate] = {}
+        for user in users:
+            if user.email in unique:
+                results.append(BulkUserResult(email=user.email, status=BulkUserStatus.duplicate))
+            else:
+                unique[user.email] = user
+
+        existing = await self.repo.get_existing_emails(list(unique))
+        new_users = [user for email, user in unique.items() if email not in existing]
+        hashed = await hash_passwords_in_pool([user.password for user in new_users])
+        created = await self.repo.create_many(
+            [
+                {
+                    "email": user.email,
+                    "username": user.username,
+                    "password": password,
+                    "roles": [role.value for role in user.roles],
+                }
+                for user, password in zip(new_users, hashed)
+            ],
+            batch_size=settings.provisioning.insert_batch_size,
+        )
+
+        for email in unique:
+            if email in created:
+                results.append(BulkUserResult(
+                    email=email, status=BulkUserStatus.created, uuid=created[email],
+                ))
+            else:
+                results.append(BulkUserResult(email=email, status=BulkUserStatus.exists))
+
+        counts = Counter(result.status for result in results)
+        return BulkUserCreateResponse(
+            created=counts[BulkUserStatus.created],
+            exists=counts[BulkUserStatus.exists],
+            duplicate=counts[BulkUserStatus.duplicate],
+            invalid=counts[BulkUserStatus.invalid],
+            results=results,
+        )
+
+    async def provision_users_csv(self, content: str) -> BulkUserCreateResponse:
+        """CSV с колонками email, password и необязательными username, roles (через |)"""
+        reader = csv.DictReader(io.StringIO(content))
+        if not reader.fieldnames or not {"email", "password"} <= set(reader.fieldnames):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="CSV must have email and password columns",
+            )
+
+        users: list[BulkUserCreate] = []
+        invalid: list[BulkUserResult] = []
+        for row in reader:
+            data = {
+                "email": (row.get("email") or "").strip(),
+                "password": row.get("password") or "",
+                "username": (row.get("username") or "").strip() or None,
+            }
+            if (row.get("roles") or "").strip():
+                data["roles"] = [role.strip() for role in row["roles"].split("|")]
+            try:
+                users.append(BulkUserCreate.model_validate(data))
+            except ValidationError as e:
+                invalid.append(BulkUserResult(
+                    email=data["email"],
+                    status=BulkUserStatus.invalid,
+                    error="; ".join(error["msg"] for error in e.errors()),
+                ))
+
+        return await self.provision_users(users, invalid)
+
     async def change_password(
         self, user: User, old_password: str, new_password: str
     ) -> bool:
@@ -142,6 +234,10 @@ class UserService:
         return users
 
 
+    async def search_users_by_admin(self, query: str, limit: int) -> Sequence[User]:
+        return await self.repo.search(query, limit=limit)
+
+
 async def get_user_service(
     repo: UserRepository = Depends(get_user_repository),
 ) -> UserService:
@@ -0,0 +1,41 @@
+"""Refreshes the admin dashboard snapshot (``GET /admin/stats``) in Redis.
+
+Every ``stats.refresh_interval`` seconds one worker (the one that takes the
+refresh lock in Redis) counts the active rows of the main tables and the
+answers of the last 24 hours and stores the result under
+``stats.snapshot_key``, so the endpoint never counts tens of millions of
+rows on request. Only when there is no snapshot yet does one request
+compute it under the same lock; the others get 503.
+"""
+import asyncio
+import sys
+import traceback
+
+from redis.asyncio import Redis
+
+from src.configs.app import settings
+from src.database import async_session_maker
+from src.repositories.stats import StatsRepository, StatsSnapshotRepository
+from src.services.stats_service import StatsService
+
+
+async def refresh_stats(redis: Redis) -> bool:
+    snapshot_repo = StatsSnapshotRepository(redis)
+    if not await snapshot_repo.claim_refresh():
+        return False
+    async with async_session_maker() as session:
+        await StatsService(StatsRepository(session), snapshot_repo).refresh()
+    return True
+
+
+async def run_stats_refresher(redis: Redis, stopping: asyncio.Event) -> None:
+    while not stopping.is_set():
+        try:
+            await refresh_stats(redis)
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+
+        try:
+            await asyncio.wait_for(stopping.wait(), settings.stats.refresh_interval)
+        except TimeoutError:
+            pass
@@ -0,0 +1,160 @@
+"""Background job worker: ``python -m src.worker``.
+
+Takes jobs from the Redis queue and runs up to ``jobs.concurrency`` of them
+at a time. A failed job is retried with exponential backoff until
+``max_attempts`` is reached. On SIGTERM/SIGINT the worker stops taking new
+jobs and waits for running ones to finish. Every taken job holds a lease of
+``jobs.lease_ttl`` seconds that the worker renews while the job runs; jobs
+whose lease expired (their worker crashed) are put back on the queue, so any
+number of workers can share one Redis database.
+
+The worker also runs the outbox relay (see ``src.outbox_relay``) and the
+leaderboard consumer of the event stream (see ``src.leaderboard_consumer``)
+unless ``outbox.enabled`` is off, and the answer log writer (see
+``src.answer_log_writer``) unless ``answer_log.enabled`` is off, and keeps
+the admin stats snapshot fresh (see ``src.stats_refresher``).
+"""
+import asyncio
+import signal
+import sys
+import traceback
+
+from src.configs.app import settings
+from src.database import engine
+from src.jobs import JOB_HANDLERS
+from src.answer_log_writer import run_answer_log_writer
+from src.outbox_relay import run_relay
+from src.leaderboard_consumer import run_leaderboard_consumer
+from src.redis_client import create_redis_client, set_redis_client
+from src.stats_refresher import run_stats_refresher
+from src.repositories.job import JobRepository
+from src.schemas.job_schema import JobStatus
+
+
+def retry_delay(attempt: int) -> float:
+    return min(
+        settings.jobs.retry_backoff_cap,
+        settings.jobs.retry_backoff_base * 2 ** (attempt - 1),
+    )
+
+
+async def run_job(repo: JobRepository, job_id: str) -> None:
+    job = await repo.start(job_id)
+    if job is None:
+        # Hash expired or was removed while the id was still queued.
+        await repo.discard(job_id)
+        return
+
+    handler = JOB_HANDLERS.get(job.name)
+    if handler is None:
+        await repo.finish(
+            job_id, JobStatus.failed, ttl=settings.jobs.result_ttl,
+            error=f"Unknown job: {job.name}",
+        )
+        return
+
+    try:
+        result = await asyncio.wait_for(handler(**job.payload), settings.jobs.timeout)
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+        traceback.print_exc(file=sys.stderr)
+        if job.attempts < job.max_attempts:
+            await repo.schedule_retry(job_id, error, retry_delay(job.attempts))
+        else:
+            await repo.finish(
+                job_id, JobStatus.failed, ttl=settings.jobs.result_ttl, error=error,
+            )
+        return
+
+    await repo.finish(
+        job_id, JobStatus.succeeded, ttl=settings.jobs.result_ttl, result=result,
+    )
+
+
+async def run_lease_heartbeat(repo: JobRepository, active: set[str]) -> None:
+    '''Продлевать аренду своих задач и возвращать в очередь задачи упавших воркеров'''
+    while True:
+        try:
+            await repo.renew_leases(list(active), settings.jobs.lease_ttl)
+            requeued = await repo.requeue_expired(settings.jobs.lease_ttl)
+            if requeued:
+                print(f"Requeued {requeued} interrupted jobs", file=sys.stderr)
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+        await asyncio.sleep(settings.jobs.lease_ttl / 3)
+
+
+async def run_worker() -> None:
+    # Blocking reads wait up to poll_timeout, so the socket timeout has to
+    # be longer than that.
+    redis = create_redis_client(settings.redis.model_copy(update={
+        "redis_socket_timeout": settings.redis.redis_socket_timeout + settings.jobs.poll_timeout,
+    }))
+    set_redis_client(redis)
+    repo = JobRepository(redis)
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stopping.set)
+
+    slots = asyncio.Semaphore(settings.jobs.concurrency)
+    active: set[str] = set()
+    heartbeat = asyncio.create_task(run_lease_heartbeat(repo, active))
+    running: set[asyncio.Task] = set()
+    if settings.outbox.enabled:
+        running.add(asyncio.create_task(run_relay(redis, stopping)))
+        running.add(asyncio.create_task(run_leaderboard_consumer(redis, stopping)))
+    if settings.answer_log.enabled:
+        running.add(asyncio.create_task(run_answer_log_writer(redis, stopping)))
+    running.add(asyncio.create_task(run_stats_refresher(redis, stopping)))
+
+    async def run_in_slot(job_id: str) -> None:
+        active.add(job_id)
+        try:
+            await run_job(repo, job_id)
+        finally:
+            active.discard(job_id)
+            slots.release()
+
+    try:
+        while not stopping.is_set():
+            await slots.acquire()
+            try:
+                await repo.promote_due()
+                job_id = await repo.reserve(settings.jobs.poll_timeout, settings.jobs.lease_ttl)
+            except Exception:
+                slots.release()
+                traceback.print_exc(file=sys.stderr)
+                await asyncio.sleep(settings.jobs.poll_timeout)
+                continue
+
+            if job_id is None:
+                slots.release()
+                continue
+
+            task = asyncio.create_task(run_in_slot(job_id))
+            running.add(task)
+            task.add_done_callback(running.discard)
+
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+    finally:
+        heartbeat.cancel()
+        await asyncio.gather(heartbeat, return_exceptions=True)
+        await redis.close()
+        await redis.connection_pool.disconnect()
+        await engine.dispose()
+
+
+def main() -> None:
+    if settings.app.app_loop == "uvloop":
+        import uvloop
+
+        uvloop.run(run_worker())
+    else:
+        asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+    main()
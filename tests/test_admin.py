@@ -1,9 +1,11 @@
+import asyncio
 import uuid
 from http import HTTPStatus
 
 import pytest
+from sqlalchemy import select
 
-from src.models import Course
+from src.models import Course, OutboxEvent
 
 
 class TestAdmin:
@@ -29,6 +31,29 @@ class TestAdmin:
             assert content["name"] == name_course
 
 
+    @pytest.mark.asyncio
+    async def test_create_course_outbox_event(self, aiohttp_client, async_session, access_token_admin):
+        """Тест /api/v1/admin/course: событие о создании курса записывается в outbox"""
+        token = access_token_admin
+
+        req_url = "/api/v1/admin/course"
+        payload = {"name": "Курс с событием", "desc": "Описание курса"}
+        response = await aiohttp_client.post(
+            req_url,
+            json=payload,
+            headers={"Authorization": f"Bearer {token['access_token']}"},
+        )
+
+        assert response.status == HTTPStatus.OK
+
+        if response.status == HTTPStatus.OK:
+            content = await response.json()
+            result = await async_session.execute(
+                select(OutboxEvent).where(OutboxEvent.aggregate_id == uuid.UUID(content["uuid"]))
+            )
+            events = result.scalars().all()
+            assert [event.event_type for event in events] == ["course.created"]
+
     @pytest.mark.asyncio
     async def test_create_course_error(self, aiohttp_client, async_session, access_token_admin):
         """Тест /api/v1/admin/course: создание курса без наименования"""
@@ -438,3 +463,278 @@ class TestAdmin:
             assert content["detail"] == expected_data["detail"]
 
         await async_session.commit()
+
+    @pytest.mark.asyncio
+    async def test_redis_stats(self, aiohttp_client, async_session, access_token_admin):
+        """Тест /api/v1/admin/redis/stats: статистика пула соединений Redis"""
+        token = access_token_admin
+
+        req_url = "/api/v1/admin/redis/stats"
+        response = await aiohttp_client.get(
+            req_url,
+            headers={"Authorization": f"Bearer {token['access_token']}"},
+        )
+
+        assert response.status == HTTPStatus.OK
+
+        if response.status == HTTPStatus.OK:
+            content = await response.json()
+            assert content["circuit_state"] == "closed"
+            assert content["in_use_connections"] <= content["max_connections"]
+
+    @pytest.mark.asyncio
+    async def test_redis_stats_not_admin(self, aiohttp_client, async_session, access_token):
+        """Тест /api/v1/admin/redis/stats: запрос от пользователя не админа"""
+        token = access_token
+
+        req_url = "/api/v1/admin/redis/stats"
+        response = await aiohttp_client.get(
+            req_url,
+            headers={"Authorization": f"Bearer {token['access_token']}"},
+        )
+
+        assert response.status == HTTPStatus.BAD_REQUEST
+
+        if response.status == HTTPStatus.BAD_REQUEST:
+            content = await response.json()
+            assert content["detail"] == "Redis stats can only be accessed by the admin"
+
+    @pytest.mark.asyncio
+    async def test_admin_stats(self, aiohttp_client, async_session, access_token_admin):
+        """Тест /api/v1/admin/stats: сводные показатели платформы"""
+        token = access_token_admin
+
+        req_url = "/api/v1/admin/stats"
+        # Пока воркер считает первый снимок, эндпоинт отвечает 503 с Retry-After
+        for _ in range(10):
+            response = await aiohttp_client.get(
+                req_url,
+                headers={"Authorization": f"Bearer {token['access_token']}"},
+            )
+            if response.status != HTTPStatus.SERVICE_UNAVAILABLE:
+                break
+            assert response.headers["Retry-After"]
+            await asyncio.sleep(1)
+
+        assert response.status == HTTPStatus.OK
+
+        if response.status == HTTPStatus.OK:
+            content = await response.json()
+            assert content["users"] >= 1
+            assert content["answers_last_24h"] >= 0
+            assert content["computed_at"]
+
+    @pytest.mark.asyncio
+    async def test_create_unknown_job(self, aiohttp_client, async_session, access_token_admin):
+        """Тест /api/v1/admin/jobs: постановка неизвестной задачи"""
+        token = access_token_admin
+
+        req_url = "/api/v1/admin/jobs"
+        response = await aiohttp_client.post(
+            req_url,
+            json={"name": "unknown_job", "payload": {}},
+            headers={"Authorization": f"Bearer {token['access_token']}"},
+        )
+
+        assert response.status == HTTPStatus.BAD_REQUEST
+
+        if response.status == HTTPStatus.BAD_REQUEST:
+            content = await response.json()
+            assert content["detail"] == "Unknown job: unknown_job"
+
+    @pytest.mark.asyncio
+    async def test_create_job_invalid_payload(self, aiohttp_client, async_session, access_token_admin):
+        """Тест /api/v1/admin/jobs: аргументы, которых нет у обработчика задачи"""
+        token = access_token_admin
+
+        req_url = "/api/v1/admin/jobs"
+        response = await aiohttp_client.post(
+            req_url,
+            json={"name": "purge_archived", "payload": {"days": 30}},
+            headers={"Authorization": f"Bearer {token['access_token']}"},
+        )
+
+        assert response.status == HTTPStatus.BAD_REQUEST
+
+        if response.status == HTTPStatus.BAD_REQUEST:
+            content = await response.json()
+            assert content["detail"].startswith("Invalid payload for job purge_archived")
+
+    @pytest.mark.asyncio
+    async def test_purge_archived(self, aiohttp_client, async_session, access_token_admin):
+        """Тест /api/v1/admin/archive/purge: постановка задачи переноса архивных строк"""
+        token = access_token_admin
+
+        req_url = "/api/v1/admin/archive/purge?retention_days=30"
+        response = await aiohttp_client.post(
+            req_url,
+            headers={"Authorization": f"Bearer {token['access_token']}"},
+        )
+
+        assert response.status == HTTPStatus.ACCEPTED
+
+        if response.status == HTTPStatus.ACCEPTED:
+            content = await response.json()
+            assert content["name"] == "purge_archived"
+            assert content["payload"] == {"retention_days": 30}
+
+    @pytest.mark.asyncio
+    async def test_lesson_difficulty(
+        self, aiohttp_client, async_session, access_token_admin, create_question
+    ):
+        """Тест /api/v1/admin/lesson/{lesson_id}/difficulty: отчет по вопросам урока"""
+        token = access_token_admin
+        question = create_question
+
+        req_url = f"/api/v1/admin/lesson/{question['lesson_id']}/difficulty"
+        response = await aiohttp_client.get(
+            req_url,
+            headers={"Authorization": f"Bearer {token['access_token']}"},
+        )
+
+        assert response.status == HTTPStatus.OK
+
+        if response.status == HTTPStatus.OK:
+            content = await response.json()
+            assert [q["question_id"] for q in content["questions"]] == [question["uuid"]]
+            assert len(content["pass_rate_histogram"]) == 10
+
+    @pytest.mark.asyncio
+    async def test_course_analytics(
+        self, aiohttp_client, async_session, access_token_admin, create_lesson, create_question
+    ):
+        """Тест /api/v1/admin/course/{course_id}/analytics: воронка курса без записей"""
+        token = access_token_admin
+        lesson = create_lesson
+
+        req_url = f"/api/v1/admin/course/{lesson['course_id']}/analytics"
+        response = await aiohttp_client.get(
+            req_url,
+            headers={"Authorization": f"Bearer {token['access_token']}"},
+        )
+
+        assert response.status == HTTPStatus.OK
+
+        if response.status == HTTPStatus.OK:
+            content = await response.json()
+            assert content["enrollments"] == 0
+            assert [step["lesson_id"] for step in content["funnel"]] == [lesson["uuid"]]
+
+    @pytest.mark.asyncio
+    async def test_get_job_not_found(self, aiohttp_client, async_session, access_token_admin):
+        """Тест /api/v1/admin/jobs/{job_id}: несуществующая задача"""
+        token = access_token_admin
+
+        req_url = f"/api/v1/admin/jobs/{uuid.uuid4()}"
+        response = await aiohttp_client.get(
+            req_url,
+            headers={"Authorization": f"Bearer {token['access_token']}"},
+        )
+
+        assert response.status == HTTPStatus.NOT_FOUND
+
+        if response.status == HTTPStatus.NOT_FOUND:
+            content = await response.json()
+            assert content["detail"] == "Job not found"
+
+    @pytest.mark.asyncio
+    async def test_search_users(self, aiohttp_client, async_session, access_token_admin):
+        """Тест /api/v1/admin/users/search: нечеткий поиск пользователя по части email"""
+        token = access_token_admin
+
+        req_url = "/api/v1/admin/users/search?q=admin"
+        response = await aiohttp_client.get(
+            req_url,
+            headers={"Authorization": f"Bearer {token['access_token']}"},
+        )
+
+        assert response.status == HTTPStatus.OK
+
+        if response.status == HTTPStatus.OK:
+            content = await response.json()
+            assert content[0]["email"] == "admin@example.com"
+
+    @pytest.mark.asyncio
+    async def test_bulk_enroll(
+        self, aiohttp_client, async_session, access_token_admin, admin_payload
+    ):
+        """Тест /api/v1/admin/user_courses/enroll: запись группы пользователей на курс"""
+        token = access_token_admin
+        course = Course(name="Курс для группы", desc="Описание курса")
+        async_session.add(course)
+        await async_session.commit()
+
+        req_url = "/api/v1/admin/user_courses/enroll"
+        payload = {
+            "users": [admin_payload["email"], "missing@example.com"],
+            "course_ids": [str(course.uuid)],
+        }
+        response = await aiohttp_client.post(
+            req_url,
+            json=payload,
+            headers={"Authorization": f"Bearer {token['access_token']}"},
+        )
+
+        assert response.status == HTTPStatus.OK
+
+        if response.status == HTTPStatus.OK:
+            content = await response.json()
+            assert content["enrolled"] == 1
+            assert content["user_not_found"] == 1
+
+            response = await aiohttp_client.post(
+                req_url,
+                json=payload,
+                headers={"Authorization": f"Bearer {token['access_token']}"},
+            )
+            content = await response.json()
+            assert content["already_enrolled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_bulk_enroll_too_many(self, aiohttp_client, async_session, access_token_admin):
+        """Тест /api/v1/admin/user_courses/enroll: слишком много пар пользователь-курс"""
+        token = access_token_admin
+
+        req_url = "/api/v1/admin/user_courses/enroll"
+        payload = {
+            "users": [f"user{i}@example.com" for i in range(2001)],
+            "course_ids": [str(uuid.uuid4()) for _ in range(50)],
+        }
+        response = await aiohttp_client.post(
+            req_url,
+            json=payload,
+            headers={"Authorization": f"Bearer {token['access_token']}"},
+        )
+
+        assert response.status == HTTPStatus.BAD_REQUEST
+
+        if response.status == HTTPStatus.BAD_REQUEST:
+            content = await response.json()
+            assert content["detail"].startswith("Too many enrollments")
+
+    @pytest.mark.asyncio
+    async def test_provision_users(
+        self, aiohttp_client, async_session, access_token_admin, admin_payload
+    ):
+        """Тест /api/v1/admin/users/bulk: создание пользователей пачкой"""
+        token = access_token_admin
+        email = f"student-{uuid.uuid4().hex[:8]}@example.com"
+
+        req_url = "/api/v1/admin/users/bulk"
+        response = await aiohttp_client.post(
+            req_url,
+            json={"users": [
+                {"email": email, "password": "stringQwerty1!"},
+                {"email": email, "password": "stringQwerty1!"},
+                admin_payload,
+            ]},
+            headers={"Authorization": f"Bearer {token['access_token']}"},
+        )
+
+        assert response.status == HTTPStatus.OK
+
+        if response.status == HTTPStatus.OK:
+            content = await response.json()
+            assert content["created"] == 1
+            assert content["duplicate"] == 1
+            assert content["exists"] == 1
@@ -107,3 +107,77 @@ class TestCourse:
         if response.status == HTTPStatus.OK:
             content = await response.json()
             assert content["name"] == name_course
+
+    @pytest.mark.asyncio
+    async def test_courses_by_id_not_modified(self, aiohttp_client, async_session):
+        """
+        Тест /api/v1/courses/{course_id}: повторный запрос с If-None-Match возвращает 304
+        """
+        course = Course(name="Наименование курса", desc="Описание курса")
+        async_session.add(course)
+        await async_session.commit()
+        await async_session.refresh(course)
+
+        req_url = f"/api/v1/courses/{course.uuid}"
+        response = await aiohttp_client.get(req_url)
+
+        assert response.status == HTTPStatus.OK
+        etag = response.headers["ETag"]
+
+        response = await aiohttp_client.get(req_url, headers={"If-None-Match": etag})
+
+        assert response.status == HTTPStatus.NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+
+    @pytest.mark.asyncio
+    async def test_search_courses(self, aiohttp_client, async_session):
+        """
+        Тест /api/v1/courses/search: поиск по курсам с постраничной выдачей
+        """
+        for i in range(3):
+            async_session.add(Course(name=f"Программирование на Python {i}", desc="Основы языка"))
+        async_session.add(Course(name="История искусства", desc="Живопись"))
+        await async_session.commit()
+
+        req_url = "/api/v1/courses/search?q=python&limit=2"
+        response = await aiohttp_client.get(req_url)
+
+        assert response.status == HTTPStatus.OK
+
+        if response.status == HTTPStatus.OK:
+            content = await response.json()
+            assert len(content["items"]) == 2
+            assert content["next_cursor"] is not None
+
+            response = await aiohttp_client.get(
+                f"{req_url}&cursor={content['next_cursor']}"
+            )
+            content = await response.json()
+            assert len(content["items"]) == 1
+            assert content["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_course_leaderboard(self, aiohttp_client, async_session, access_token):
+        """
+        Тест /api/v1/courses/{course_id}/leaderboard: рейтинг курса без участников
+        """
+        course = Course(name="Курс с рейтингом", desc="Описание курса")
+        async_session.add(course)
+        await async_session.commit()
+
+        req_url = f"/api/v1/courses/{course.uuid}/leaderboard?limit=5"
+        response = await aiohttp_client.get(req_url)
+
+        assert response.status == HTTPStatus.OK
+
+        if response.status == HTTPStatus.OK:
+            content = await response.json()
+            assert content["total"] == 0
+            assert content["entries"] == []
+
+        response = await aiohttp_client.get(
+            f"/api/v1/courses/{course.uuid}/leaderboard/me",
+            headers={"Authorization": f"Bearer {access_token['access_token']}"},
+        )
+
+        assert response.status == HTTPStatus.NOT_FOUND
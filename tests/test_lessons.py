@@ -387,6 +387,45 @@ class TestLessons:
 
             assert len(content) == expected_data["len"]
 
+    @pytest.mark.asyncio
+    async def test_get_all_lesson_summary(
+        self, aiohttp_client, async_session, access_token
+    ):
+        """
+        Тест /api/v1/lessons/get_all/{course_id}?view=summary: список уроков без контента
+        """
+        token = access_token
+
+        course = Course(name=f"Наименование курса", desc=f"Описание курса")
+        async_session.add(course)
+        await async_session.commit()
+        await async_session.refresh(course)
+
+        for i in range(3):
+            lesson = Lesson(
+                name=f"Первый {i}",
+                desc="Описание урока",
+                content=f"Контент урока {i}",
+                course_id=course.uuid,
+            )
+            async_session.add(lesson)
+
+        await async_session.commit()
+
+        req_url = f"/api/v1/lessons/get_all/{course.uuid}/?view=summary"
+        response = await aiohttp_client.get(
+            req_url, headers={"Authorization": f"Bearer {token['access_token']}"}
+        )
+
+        assert response.status == HTTPStatus.OK
+
+        if response.status == HTTPStatus.OK:
+            content = await response.json()
+
+            assert len(content) == 3
+            assert "content" not in content[0]
+            assert "desc" not in content[0]
+
     @pytest.mark.parametrize(
         "query_data, expected_data",
         [
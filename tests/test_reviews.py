@@ -165,6 +165,93 @@ class TestReviews:
             assert len(content) == 5
 
 
+    @pytest.mark.asyncio
+    async def test_get_review_summary(self, aiohttp_client, async_session, access_token):
+        """
+        Тест /api/v1/reviews/{course_id}/summary: количество отзывов и первая страница
+        """
+        token = access_token
+        course = Course(name=f"Наименование курса", desc=f"Описание курса")
+        async_session.add(course)
+        await async_session.commit()
+
+        req_url = f"/api/v1/reviews/"
+
+        for i in range(3):
+            payload = {
+                "content": f"Контент отзыва {i}",
+                "course_id": str(course.uuid),
+            }
+
+            await aiohttp_client.post(
+                req_url,
+                json=payload,
+                headers={"Authorization": f"Bearer {token['access_token']}"},
+            )
+
+        req_url = f"/api/v1/reviews/{str(course.uuid)}/summary?limit=2"
+        response = await aiohttp_client.get(req_url)
+
+        assert response.status == HTTPStatus.OK
+
+        if response.status == HTTPStatus.OK:
+            content = await response.json()
+            assert content["review_count"] == 3
+            assert len(content["reviews"]) == 2
+            assert content["reviews"][0]["content"] == "Контент отзыва 2"
+
+            req_url = f"/api/v1/reviews/{str(course.uuid)}?limit=2&cursor={content['next_cursor']}"
+            response = await aiohttp_client.get(req_url)
+            content = await response.json()
+            assert len(content) == 1
+            assert "X-Next-Cursor" not in response.headers
+
+
+    @pytest.mark.asyncio
+    async def test_course_rating(self, aiohttp_client, async_session, access_token):
+        """
+        Тест /api/v1/courses/{course_id}/rating: агрегаты оценок после создания и удаления отзывов
+        """
+        token = access_token
+        course = Course(name=f"Наименование курса", desc=f"Описание курса")
+        async_session.add(course)
+        await async_session.commit()
+
+        req_url = f"/api/v1/reviews/"
+
+        reviews = []
+        for rating in (5, 4, 4):
+            payload = {
+                "content": f"Отзыв с оценкой {rating}",
+                "course_id": str(course.uuid),
+                "rating": rating,
+            }
+
+            response = await aiohttp_client.post(
+                req_url,
+                json=payload,
+                headers={"Authorization": f"Bearer {token['access_token']}"},
+            )
+            reviews.append(await response.json())
+
+        await aiohttp_client.patch(
+            f"/api/v1/reviews/{reviews[0]['uuid']}?delete=true",
+            json={},
+            headers={"Authorization": f"Bearer {token['access_token']}"},
+        )
+
+        req_url = f"/api/v1/courses/{str(course.uuid)}/rating"
+        response = await aiohttp_client.get(req_url)
+
+        assert response.status == HTTPStatus.OK
+
+        if response.status == HTTPStatus.OK:
+            content = await response.json()
+            assert content["rating_count"] == 2
+            assert content["rating_avg"] == 4.0
+            assert content["rating_histogram"] == {"1": 0, "2": 0, "3": 0, "4": 2, "5": 0}
+
+
     @pytest.mark.parametrize(
         "query_data, expected_data",
         [
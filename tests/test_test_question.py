@@ -1,10 +1,13 @@
+import asyncio
 import uuid
 from http import HTTPStatus
 
 import pytest
 from mypy.nodes import node_kinds
+from sqlalchemy import select
 
-from src.models import Course, Lesson
+from src.configs.app import settings
+from src.models import AnswerAttempt, Course, Lesson
 
 
 class TestTestQuestion:
@@ -390,6 +393,32 @@ class TestTestQuestion:
                 assert question["lesson_id"] == str(lesson["uuid"])
 
 
+    @pytest.mark.asyncio
+    async def test_get_test_questions_by_lesson_after_update(
+        self, aiohttp_client, async_session, access_token, access_token_admin, create_question,
+    ):
+        """Тест /api/v1/test_questions/lesson/{lesson_id}: кэш теста сбрасывается после изменения вопроса"""
+        question = create_question
+        req_url = f"/api/v1/test_questions/lesson/{question['lesson_id']}/"
+        headers = {"Authorization": f"Bearer {access_token['access_token']}"}
+
+        response = await aiohttp_client.get(req_url, headers=headers)
+        assert response.status == HTTPStatus.OK
+
+        await aiohttp_client.patch(
+            f"/api/v1/test_questions/update/{question['uuid']}",
+            json={"question": "Новый вопрос?"},
+            headers={"Authorization": f"Bearer {access_token_admin['access_token']}"},
+        )
+
+        response = await aiohttp_client.get(req_url, headers=headers)
+
+        assert response.status == HTTPStatus.OK
+
+        if response.status == HTTPStatus.OK:
+            content = await response.json()
+            assert content["questions_list"][0]["question"] == "Новый вопрос?"
+
     @pytest.mark.asyncio
     async def test_get_test_questions_by_lesson_error(
         self, aiohttp_client, async_session, access_token,
@@ -558,6 +587,45 @@ class TestTestQuestion:
             content = await response.json()
             assert content["detail"] == "Test question not found"
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "user_payload",
+        [{"email": f"limited-{uuid.uuid4().hex[:8]}@example.com", "password": "stringQwerty1!"}],
+    )
+    async def test_check_test_questions_rate_limit(
+        self, aiohttp_client, async_session, access_token
+    ):
+        """Тест /api/v1/test_questions/check: превышение лимита запросов пользователя"""
+        token = access_token
+        limit = settings.rate_limit.check_answers.limit
+
+        req_url = f"/api/v1/test_questions/check"
+
+        payload = {
+            "user_answers": [{"uuid": str(uuid.uuid4()), "user_answer": "ответ 1"}]
+        }
+
+        for _ in range(limit):
+            response = await aiohttp_client.post(
+                req_url,
+                json=payload,
+                headers={"Authorization": f"Bearer {token['access_token']}"},
+            )
+            assert response.status == HTTPStatus.BAD_REQUEST
+
+        response = await aiohttp_client.post(
+            req_url,
+            json=payload,
+            headers={"Authorization": f"Bearer {token['access_token']}"},
+        )
+
+        assert response.status == HTTPStatus.TOO_MANY_REQUESTS
+
+        if response.status == HTTPStatus.TOO_MANY_REQUESTS:
+            assert 1 <= int(response.headers["Retry-After"]) <= settings.rate_limit.check_answers.window
+            content = await response.json()
+            assert content["detail"] == "Too many requests"
+
     @pytest.mark.asyncio
     async def test_check_test_questions(
         self, aiohttp_client, async_session, access_token, create_question
@@ -590,6 +658,48 @@ class TestTestQuestion:
             assert content["checked_answers"][0]["passed"] == True
 
 
+    @pytest.mark.asyncio
+    async def test_check_test_questions_answer_log(
+        self, aiohttp_client, async_session, access_token, create_question
+    ):
+        """Тест /api/v1/test_questions/check: воркер записывает ответ в answer_attempts"""
+        token = access_token
+        question = create_question
+
+        req_url = f"/api/v1/test_questions/check"
+
+        payload = {
+            "user_answers": [
+                {
+                    "uuid": question["uuid"],
+                    "user_answer": "ответ 1"
+                }
+            ]
+        }
+
+        response = await aiohttp_client.post(
+            req_url,
+            json=payload,
+            headers={"Authorization": f"Bearer {token['access_token']}"},
+        )
+
+        assert response.status == HTTPStatus.OK
+
+        # Ответы пишутся в журнал воркером пачками раз в flush_interval
+        attempts = []
+        for _ in range(20):
+            result = await async_session.execute(
+                select(AnswerAttempt).where(AnswerAttempt.question_id == uuid.UUID(question["uuid"]))
+            )
+            attempts = result.scalars().all()
+            if attempts:
+                break
+            await asyncio.sleep(0.5)
+
+        assert len(attempts) == 1
+        assert attempts[0].answer == "ответ 1"
+        assert attempts[0].passed is True
+
     @pytest.mark.asyncio
     async def test_check_test_questions_mistake(
         self, aiohttp_client, async_session, access_token, create_question
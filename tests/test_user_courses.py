@@ -1,3 +1,5 @@
+import asyncio
+import time
 import uuid
 from http.client import responses
 
@@ -31,6 +33,28 @@ class TestUserCourses:
             content = await response.json()
             assert content["course_id"] == str(course.uuid)
 
+    @pytest.mark.asyncio
+    async def test_enroll_course_idempotency_key(
+        self, aiohttp_client, async_session, access_token
+    ):
+        """Тест /api/v1/user_courses/enroll/{course_id}: повтор с тем же Idempotency-Key"""
+        token = access_token
+        course = Course(name="Курс для повторной записи", desc="Описание курса")
+        async_session.add(course)
+        await async_session.commit()
+
+        req_url = f"/api/v1/user_courses/enroll/{course.uuid}"
+        headers = {
+            "Authorization": f"Bearer {token['access_token']}",
+            "Idempotency-Key": str(uuid.uuid4()),
+        }
+        first = await aiohttp_client.post(req_url, headers=headers)
+        retry = await aiohttp_client.post(req_url, headers=headers)
+
+        assert retry.status == first.status
+        assert retry.headers.get("Idempotent-Replayed") == "true"
+        assert await retry.json() == await first.json()
+
     @pytest.mark.asyncio
     async def test_enroll_course_error(
         self, aiohttp_client, async_session, access_token
@@ -101,4 +125,57 @@ class TestUserCourses:
 
         if response.status == HTTPStatus.NOT_FOUND:
             content = await response.json()
-            assert content["detail"] == "Lesson not found"
\ No newline at end of file
+            assert content["detail"] == "Lesson not found"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_checks_keep_all_answers(
+        self, aiohttp_client, access_token, access_token_admin, create_lesson
+    ):
+        """Тест /api/v1/test_questions/check: параллельные ответы по одному курсу не теряются"""
+        questions_count = 10
+        lesson = create_lesson
+        admin_headers = {"Authorization": f"Bearer {access_token_admin['access_token']}"}
+        headers = {"Authorization": f"Bearer {access_token['access_token']}"}
+
+        response = await aiohttp_client.post(
+            "/api/v1/test_questions/create_multiple",
+            json=[
+                {
+                    "question_num": i + 1,
+                    "question": f"Вопрос {i}?",
+                    "choices": ["Ответ 1", "Ответ 2"],
+                    "lesson_id": lesson["uuid"],
+                    "correct_answer": "Ответ 1",
+                }
+                for i in range(questions_count)
+            ],
+            headers=admin_headers,
+        )
+        questions = await response.json()
+
+        await aiohttp_client.post(
+            f"/api/v1/user_courses/enroll/{lesson['course_id']}", headers=headers
+        )
+
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(
+            aiohttp_client.post(
+                "/api/v1/test_questions/check",
+                json={"user_answers": [{"uuid": question["uuid"], "user_answer": "Ответ 1"}]},
+                headers=headers,
+            )
+            for question in questions
+        ))
+        elapsed = time.perf_counter() - started
+        print(f"{questions_count} concurrent checks: {questions_count / elapsed:.1f} req/s")
+
+        assert [r.status for r in responses] == [HTTPStatus.OK] * questions_count
+        for r in responses:
+            assert not (await r.json()).get("error_message")
+
+        response = await aiohttp_client.get(
+            f"/api/v1/user_courses/lessons/{lesson['uuid']}/progress", headers=headers
+        )
+        content = await response.json()
+        assert content["completed"] is True
+        assert content["estimate"] == 100